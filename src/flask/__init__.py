@@ -11,10 +11,11 @@
     :copyright: 2010 Pallets
     :license: BSD-3-Clause
 """
+import sys
+
 # utilities we import from Werkzeug and Jinja2 that are unused
 # in the module but are exported as public interface.
 # 从 Werkzeug 和 Jinja2 导入的工具并没有直接使用, 而是作为对外的公共接口.
-
 from jinja2 import escape
 from jinja2 import Markup
 from werkzeug.exceptions import abort
@@ -62,3 +63,25 @@ from .templating import render_template
 from .templating import render_template_string
 
 __version__ = "1.1.1"
+
+# submodules that are rarely needed at runtime are imported the first
+# time they are accessed as attributes, not when Flask is imported
+#
+# 运行时很少需要的子模块在第一次作为属性访问时才导入, 而不是在导入 Flask 时
+_lazy_submodules = frozenset(("cli", "debughelpers", "testing"))
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        from importlib import import_module
+
+        return import_module("." + name, __name__)
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ needs Python 3.7, keep flask.cli available
+    #
+    # 模块的 __getattr__ 需要 Python 3.7, 保持 flask.cli 可用
+    from . import cli  # noqa: F401
@@ -32,7 +32,6 @@ from werkzeug.routing import RoutingException
 from werkzeug.routing import Rule
 from werkzeug.wrappers import BaseResponse
 
-from . import cli
 from . import json
 from ._compat import integer_types
 from ._compat import reraise
@@ -40,7 +39,13 @@ from ._compat import string_types
 from ._compat import text_type
 from .config import Config
 from .config import ConfigAttribute
+from .config import ConfigWatcher
+from .caching import cache_response
+from .caching import LRUCache
+from .caching import single_flight
+from .ctx import _AppContextPool
 from .ctx import _AppCtxGlobals
+from .ctx import _RequestContextPool
 from .ctx import AppContext
 from .ctx import RequestContext
 from .globals import _request_ctx_stack
@@ -57,7 +62,10 @@ from .helpers import get_load_dotenv
 from .helpers import locked_cached_property
 from .helpers import url_for
 from .json import jsonify
+from .logging import AccessLog
 from .logging import create_logger
+from .metrics import MetricsRegistry
+from .profiling import SamplingProfiler
 from .sessions import SecureCookieSessionInterface
 from .signals import appcontext_tearing_down
 from .signals import got_request_exception
@@ -67,6 +75,8 @@ from .signals import request_tearing_down
 from .templating import _default_template_ctx_processor
 from .templating import DispatchingJinjaLoader
 from .templating import Environment
+from .timing import timer
+from .timing import TimingStats
 from .wrappers import Request
 from .wrappers import Response
 
@@ -81,6 +91,20 @@ def _make_timedelta(value):
     return value
 
 
+# the built-in converter for text view return values, make_response
+# passes the status and headers to the response class for them
+#
+# 文本视图返回值的内置转换函数, make_response 为它们把状态码和 headers
+# 传给响应类
+_text_response = object()
+
+_text_types = frozenset((text_type, bytes, bytearray))
+
+
+def _timing_name(f):
+    return getattr(f, "__name__", None) or type(f).__name__
+
+
 def setupmethod(f):
     """Wraps a method so that it performs a check in debug mode if the
     first request was already handled.
@@ -428,6 +452,25 @@ class Flask(_PackageBoundObject):
     # 在 `create_jinja_environment` 方法中传给 Jinja 环境的选项. 环境创建后再更改此项无效.
     jinja_options = {"extensions": ["jinja2.ext.autoescape", "jinja2.ext.with_"]}
 
+    #: The file extensions of the templates that :meth:`warmup` compiles
+    #: by default. Other files in the template folders, like images or
+    #: editor swap files, are skipped.
+    #:
+    #: .. versionadded:: 1.2
+    #
+    # `warmup` 默认编译的模板文件扩展名. 模板文件夹中的其他文件, 例如图片或编辑器的
+    # 交换文件, 会被跳过.
+    warmup_template_extensions = (
+        ".html",
+        ".htm",
+        ".xml",
+        ".xhtml",
+        ".txt",
+        ".j2",
+        ".jinja",
+        ".jinja2",
+    )
+
     #: Default configuration parameters.
     #
     # 默认配置参数
@@ -462,6 +505,25 @@ class Flask(_PackageBoundObject):
             "JSONIFY_MIMETYPE": "application/json",
             "TEMPLATES_AUTO_RELOAD": None,
             "MAX_COOKIE_SIZE": 4093,
+            "EAGER_BEFORE_FIRST_REQUEST": False,
+            "REQUEST_CONTEXT_POOL_SIZE": 0,
+            "APP_CONTEXT_POOL_SIZE": 0,
+            "REQUEST_TIMING": False,
+            "SERVER_TIMING_HEADER": False,
+            "PROFILER_SAMPLE_RATE": 0,
+            "PROFILER_ENDPOINT_SAMPLE_RATES": None,
+            "PROFILER_INTERVAL": 0.005,
+            "PROFILER_TOKEN": None,
+            "METRICS": False,
+            "METRICS_MULTIPROCESS_DIR": None,
+            "LOGGING_QUEUE_SIZE": 0,
+            "LOGGING_JSON": False,
+            "ACCESS_LOG": False,
+            "ACCESS_LOG_REQUEST_ID_HEADER": "X-Request-ID",
+            "PARALLEL_MAX_WORKERS": None,
+            "BACKGROUND_WORKERS": None,
+            "BACKGROUND_QUEUE_SIZE": 1000,
+            "BACKGROUND_OVERFLOW": "block",
         }
     )
 
@@ -608,6 +670,22 @@ class Flask(_PackageBoundObject):
         # `None` 或抛出 `BuildError`, 尝试下一个函数
         self.url_build_error_handlers = []
 
+        #: A dictionary mapping types to functions that convert a view
+        #: return value of that type, or of a subclass, to a response
+        #: value. Register functions with :meth:`response_converter`.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 将类型映射到函数的字典, 这些函数将该类型 (或其子类) 的视图返回值转换为
+        # 响应值. 使用 `response_converter` 注册函数.
+        self.response_converters = {}
+
+        # the converter found for each type returned by a view, see
+        # make_response
+        #
+        # 为视图返回的每个类型找到的转换函数, 参见 make_response
+        self._response_converter_cache = {}
+
         #: A dictionary with lists of functions that will be called at the
         #: beginning of each request. The key of the dictionary is the name of
         #: the blueprint this function is active for, or ``None`` for all
@@ -628,6 +706,16 @@ class Flask(_PackageBoundObject):
         # 注册一个函数
         self.before_first_request_funcs = []
 
+        #: A list of functions that are called after :meth:`reload_config`
+        #: replaced the config. To register a function, use the
+        #: :meth:`after_config_reload` decorator.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # `reload_config` 替换配置之后调用的函数列表. 使用 `after_config_reload`
+        # 装饰器注册一个函数
+        self.after_config_reload_funcs = []
+
         #: A dictionary with lists of functions that should be called after
         #: each request.  The key of the dictionary is the name of the blueprint
         #: this function is active for, ``None`` for all requests.  This can for
@@ -775,6 +863,64 @@ class Flask(_PackageBoundObject):
         self._got_first_request = False
         self._before_request_lock = Lock()
 
+        # request contexts that can be reused by wsgi_app, see
+        # REQUEST_CONTEXT_POOL_SIZE
+        #
+        # 可以被 wsgi_app 复用的请求上下文, 参见 REQUEST_CONTEXT_POOL_SIZE
+        self._request_context_pool = _RequestContextPool(self)
+
+        # app contexts that can be reused by request contexts, see
+        # APP_CONTEXT_POOL_SIZE
+        #
+        # 可以被请求上下文复用的应用上下文, 参见 APP_CONTEXT_POOL_SIZE
+        self._app_context_pool = _AppContextPool(self)
+
+        #: The :class:`~flask.timing.TimingStats` that the phases of each
+        #: request are added to if :data:`REQUEST_TIMING` is enabled.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 如果启用了 `REQUEST_TIMING`, 每个请求的各个阶段都会添加到这个
+        # `flask.timing.TimingStats` 中.
+        self.timing_stats = TimingStats()
+
+        #: The :class:`~flask.profiling.SamplingProfiler` that profiles
+        #: some requests if :data:`PROFILER_SAMPLE_RATE` is set.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 如果设置了 `PROFILER_SAMPLE_RATE`, 对部分请求进行分析的
+        # `flask.profiling.SamplingProfiler`.
+        self.profiler = SamplingProfiler(self)
+
+        #: The :class:`~flask.metrics.MetricsRegistry` that counts
+        #: requests and exceptions if :data:`METRICS` is enabled.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 如果启用了 `METRICS`, 统计请求和异常的 `flask.metrics.MetricsRegistry`.
+        self.metrics = MetricsRegistry(self)
+
+        #: The :class:`~flask.logging.AccessLog` that writes a line for
+        #: each request if :data:`ACCESS_LOG` is enabled.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 如果启用了 `ACCESS_LOG`, 为每个请求写入一行日志的
+        # `flask.logging.AccessLog`.
+        self.access_log = AccessLog(self)
+
+        #: The :class:`~flask.caching.BaseCache` that
+        #: :meth:`cache_response` stores responses in unless a cache is
+        #: passed to it. Defaults to an in-process
+        #: :class:`~flask.caching.LRUCache`.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # `cache_response` 存储响应的 `flask.caching.BaseCache`, 除非向它传入了
+        # 其他缓存. 默认为进程内的 `flask.caching.LRUCache`.
+        self.response_cache = LRUCache()
+
         # Add a static route using the provided static_url_path, static_host,
         # and static_folder if there is a configured static_folder.
         # Note we do this without checking if static_folder exists.
@@ -797,10 +943,12 @@ class Flask(_PackageBoundObject):
             )
 
         # Set the name of the Click group in case someone wants to add
-        # the app's commands to another CLI tool.
+        # the app's commands to another CLI tool. The group is created
+        # when it is first used.
         #
-        # 设置 Click 组的名称以便有人想添加这个应用的命令到另一个命令行接口工具
-        self.cli.name = self.name
+        # 设置 Click 组的名称以便有人想添加这个应用的命令到另一个命令行接口工具.
+        # 该组在第一次使用时创建.
+        self._cli_name = self.name
 
     @locked_cached_property
     def name(self):
@@ -898,6 +1046,38 @@ class Flask(_PackageBoundObject):
         """
         return self.create_jinja_environment()
 
+    @locked_cached_property
+    def parallel_pool(self):
+        """The :class:`~flask.workers.WorkerPool` that runs the calls made
+        with :func:`flask.parallel.map` and :func:`flask.parallel.gather`.
+        It is created the first time this property is accessed, with
+        :data:`PARALLEL_MAX_WORKERS` threads.
+
+        运行通过 `flask.parallel.map` 和 `flask.parallel.gather` 发起的调用的
+        `flask.workers.WorkerPool`. 第一次访问此属性时创建, 拥有
+        `PARALLEL_MAX_WORKERS` 个线程.
+
+        .. versionadded:: 1.2
+        """
+        from .workers import WorkerPool
+
+        return WorkerPool(self.config["PARALLEL_MAX_WORKERS"])
+
+    @locked_cached_property
+    def background(self):
+        """The :class:`~flask.workers.BackgroundExecutor` that runs
+        functions passed to its ``submit`` method in the background,
+        inside an application context.
+
+        在后台的应用上下文中执行传给其 `submit` 方法的函数的
+        `flask.workers.BackgroundExecutor`.
+
+        .. versionadded:: 1.2
+        """
+        from .workers import BackgroundExecutor
+
+        return BackgroundExecutor(self)
+
     @property
     def got_first_request(self):
         """This attribute is set to ``True`` if the application started
@@ -909,6 +1089,62 @@ class Flask(_PackageBoundObject):
         """
         return self._got_first_request
 
+    def reload_config(self):
+        """Replace :attr:`config` with a new config created by
+        :meth:`Config.reload <flask.Config.reload>`, which loads the
+        config files again. Then update the ``config`` global of the Jinja
+        environment and call the :attr:`after_config_reload_funcs`.
+
+        使用 `Config.reload` 创建的新配置替换 `config`, 新配置会再次加载配置文件.
+        然后更新 Jinja 环境的全局变量 `config`, 并调用 `after_config_reload_funcs`.
+
+        The config object is replaced in a single assignment and the old
+        one is not changed, so code that holds on to a config, such as a
+        request that stored ``current_app.config`` in a local variable,
+        keeps seeing consistent values.
+
+        配置对象通过一次赋值替换, 旧对象不会被修改, 所以持有配置的代码, 例如将
+        `current_app.config` 存储在局部变量中的请求, 仍然看到一致的值.
+
+        .. versionadded:: 1.2
+        """
+        config = self.config.reload()
+        self.config = config
+
+        if "jinja_env" in self.__dict__:
+            self.jinja_env.globals["config"] = config
+            self.jinja_env.auto_reload = self.templates_auto_reload
+
+        # pooled app contexts have a URL adapter for the old SERVER_NAME
+        #
+        # 池中的应用上下文拥有根据旧的 SERVER_NAME 创建的 URL 适配器
+        self._app_context_pool.clear()
+
+        if self.after_config_reload_funcs:
+            with self.app_context():
+                for func in self.after_config_reload_funcs:
+                    func()
+
+    def watch_config(self, interval=1.0):
+        """Start a :class:`~flask.config.ConfigWatcher` that calls
+        :meth:`reload_config` when one of the :attr:`Config.files
+        <flask.Config.files>` changes, so the config can be changed
+        without restarting the server. Call its ``stop`` method to stop
+        watching.
+
+        启动一个 `flask.config.ConfigWatcher`, 当 `Config.files` 中的某个文件发生
+        变化时调用 `reload_config`, 这样无需重启服务器即可修改配置. 调用其 `stop`
+        方法停止监视.
+
+        :param interval: Seconds between checking the files.
+        参数 interval: 检查文件的间隔秒数.
+
+        .. versionadded:: 1.2
+        """
+        watcher = ConfigWatcher(self, interval)
+        watcher.start()
+        return watcher
+
     def make_config(self, instance_relative=False):
         """Used to create the config attribute by the Flask constructor.
         The `instance_relative` parameter is passed in from the constructor
@@ -1104,6 +1340,81 @@ class Flask(_PackageBoundObject):
             rv.update(processor())
         return rv
 
+    def warmup(self, templates=True):
+        """Do the work that is otherwise done lazily while handling the
+        first requests, and freeze the setup of the application. The
+        :attr:`logger` and :attr:`jinja_env` are created, templates are
+        compiled, the URL map is sorted and the
+        :attr:`before_first_request_funcs` are called.
+
+        执行原本在处理最初几个请求时才惰性完成的工作, 并冻结应用的设置. 创建
+        `logger` 和 `jinja_env`, 编译模板, 对 URL 映射进行排序, 并调用
+        `before_first_request_funcs`.
+
+        Call this once all views, blueprints and extensions have been
+        registered. When serving with a preforking server, call it in
+        the master process before the workers are forked so they share
+        the prepared state instead of each paying for it on live
+        traffic. Afterwards the application counts as having handled its
+        first request, so in debug mode calling a setup method raises an
+        error. ::
+
+        在注册所有的视图, 蓝图和拓展之后调用此方法. 使用预派生 (preforking) 服务器时,
+        在派生工作进程之前在主进程中调用, 这样工作进程共享准备好的状态, 而不是在处理
+        线上流量时各自承担这些开销. 调用后应用被视为已处理过首个请求, 所以在调试模式下
+        调用设置方法将抛出错误.
+
+            app = create_app()
+            app.warmup()
+
+        :param templates: Compile the templates found by the loaders
+            that end with one of the :attr:`warmup_template_extensions`.
+            Pass a callable to only compile the template names it returns
+            ``True`` for instead, like the ``filter_func`` of
+            :meth:`jinja2.Environment.list_templates`. Files that can't
+            be decoded are skipped with a warning.
+        参数 templates: 编译加载器找到的以 `warmup_template_extensions` 之一结尾的
+            模板. 传入一个可调用对象则改为只编译其返回 `True` 的模板名, 和
+            `jinja2.Environment.list_templates` 的 `filter_func` 参数一样. 无法解码的
+            文件会被跳过并发出警告.
+
+        .. versionadded:: 1.2
+        """
+        self.logger
+        jinja_env = self.jinja_env
+
+        if templates:
+            if callable(templates):
+                filter_func = templates
+            else:
+                extensions = tuple(self.warmup_template_extensions)
+
+                def filter_func(name):
+                    return name.endswith(extensions)
+
+            try:
+                names = jinja_env.list_templates(filter_func=filter_func)
+            except TypeError:
+                # a loader that can't list its templates is not an error,
+                # there is just nothing to compile ahead of time
+                #
+                # 无法列出模板的加载器不算错误, 只是没有可以提前编译的模板
+                names = ()
+
+            for name in names:
+                try:
+                    jinja_env.get_template(name)
+                except UnicodeDecodeError:
+                    warnings.warn(
+                        "Skipped the template {!r} because it can't be"
+                        " decoded.".format(name)
+                    )
+
+        self.url_map.update()
+
+        with self.app_context():
+            self.try_trigger_before_first_request_functions()
+
     #: What environment the app is running in. Flask and extensions may
     #: enable behaviors based on the environment, such as enabling debug
     #: mode. This maps to the :data:`ENV` config key. This is set by the
@@ -1154,6 +1465,20 @@ class Flask(_PackageBoundObject):
         self.config["DEBUG"] = value
         self.jinja_env.auto_reload = self.templates_auto_reload
 
+    def _set_debug(self, value, env=None):
+        """Set :attr:`debug`, and :attr:`env` if it is given, from the
+        environment or the arguments of :meth:`run`. Unlike the
+        properties this works even if the config is frozen.
+
+        根据环境变量或 `run` 的参数设置 `debug`, 如果给出了 `env` 也设置它. 与属性
+        不同, 即使配置已冻结也可以设置.
+        """
+        if env is not None:
+            self.config._set_runtime("ENV", env)
+
+        self.config._set_runtime("DEBUG", value)
+        self.jinja_env.auto_reload = self.templates_auto_reload
+
     def run(self, host=None, port=None, debug=None, load_dotenv=True, **options):
         """Runs the application on a local development server.
 
@@ -1239,6 +1564,10 @@ class Flask(_PackageBoundObject):
 
             Threaded mode is enabled by default.
 
+        .. versionchanged:: 1.2
+            The :attr:`before_first_request_funcs` are called before the
+            server starts if :data:`EAGER_BEFORE_FIRST_REQUEST` is set.
+
         .. versionchanged:: 0.10
             The default port is now picked from the ``SERVER_NAME``
             variable.
@@ -1253,21 +1582,22 @@ class Flask(_PackageBoundObject):
             explain_ignored_app_run()
             return
 
+        from . import cli
+
         if get_load_dotenv(load_dotenv):
             cli.load_dotenv()
 
             # if set, let env vars override previous values
             # 如果设定了, 使用环境变量覆盖之前的值
             if "FLASK_ENV" in os.environ:
-                self.env = get_env()
-                self.debug = get_debug_flag()
+                self._set_debug(get_debug_flag(), env=get_env())
             elif "FLASK_DEBUG" in os.environ:
-                self.debug = get_debug_flag()
+                self._set_debug(get_debug_flag())
 
         # debug passed to method overrides all other sources
         # 传入的 debug 参数覆盖其他地方的设定
         if debug is not None:
-            self.debug = bool(debug)
+            self._set_debug(bool(debug))
 
         _host = "127.0.0.1"
         _port = 5000
@@ -1288,6 +1618,17 @@ class Flask(_PackageBoundObject):
 
         cli.show_server_banner(self.env, self.debug, self.name, False)
 
+        # the reloader runs the server in a child process, only call the
+        # functions in the process that actually handles requests
+        #
+        # 重载器在子进程中运行服务器, 只在真正处理请求的进程中调用这些函数
+        if self.config["EAGER_BEFORE_FIRST_REQUEST"] and (
+            not options["use_reloader"]
+            or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+        ):
+            with self.app_context():
+                self.try_trigger_before_first_request_functions()
+
         from werkzeug.serving import run_simple
 
         try:
@@ -1853,6 +2194,156 @@ class Flask(_PackageBoundObject):
         handlers = self.error_handler_spec.setdefault(key, {}).setdefault(code, {})
         handlers[exc_class] = f
 
+    def cache_response(self, timeout=300, key=None, vary=None, cache=None):
+        """A decorator that stores the response of a view in a cache and
+        returns it for the next ``timeout`` seconds without calling the
+        view::
+
+        一个装饰器, 将视图的响应存储在缓存中, 并在接下来的 `timeout` 秒内返回它
+        而不调用视图:
+
+            @app.route("/stats")
+            @app.cache_response(timeout=60)
+            def stats():
+                return render_template("stats.html", stats=compute_stats())
+
+        Responses are cached per endpoint, path and query arguments, only
+        for ``GET`` and ``HEAD`` requests, and only if they have the
+        status 200, are not streamed and don't set a cookie. The
+        :meth:`before_request` and :meth:`after_request` functions still
+        run for cached responses.
+
+        响应按端点, 路径和查询参数缓存, 只缓存 `GET` 和 `HEAD` 请求的响应, 并且
+        只有状态码为 200, 不是流式响应且没有设置 cookie 的响应才会被缓存.
+        对于缓存的响应, `before_request` 和 `after_request` 函数仍然会运行.
+
+        A cached response gets a strong ``ETag`` of its body, and a
+        request with a matching ``If-None-Match`` header gets a 304
+        response without a body.
+
+        缓存的响应会得到一个根据 body 计算的强 `ETag`, 带有匹配的 `If-None-Match`
+        头的请求会得到一个没有 body 的 304 响应.
+
+        If the :data:`~flask.session` was accessed while creating the
+        response, the response depends on the session cookie and is only
+        cached if ``Cookie`` is one of the ``vary`` headers, which caches
+        it per user.
+
+        如果在创建响应时访问了会话, 该响应取决于会话 cookie, 只有当 `Cookie` 是
+        `vary` 头之一时才会被缓存, 也就是按用户缓存.
+
+        :param timeout: How many seconds the response is cached.
+        参数 timeout: 响应缓存的秒数.
+
+        :param key: A function that returns a string, which is added to
+            the key the response is cached under.
+        参数 key: 一个返回字符串的函数, 该字符串会添加到缓存响应所用的键中.
+
+        :param vary: A list of request header names. A response is cached
+            for each combination of their values, and they are added to
+            the ``Vary`` header.
+        参数 vary: 请求头名称的列表. 对于它们的值的每种组合分别缓存响应, 并且它们会
+            被添加到 `Vary` 头中.
+
+        :param cache: The :class:`~flask.caching.BaseCache` to use,
+            instead of :attr:`response_cache`.
+        参数 cache: 要使用的 `flask.caching.BaseCache`, 代替 `response_cache`.
+
+        .. versionadded:: 1.2
+        """
+        return cache_response(timeout=timeout, key=key, vary=vary, cache=cache)
+
+    def single_flight(self, vary=None, timeout=None):
+        """A decorator that lets only one of several concurrent identical
+        requests to a view call it. The other requests wait for it to
+        finish and get a copy of its response::
+
+        一个装饰器, 在多个并发的相同请求中只让一个调用视图. 其他请求等待它完成,
+        并得到其响应的副本:
+
+            @app.route("/dashboard")
+            @app.cache_response(timeout=60)
+            @app.single_flight()
+            def dashboard():
+                return render_template("dashboard.html", data=compute_data())
+
+        Together with :meth:`cache_response`, only one request computes
+        the response when the cached one expires, instead of all requests
+        that arrive until it is cached again.
+
+        与 `cache_response` 一起使用时, 缓存的响应过期后只有一个请求会计算响应,
+        而不是在再次缓存之前到达的所有请求都去计算.
+
+        Requests are identical if they are ``GET`` or ``HEAD`` requests
+        with the same endpoint, path, query arguments and ``vary``
+        headers. If the first request raises an exception, times out, or
+        its response is streamed, sets a cookie or used the
+        :data:`~flask.session` while ``Cookie`` is not one of the
+        ``vary`` headers, the waiting requests call the view themselves.
+
+        相同请求是指端点, 路径, 查询参数和 `vary` 头都相同的 `GET` 或 `HEAD`
+        请求. 如果第一个请求抛出异常, 超时, 或者其响应是流式响应, 设置了 cookie,
+        或者在 `Cookie` 不是 `vary` 头之一时使用了会话, 等待的请求会自己调用视图.
+
+        The requests are only coalesced within a process.
+
+        请求只在同一个进程内合并.
+
+        :param vary: A list of request header names whose values must
+            match as well.
+        参数 vary: 请求头名称的列表, 它们的值也必须相同.
+
+        :param timeout: How many seconds to wait for the first request.
+            ``None`` waits until it finishes.
+        参数 timeout: 等待第一个请求的秒数. `None` 表示一直等到它完成.
+
+        .. versionadded:: 1.2
+        """
+        return single_flight(vary=vary, timeout=timeout)
+
+    @setupmethod
+    def response_converter(self, type_):
+        """A decorator that is used to register a function that converts
+        view return values of ``type_``, or of a subclass, to a response.
+        The function is called with the value and can return anything
+        that a view can return, such as a response, a string or a dict::
+
+        用于注册函数的装饰器, 该函数将 `type_` (或其子类) 的视图返回值转换为响应.
+        调用该函数时传入返回值, 它可以返回视图能够返回的任何值, 例如响应, 字符串
+        或字典:
+
+            @app.response_converter(types.GeneratorType)
+            def stream(rv):
+                return app.response_class(rv)
+
+        Converters for the built-in types, such as ``dict``, replace the
+        default conversion.
+
+        为内置类型 (例如 `dict`) 注册的转换函数会替代默认的转换.
+
+        .. versionadded:: 1.2
+        """
+
+        def decorator(f):
+            self.add_response_converter(type_, f)
+            return f
+
+        return decorator
+
+    @setupmethod
+    def add_response_converter(self, type_, f):
+        """Register a function that converts view return values of
+        ``type_`` to a response. Works exactly like the
+        :meth:`response_converter` decorator.
+
+        注册一个将 `type_` 的视图返回值转换为响应的函数. 和 `response_converter`
+        装饰器功能一致.
+
+        .. versionadded:: 1.2
+        """
+        self.response_converters[type_] = f
+        self._response_converter_cache.clear()
+
     @setupmethod
     def template_filter(self, name=None):
         """A decorator that is used to register custom template filter.
@@ -2012,6 +2503,21 @@ class Flask(_PackageBoundObject):
         self.before_first_request_funcs.append(f)
         return f
 
+    @setupmethod
+    def after_config_reload(self, f):
+        """Register a function to be called after :meth:`reload_config`
+        replaced the config, to rebuild anything that was created from
+        the old values. It is called without arguments inside an
+        application context, and its return value is ignored.
+
+        注册一个在 `reload_config` 替换配置之后调用的函数, 用于重建根据旧值创建的
+        任何东西. 它在应用上下文中被调用, 不接收任何参数, 返回值将被忽略.
+
+        .. versionadded:: 1.2
+        """
+        self.after_config_reload_funcs.append(f)
+        return f
+
     @setupmethod
     def after_request(self, f):
         """Register a function to be run after each request.
@@ -2240,6 +2746,11 @@ class Flask(_PackageBoundObject):
             ``HTTPExcpetion`` subclasses can be handled with a catch-all
             handler for the base ``HTTPException``.
 
+        .. versionchanged:: 1.2
+            The exception is counted in :attr:`metrics` if
+            :data:`METRICS` is enabled, unless it is a proxy exception
+            or a ``RoutingException``.
+
         .. versionadded:: 0.3
         """
         # Proxy exceptions don't have error codes.  We want to always return
@@ -2258,6 +2769,9 @@ class Flask(_PackageBoundObject):
         if isinstance(e, RoutingException):
             return e
 
+        if self.config["METRICS"]:
+            self.metrics.observe_exception(e)
+
         handler = self._find_error_handler(e)
         if handler is None:
             return e
@@ -2415,10 +2929,19 @@ class Flask(_PackageBoundObject):
             ``after_request`` functions and other finalization is done
             even for the default 500 response when there is no handler.
 
+        .. versionchanged:: 1.2
+            The exception and the 500 response are counted in
+            :attr:`metrics` if :data:`METRICS` is enabled, and the
+            response is logged to :attr:`access_log` if
+            :data:`ACCESS_LOG` is enabled.
+
         .. versionadded:: 0.3
         """
         exc_type, exc_value, tb = sys.exc_info()
-        got_request_exception.send(self, exception=e)
+        if got_request_exception.receivers:
+            got_request_exception.send(self, exception=e)
+        if self.config["METRICS"]:
+            self.metrics.observe_exception(e, 500)
 
         if self.propagate_exceptions:
             # if we want to repropagate the exception, we can attempt to
@@ -2443,7 +2966,10 @@ class Flask(_PackageBoundObject):
         if handler is not None:
             server_error = handler(server_error)
 
-        return self.finalize_request(server_error, from_error_handler=True)
+        response = self.finalize_request(server_error, from_error_handler=True)
+        if self.config["ACCESS_LOG"]:
+            self.access_log.log(response, None)
+        return response
 
     def log_exception(self, exc_info):
         """Logs an exception.  This is called by :meth:`handle_exception`
@@ -2524,16 +3050,50 @@ class Flask(_PackageBoundObject):
         调度请求, 并在此之上执行请求的预处理和后处理, 以及 HTTP 异常捕获和错误处理.
 
         .. versionadded:: 0.7
+
+        .. versionchanged:: 1.2
+            The first request check is done inline, the method that
+            triggers the :attr:`before_first_request_funcs` is only
+            called until they have run.
+
+        .. versionchanged:: 1.2
+            The request is counted in :attr:`metrics` if :data:`METRICS`
+            is enabled, and logged to :attr:`access_log` if
+            :data:`ACCESS_LOG` is enabled.
         """
-        self.try_trigger_before_first_request_functions()
+        # once the first request functions ran this is the only cost
+        # they add to a request, there is no lock and no extra call.
+        #
+        # 首个请求函数执行过后这就是它们给每个请求带来的唯一开销, 没有锁也没有额外的调用.
+        if not self._got_first_request:
+            self.try_trigger_before_first_request_functions()
+        metrics = self.config["METRICS"]
+        access_log = self.config["ACCESS_LOG"]
+        if metrics or access_log:
+            dispatch_start = timer()
         try:
-            request_started.send(self)
+            if request_started.receivers:
+                request_started.send(self)
             rv = self.preprocess_request()
             if rv is None:
-                rv = self.dispatch_request()
+                timing = _request_ctx_stack.top.timing
+
+                if timing is None:
+                    rv = self.dispatch_request()
+                else:
+                    start = timer()
+                    rv = self.dispatch_request()
+                    timing.add("view", start)
         except Exception as e:
             rv = self.handle_user_exception(e)
-        return self.finalize_request(rv)
+        response = self.finalize_request(rv)
+        if metrics or access_log:
+            duration = timer() - dispatch_start
+            if metrics:
+                self.metrics.observe(response.status_code, duration)
+            if access_log:
+                self.access_log.log(response, duration)
+        return response
 
     def finalize_request(self, rv, from_error_handler=False):
         """Given the return value from a view function this finalizes
@@ -2557,7 +3117,12 @@ class Flask(_PackageBoundObject):
         response = self.make_response(rv)
         try:
             response = self.process_response(response)
-            request_finished.send(self, response=response)
+            if request_finished.receivers:
+                request_finished.send(self, response=response)
+
+            timing = _request_ctx_stack.top.timing
+            if timing is not None and self.config["SERVER_TIMING_HEADER"]:
+                response.headers["Server-Timing"] = timing.to_header()
         except Exception:
             if not from_error_handler:
                 raise
@@ -2574,6 +3139,13 @@ class Flask(_PackageBoundObject):
         每个请求前调用, 保证触发了 `before_first_request_funcs` 并且每个应用实例
         (通常意味着进程)只调用一次.
 
+        Only threads arriving while the functions are running wait on
+        the lock. Set :data:`EAGER_BEFORE_FIRST_REQUEST` or call
+        :meth:`warmup` to run them before serving instead.
+
+        只有在这些函数运行期间到达的线程会等待锁. 设置 `EAGER_BEFORE_FIRST_REQUEST`
+        或调用 `warmup` 方法可以在开始服务之前运行它们.
+
         :internal:
         """
         if self._got_first_request:
@@ -2692,6 +3264,11 @@ class Flask(_PackageBoundObject):
             函数 `callable`
                 WSGI 应用调用的函数. 结果用于创建一个响应对象.
 
+        .. versionchanged:: 1.2
+            The conversion is looked up by the type of the value, other
+            types can be converted by registering a
+            :meth:`response_converter`.
+
         .. versionchanged:: 0.9
            Previously a tuple was interpreted as the arguments for the
            response object.
@@ -2736,7 +3313,13 @@ class Flask(_PackageBoundObject):
         # make sure the body is an instance of the response class
         # 确保 body 是响应类的实例
         if not isinstance(rv, self.response_class):
-            if isinstance(rv, (text_type, bytes, bytearray)):
+            rv_type = type(rv)
+            converter = self._response_converter_cache.get(rv_type)
+
+            if converter is None:
+                converter = self._find_response_converter(rv_type)
+
+            if converter is _text_response:
                 # let the response class set the status and headers instead of
                 # waiting to do it manually, so that the class can handle any
                 # special logic
@@ -2745,30 +3328,18 @@ class Flask(_PackageBoundObject):
                 # 任何特定逻辑
                 rv = self.response_class(rv, status=status, headers=headers)
                 status = headers = None
-            elif isinstance(rv, dict):
-                rv = jsonify(rv)
-            elif isinstance(rv, BaseResponse) or callable(rv):
-                # evaluate a WSGI callable, or coerce a different response
-                # class to the correct type
-                #
-                # 评估可调用的 WSGI, 或将其他响应类强制转为正确的类型
-                try:
-                    rv = self.response_class.force_type(rv, request.environ)
-                except TypeError as e:
-                    new_error = TypeError(
-                        "{e}\nThe view function did not return a valid"
-                        " response. The return type must be a string, dict, tuple,"
-                        " Response instance, or WSGI callable, but it was a"
-                        " {rv.__class__.__name__}.".format(e=e, rv=rv)
-                    )
-                    reraise(TypeError, new_error, sys.exc_info()[2])
-            else:
+            elif converter is None:
                 raise TypeError(
                     "The view function did not return a valid"
                     " response. The return type must be a string, dict, tuple,"
                     " Response instance, or WSGI callable, but it was a"
                     " {rv.__class__.__name__}.".format(rv=rv)
                 )
+            else:
+                rv = converter(rv)
+
+                if not isinstance(rv, self.response_class):
+                    rv = self.make_response(rv)
 
         # prefer the status if it was provided
         # 优先使用传入的 status
@@ -2785,6 +3356,66 @@ class Flask(_PackageBoundObject):
 
         return rv
 
+    def _find_response_converter(self, rv_type):
+        """Find the converter for a view return value of ``rv_type`` by
+        going through its MRO, checking the registered
+        :attr:`response_converters` before the built-in types at each
+        step. Returns ``None`` if the type can't be converted.
+
+        通过遍历 `rv_type` 的 MRO 为该类型的视图返回值查找转换函数, 每一步都先检查
+        注册的 `response_converters`, 再检查内置类型. 如果该类型无法转换, 返回
+        `None`.
+
+        .. versionadded:: 1.2
+        """
+        converter = None
+        mro = getattr(rv_type, "__mro__", (rv_type,))
+
+        for cls in mro:
+            converter = self.response_converters.get(cls)
+
+            if converter is not None:
+                break
+
+            if cls in _text_types:
+                converter = _text_response
+                break
+
+            if cls is dict:
+                converter = jsonify
+                break
+
+            if cls is BaseResponse:
+                converter = self._force_response_type
+                break
+        else:
+            # every type is callable, check if its instances are
+            #
+            # 所有类型都是可调用的, 检查它的实例是否可调用
+            if any("__call__" in vars(cls) for cls in mro):
+                converter = self._force_response_type
+
+        if converter is not None:
+            self._response_converter_cache[rv_type] = converter
+
+        return converter
+
+    def _force_response_type(self, rv):
+        # evaluate a WSGI callable, or coerce a different response
+        # class to the correct type
+        #
+        # 评估可调用的 WSGI, 或将其他响应类强制转为正确的类型
+        try:
+            return self.response_class.force_type(rv, request.environ)
+        except TypeError as e:
+            new_error = TypeError(
+                "{e}\nThe view function did not return a valid"
+                " response. The return type must be a string, dict, tuple,"
+                " Response instance, or WSGI callable, but it was a"
+                " {rv.__class__.__name__}.".format(e=e, rv=rv)
+            )
+            reraise(TypeError, new_error, sys.exc_info()[2])
+
     def create_url_adapter(self, request):
         """Creates a URL adapter for the given request. The URL adapter
         is created at a point where the request context is not yet set
@@ -2803,6 +3434,13 @@ class Flask(_PackageBoundObject):
             :data:`SERVER_NAME` no longer implicitly enables subdomain
             matching. Use :attr:`subdomain_matching` instead.
         """
+        frozen = self.config.frozen
+
+        if frozen is not None:
+            server_name = frozen.SERVER_NAME
+        else:
+            server_name = self.config["SERVER_NAME"]
+
         if request is not None:
             # If subdomain matching is disabled (the default), use the
             # default subdomain in all cases. This should be the default
@@ -2817,18 +3455,23 @@ class Flask(_PackageBoundObject):
             )
             return self.url_map.bind_to_environ(
                 request.environ,
-                server_name=self.config["SERVER_NAME"],
+                server_name=server_name,
                 subdomain=subdomain,
             )
         # We need at the very least the server name to be set for this
         # to work.
         #
         # 我们至少需要设置服务器名称才能使其正常工作
-        if self.config["SERVER_NAME"] is not None:
+        if server_name is not None:
+            if frozen is not None:
+                script_name = frozen.APPLICATION_ROOT
+                url_scheme = frozen.PREFERRED_URL_SCHEME
+            else:
+                script_name = self.config["APPLICATION_ROOT"]
+                url_scheme = self.config["PREFERRED_URL_SCHEME"]
+
             return self.url_map.bind(
-                self.config["SERVER_NAME"],
-                script_name=self.config["APPLICATION_ROOT"],
-                url_scheme=self.config["PREFERRED_URL_SCHEME"],
+                server_name, script_name=script_name, url_scheme=url_scheme
             )
 
     def inject_url_defaults(self, endpoint, values):
@@ -2891,7 +3534,8 @@ class Flask(_PackageBoundObject):
         不再进行之后的操作.
         """
 
-        bp = _request_ctx_stack.top.request.blueprint
+        ctx = _request_ctx_stack.top
+        bp = ctx.request.blueprint
 
         funcs = self.url_value_preprocessors.get(None, ())
         if bp is not None and bp in self.url_value_preprocessors:
@@ -2902,8 +3546,15 @@ class Flask(_PackageBoundObject):
         funcs = self.before_request_funcs.get(None, ())
         if bp is not None and bp in self.before_request_funcs:
             funcs = chain(funcs, self.before_request_funcs[bp])
+
+        timing = ctx.timing
         for func in funcs:
-            rv = func()
+            if timing is None:
+                rv = func()
+            else:
+                start = timer()
+                rv = func()
+                timing.add("before." + _timing_name(func), start)
             if rv is not None:
                 return rv
 
@@ -2935,10 +3586,23 @@ class Flask(_PackageBoundObject):
             funcs = chain(funcs, reversed(self.after_request_funcs[bp]))
         if None in self.after_request_funcs:
             funcs = chain(funcs, reversed(self.after_request_funcs[None]))
+
+        timing = ctx.timing
+        if timing is None:
+            for handler in funcs:
+                response = handler(response)
+            if not self.session_interface.is_null_session(ctx.session):
+                self.session_interface.save_session(self, ctx.session, response)
+            return response
+
         for handler in funcs:
+            start = timer()
             response = handler(response)
+            timing.add("after." + _timing_name(handler), start)
         if not self.session_interface.is_null_session(ctx.session):
+            start = timer()
             self.session_interface.save_session(self, ctx.session, response)
+            timing.add("save_session", start)
         return response
 
     def do_teardown_request(self, exc=_sentinel):
@@ -2980,7 +3644,8 @@ class Flask(_PackageBoundObject):
             funcs = chain(funcs, reversed(self.teardown_request_funcs[bp]))
         for func in funcs:
             func(exc)
-        request_tearing_down.send(self, exc=exc)
+        if request_tearing_down.receivers:
+            request_tearing_down.send(self, exc=exc)
 
     def do_teardown_appcontext(self, exc=_sentinel):
         """Called right before the application context is popped.
@@ -3010,7 +3675,8 @@ class Flask(_PackageBoundObject):
             exc = sys.exc_info()[1]
         for func in reversed(self.teardown_appcontext_funcs):
             func(exc)
-        appcontext_tearing_down.send(self, exc=exc)
+        if appcontext_tearing_down.receivers:
+            appcontext_tearing_down.send(self, exc=exc)
 
     def app_context(self):
         """Create an :class:`~flask.ctx.AppContext`. Use as a ``with``
@@ -3186,13 +3852,29 @@ class Flask(_PackageBoundObject):
             start the response.
         参数 start_response: 一个可调用的函数, 接收状态码, headers 列表, 和
             可选的异常上下文来开始响应.
+
+        .. versionchanged:: 1.2
+            Request contexts are reused if
+            :data:`REQUEST_CONTEXT_POOL_SIZE` is set.
+
+        .. versionchanged:: 1.2
+            Some requests are profiled if :data:`PROFILER_SAMPLE_RATE` is
+            set.
         """
-        ctx = self.request_context(environ)
+        ctx = self._request_context_pool.acquire(environ)
         error = None
         try:
             try:
                 ctx.push()
-                response = self.full_dispatch_request()
+                config = self.config
+
+                if (
+                    config["PROFILER_SAMPLE_RATE"]
+                    or config["PROFILER_ENDPOINT_SAMPLE_RATES"]
+                ):
+                    response = self.profiler.dispatch(ctx.request)
+                else:
+                    response = self.full_dispatch_request()
             except Exception as e:
                 error = e
                 response = self.handle_exception(e)
@@ -3204,6 +3886,7 @@ class Flask(_PackageBoundObject):
             if self.should_ignore_error(error):
                 error = None
             ctx.auto_pop(error)
+            self._request_context_pool.release(ctx)
 
     def __call__(self, environ, start_response):
         """The WSGI server calls the Flask application object as the
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.batch
+    ~~~~~~~~~~~
+
+    Handles several requests sent in the body of a single batch request.
+
+    处理在单个批量请求的 body 中发送的多个请求.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import sys
+from io import BytesIO
+
+from werkzeug.exceptions import BadRequest
+from werkzeug.urls import url_unquote
+
+from . import json
+from ._compat import PY2
+from ._compat import string_types
+from ._compat import text_type
+from .ctx import RequestContext
+from .globals import _request_ctx_stack
+from .globals import request
+
+# keys of the batch request's environ that don't apply to sub-requests
+#
+# 批量请求的 environ 中不适用于子请求的键
+_outer_keys = (
+    "CONTENT_TYPE",
+    "CONTENT_LENGTH",
+    "QUERY_STRING",
+    "werkzeug.request",
+)
+
+
+def _is_valid_item(item):
+    if not isinstance(item, dict) or not isinstance(item.get("path"), string_types):
+        return False
+
+    headers = item.get("headers")
+
+    if headers is not None and not (
+        isinstance(headers, dict)
+        and all(
+            isinstance(key, string_types) and isinstance(value, string_types)
+            for key, value in headers.items()
+        )
+    ):
+        return False
+
+    return all(
+        item.get(key) is None or isinstance(item[key], string_types)
+        for key in ("method", "body")
+    )
+
+
+def _to_wsgi_path(path):
+    path = url_unquote(path)
+
+    if PY2:
+        return path.encode("utf-8")
+
+    return path.encode("utf-8").decode("latin1")
+
+
+class BatchDispatcher(object):
+    """Dispatches a list of sub-requests through
+    :meth:`Flask.full_dispatch_request <flask.Flask.full_dispatch_request>`
+    and collects their responses, so that clients can send several small
+    requests at once::
+
+    通过 `Flask.full_dispatch_request` 分发一组子请求并收集它们的响应, 这样客户端
+    可以一次发送多个小请求:
+
+        BatchDispatcher(app).register_endpoint("/batch")
+
+    Each sub-request is a JSON object with a ``path`` that may include a
+    query string, and optionally a ``method``, ``headers``, and a
+    ``json`` value or a ``body`` string. Each gets its own
+    :class:`~flask.ctx.RequestContext` and runs the request hooks as
+    usual. It shares the headers, including cookies and authorization,
+    and the :data:`~flask.session` object of the batch request, without
+    opening the session again. Changes to the session are saved with
+    the batch response.
+
+    每个子请求是一个 JSON 对象, 包含一个可以带查询字符串的 `path`, 以及可选的
+    `method`, `headers`, 和一个 `json` 值或一个 `body` 字符串. 每个子请求有自己的
+    `flask.ctx.RequestContext`, 并照常运行请求钩子. 它共享批量请求的头 (包括
+    cookie 和认证信息) 以及会话对象, 而不会再次打开会话. 对会话的修改会随批量响应
+    一起保存.
+
+    The response is a JSON list with an object for each sub-request,
+    with the ``status``, the ``headers`` and the ``body``, which is
+    decoded if it is JSON.
+
+    响应是一个 JSON 列表, 每个子请求对应一个对象, 包含 `status`, `headers` 和
+    `body`, 如果 body 是 JSON 则会被解码.
+
+    :param app: The application to dispatch the sub-requests to.
+    参数 app: 分发子请求的应用.
+
+    :param max_requests: The most sub-requests in one batch.
+    参数 max_requests: 一个批量请求中最多的子请求数量.
+
+    :param pool: A :class:`~flask.workers.WorkerPool` to dispatch the
+        sub-requests in parallel. They are dispatched one after another
+        by default. Sub-requests that run in parallel must not modify
+        the shared session.
+    参数 pool: 用于并行分发子请求的 `flask.workers.WorkerPool`. 默认会依次分发.
+        并行运行的子请求不能修改共享的会话.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, app, max_requests=20, pool=None):
+        self.app = app
+        self.max_requests = max_requests
+        self.pool = pool
+        self.rule = None
+
+    def register_endpoint(self, rule="/batch", endpoint="batch"):
+        """Add a URL rule that accepts a JSON list of sub-requests with
+        ``POST`` and returns the list of their responses.
+
+        添加一个 URL 规则, 通过 `POST` 接受子请求的 JSON 列表, 并返回它们的响应列表.
+        """
+        self.rule = rule
+        self.app.add_url_rule(rule, endpoint, self._view, methods=["POST"])
+
+    def _view(self):
+        # a sub-request can't start another batch, whatever path or rule
+        # it uses to reach this view
+        #
+        # 子请求不能发起另一个批量请求, 无论它使用什么路径或规则访问此视图
+        if request.environ.get("flask.batch"):
+            raise BadRequest("A batch can't contain another batch.")
+
+        items = request.get_json()
+
+        if not isinstance(items, list) or not all(map(_is_valid_item, items)):
+            raise BadRequest(
+                "Expected a list of objects with a 'path', and optionally a"
+                " 'method' and 'body' string and a 'headers' object of strings."
+            )
+
+        if len(items) > self.max_requests:
+            raise BadRequest(
+                "A batch can contain at most %d requests." % self.max_requests
+            )
+
+        return json.jsonify(self.dispatch(items))
+
+    def dispatch(self, items):
+        """Dispatch the sub-requests described by ``items`` in the
+        current request context and return their responses.
+
+        在当前请求上下文中分发 `items` 描述的子请求, 并返回它们的响应.
+        """
+        ctx = _request_ctx_stack.top
+        results = [None] * len(items)
+        pending = []
+
+        for index, item in enumerate(items):
+            if url_unquote(item["path"].partition("?")[0]) == self.rule:
+                # don't let a batch contain itself
+                #
+                # 不允许批量请求包含自身
+                results[index] = self._error(400, "A batch can't contain itself.")
+                continue
+
+            environ = self._make_environ(item, ctx.request.environ)
+
+            if self.pool is None:
+                results[index] = self._dispatch(environ, ctx.session)
+            else:
+                future = self.pool.submit(self._dispatch, environ, ctx.session)
+                pending.append((index, future))
+
+        for index, future in pending:
+            if future is None:
+                results[index] = self._error(503, "The batch queue is full.")
+            else:
+                results[index] = future.result()
+
+        return results
+
+    def _make_environ(self, item, outer):
+        path, _, query = item["path"].partition("?")
+        environ = dict(outer)
+
+        for key in _outer_keys:
+            environ.pop(key, None)
+
+        for key, value in (item.get("headers") or {}).items():
+            key = key.upper().replace("-", "_")
+
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = "HTTP_" + key
+
+            environ[key] = str(value)
+
+        if "json" in item:
+            body = json.dumps(item["json"]).encode("utf-8")
+            environ["CONTENT_TYPE"] = "application/json"
+        elif item.get("body") is not None:
+            body = item["body"]
+
+            if isinstance(body, text_type):
+                body = body.encode("utf-8")
+        else:
+            body = b""
+
+        environ["REQUEST_METHOD"] = str(item.get("method") or "GET").upper()
+        environ["PATH_INFO"] = _to_wsgi_path(path)
+        environ["QUERY_STRING"] = str(query)
+        environ["CONTENT_LENGTH"] = str(len(body))
+        environ["wsgi.input"] = BytesIO(body)
+        environ["flask.batch"] = True
+        return environ
+
+    def _dispatch(self, environ, session):
+        app = self.app
+        # a new app context gives each sub-request its own g
+        #
+        # 新的应用上下文使每个子请求都有自己的 g
+        app_ctx = app.app_context()
+        app_ctx.push()
+        ctx = RequestContext(app, environ, session=session)
+        error = None
+
+        try:
+            try:
+                ctx.push()
+                response = app.full_dispatch_request()
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            except:  # noqa: B001
+                error = sys.exc_info()[1]
+                raise
+
+            try:
+                return self._serialize(response)
+            finally:
+                response.close()
+        finally:
+            if app.should_ignore_error(error):
+                error = None
+            # sub-request contexts are never preserved for the debugger
+            #
+            # 子请求的上下文永远不会为调试器保留
+            ctx.pop(error)
+            app_ctx.pop(error)
+
+    def _serialize(self, response):
+        headers = dict(response.headers)
+        headers.pop("Set-Cookie", None)
+
+        if response.is_json:
+            body = response.get_json()
+        else:
+            body = response.get_data(as_text=True)
+
+        return {"status": response.status_code, "headers": headers, "body": body}
+
+    def _error(self, status, message):
+        return {"status": status, "headers": {}, "body": message}
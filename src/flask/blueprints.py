@@ -338,7 +338,10 @@ class Blueprint(_PackageBoundObject):
 
         cli_resolved_group = options.get("cli_group", self.cli_group)
 
-        if not self.cli.commands:
+        # don't create the group, and import Click, to find it empty
+        #
+        # 不要为了发现组为空而创建它 (并导入 Click)
+        if self._cli is None or not self._cli.commands:
             return
 
         if cli_resolved_group is None:
@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.caching
+    ~~~~~~~~~~~~~
+
+    Caches the responses of views decorated with
+    :meth:`Flask.cache_response <flask.Flask.cache_response>`, and the
+    cache backends to store them in.
+
+    缓存使用 `Flask.cache_response` 装饰的视图的响应, 以及存储响应的缓存后端.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+from __future__ import absolute_import
+
+import json
+import os
+import time
+from collections import OrderedDict
+from functools import update_wrapper
+from hashlib import sha1
+from threading import Event
+from threading import local
+from threading import Lock
+
+from .globals import _request_ctx_stack
+from .globals import current_app
+from .globals import request
+
+
+class BaseCache(object):
+    """The interface of a cache backend. Values are stored until they
+    expire after ``timeout`` seconds, or are evicted earlier by the
+    backend.
+
+    缓存后端的接口. 值会一直存储, 直到 `timeout` 秒后过期, 或者被后端提前移除.
+
+    .. versionadded:: 1.2
+    """
+
+    def get(self, key):
+        """Return the value for ``key``, or ``None`` if it is not cached
+        or has expired.
+
+        返回 `key` 对应的值, 如果没有缓存或已过期, 返回 `None`.
+        """
+        raise NotImplementedError()
+
+    def set(self, key, value, timeout):
+        """Store ``value`` for ``key`` for ``timeout`` seconds.
+
+        将 `value` 以 `key` 存储 `timeout` 秒.
+        """
+        raise NotImplementedError()
+
+    def delete(self, key):
+        """Remove ``key`` from the cache.
+
+        从缓存中移除 `key`.
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        """Remove all values from the cache.
+
+        从缓存中移除所有值.
+        """
+        raise NotImplementedError()
+
+
+class LRUCache(BaseCache):
+    """Stores values in memory, and removes the least recently used
+    value if there are more than ``maxsize`` values. Values are not
+    shared between processes.
+
+    在内存中存储值, 如果值的数量超过 `maxsize`, 移除最近最少使用的值. 值不会在
+    进程之间共享.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, maxsize=500):
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._data = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+
+            if item is None:
+                return None
+
+            if item[0] < time.time():
+                return None
+
+            self._data[key] = item
+            return item[1]
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.time() + timeout, value)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FileSystemCache(BaseCache):
+    """Stores pickled values in files in ``directory``, which can be
+    shared between the processes on a machine. If there are more than
+    ``threshold`` files, expired and then the oldest files are removed.
+
+    将序列化后的值存储在 `directory` 中的文件里, 可以在同一台机器的进程之间共享.
+    如果文件数量超过 `threshold`, 先移除过期的文件, 然后移除最旧的文件.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, directory, threshold=500):
+        self.directory = directory
+        self.threshold = threshold
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, key):
+        import pickle
+
+        try:
+            with open(self._path(key), "rb") as f:
+                expires, value = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.PickleError):
+            return None
+
+        if expires < time.time():
+            return None
+
+        return value
+
+    def set(self, key, value, timeout):
+        import pickle
+        import tempfile
+
+        self._prune()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((time.time() + timeout, value), f, pickle.HIGHEST_PROTOCOL)
+
+            # rename is atomic, readers see the old or the new file
+            #
+            # 重命名是原子操作, 读取者会看到旧文件或新文件
+            getattr(os, "replace", os.rename)(tmp, self._path(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _prune(self):
+        import pickle
+
+        names = [n for n in os.listdir(self.directory) if not n.endswith(".tmp")]
+
+        if len(names) < self.threshold:
+            return
+
+        now = time.time()
+        files = []
+
+        for name in names:
+            path = os.path.join(self.directory, name)
+
+            try:
+                with open(path, "rb") as f:
+                    expires = pickle.load(f)[0]
+
+                if expires < now:
+                    os.remove(path)
+                else:
+                    files.append((os.path.getmtime(path), path))
+            except (IOError, OSError, EOFError, pickle.PickleError):
+                pass
+
+        files.sort()
+
+        for _, path in files[: max(len(files) - self.threshold + 1, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class SQLiteCache(BaseCache):
+    """Stores pickled values in a SQLite database at ``path``, which can
+    be shared between the processes on a machine. Each thread uses its
+    own connection.
+
+    将序列化后的值存储在 `path` 处的 SQLite 数据库中, 可以在同一台机器的进程之间
+    共享. 每个线程使用自己的连接.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = local()
+        db = self._connect()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS flask_cache"
+            " (key TEXT PRIMARY KEY, expires REAL, value BLOB)"
+        )
+        db.commit()
+
+    def _connect(self):
+        # the backends import their modules when they are used, not when
+        # Flask is imported
+        #
+        # 后端在被使用时才导入所需的模块, 而不是在导入 Flask 时
+        import sqlite3
+
+        db = getattr(self._local, "db", None)
+
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10)
+
+        return db
+
+    def get(self, key):
+        import pickle
+
+        cursor = self._connect().execute(
+            "SELECT value FROM flask_cache WHERE key = ? AND expires >= ?",
+            (key, time.time()),
+        )
+        row = cursor.fetchone()
+        return pickle.loads(bytes(row[0])) if row is not None else None
+
+    def set(self, key, value, timeout):
+        import pickle
+        import sqlite3
+
+        db = self._connect()
+        db.execute(
+            "INSERT OR REPLACE INTO flask_cache VALUES (?, ?, ?)",
+            (
+                key,
+                time.time() + timeout,
+                sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+            ),
+        )
+        db.commit()
+
+    def delete(self, key):
+        db = self._connect()
+        db.execute("DELETE FROM flask_cache WHERE key = ?", (key,))
+        db.commit()
+
+    def clear(self):
+        db = self._connect()
+        db.execute("DELETE FROM flask_cache")
+        db.commit()
+
+
+def make_cache_key(vary=None, extra=None):
+    """Return a key for the current request made of the endpoint, the
+    path, the sorted query arguments, the values of the ``vary`` headers
+    and ``extra``. The parts are encoded as a JSON list, so different
+    requests can't produce the same key.
+
+    为当前请求返回一个由端点, 路径, 排序后的查询参数, `vary` 头的值以及 `extra`
+    组成的键. 这些部分被编码为一个 JSON 列表, 所以不同的请求不会生成相同的键.
+
+    .. versionadded:: 1.2
+    """
+    return json.dumps(
+        [
+            request.endpoint,
+            request.path,
+            sorted(request.args.items(multi=True)),
+            [request.headers.get(name) for name in vary or ()],
+            extra,
+        ],
+        separators=(",", ":"),
+    )
+
+
+def _is_cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.is_streamed
+        and "Set-Cookie" not in response.headers
+    )
+
+
+def _not_modified(response):
+    response.status_code = 304
+    response.set_data(b"")
+    response.headers.pop("Content-Length", None)
+    response.headers.pop("Content-Type", None)
+
+
+def cache_response(timeout=300, key=None, vary=None, cache=None):
+    """Decorate a view to store its response in a cache and return it
+    without calling the view for the next ``timeout`` seconds. See
+    :meth:`Flask.cache_response <flask.Flask.cache_response>`.
+
+    装饰一个视图, 将其响应存储在缓存中, 并在接下来的 `timeout` 秒内返回它而不调用
+    视图. 参见 `Flask.cache_response`.
+
+    .. versionadded:: 1.2
+    """
+    vary = tuple(vary or ())
+    vary_cookie = any(name.lower() == "cookie" for name in vary)
+
+    def decorator(f):
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return f(*args, **kwargs)
+
+            backend = cache if cache is not None else current_app.response_cache
+            cache_key = make_cache_key(vary, key() if key is not None else None)
+
+            entry = backend.get(cache_key)
+
+            if entry is not None:
+                status, headers, body, etag = entry
+                rv = current_app.response_class(body, status=status, headers=headers)
+
+                if request.if_none_match.contains(etag):
+                    _not_modified(rv)
+
+                return rv
+
+            rv = current_app.make_response(f(*args, **kwargs))
+
+            # a response that used the session depends on the cookie, it
+            # is only shared if the cookie is part of the key
+            #
+            # 使用了会话的响应取决于 cookie, 只有当 cookie 是键的一部分时才会共享
+            session = _request_ctx_stack.top.session
+
+            if session is not None and session.accessed and not vary_cookie:
+                return rv
+
+            if not _is_cacheable(rv):
+                return rv
+
+            for name in vary:
+                rv.vary.add(name)
+
+            body = rv.get_data()
+            etag = sha1(body).hexdigest()
+            rv.set_etag(etag)
+            headers = rv.headers.to_wsgi_list()
+            backend.set(cache_key, (rv.status_code, headers, body, etag), timeout)
+
+            if request.if_none_match.contains(etag):
+                _not_modified(rv)
+
+            return rv
+
+        return update_wrapper(wrapper, f)
+
+    return decorator
+
+
+class _Flight(object):
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+
+
+def single_flight(vary=None, timeout=None):
+    """Decorate a view so that concurrent identical requests wait for
+    the first one and get a copy of its response. See
+    :meth:`Flask.single_flight <flask.Flask.single_flight>`.
+
+    装饰一个视图, 使并发的相同请求等待第一个请求并得到其响应的副本. 参见
+    `Flask.single_flight`.
+
+    .. versionadded:: 1.2
+    """
+    vary = tuple(vary or ())
+    vary_cookie = any(name.lower() == "cookie" for name in vary)
+
+    def decorator(f):
+        lock = Lock()
+        flights = {}
+
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return f(*args, **kwargs)
+
+            flight_key = make_cache_key(vary)
+
+            with lock:
+                flight = flights.get(flight_key)
+                leader = flight is None
+
+                if leader:
+                    flight = flights[flight_key] = _Flight()
+
+            if not leader:
+                if flight.done.wait(timeout) and flight.result is not None:
+                    status, headers, body = flight.result
+                    return current_app.response_class(
+                        body, status=status, headers=headers
+                    )
+
+                # the first request failed, timed out or can't be shared
+                #
+                # 第一个请求失败, 超时或无法共享
+                return f(*args, **kwargs)
+
+            try:
+                rv = current_app.make_response(f(*args, **kwargs))
+                session = _request_ctx_stack.top.session
+
+                if (
+                    (session is None or not session.accessed or vary_cookie)
+                    and not rv.is_streamed
+                    and "Set-Cookie" not in rv.headers
+                ):
+                    flight.result = (
+                        rv.status_code,
+                        rv.headers.to_wsgi_list(),
+                        rv.get_data(),
+                    )
+
+                return rv
+            finally:
+                with lock:
+                    del flights[flight_key]
+
+                flight.done.set()
+
+        return update_wrapper(wrapper, f)
+
+    return decorator
@@ -16,8 +16,11 @@ import os
 import platform
 import re
 import sys
+import tempfile
 import traceback
 from functools import update_wrapper
+from hashlib import sha1
+from importlib import import_module
 from operator import attrgetter
 from threading import Lock
 from threading import Thread
@@ -25,6 +28,7 @@ from threading import Thread
 import click
 from werkzeug.utils import import_string
 
+from . import json
 from ._compat import getargspec
 from ._compat import itervalues
 from ._compat import reraise
@@ -402,9 +406,9 @@ class ScriptInfo(object):
             )
 
         if self.set_debug_flag:
-            # Update the app's debug flag through the descriptor so that
-            # other values repopulate as well.
-            app.debug = get_debug_flag()
+            # Update the app's debug flag so that other values repopulate
+            # as well, even if the factory froze the config.
+            app._set_debug(get_debug_flag())
 
         self._loaded_app = app
         return app
@@ -428,6 +432,101 @@ def with_appcontext(f):
     return update_wrapper(decorator, f)
 
 
+def _entry_points(group):
+    """Return the ``(name, value)`` of each entry point in ``group``,
+    using :mod:`importlib.metadata` if it is available.
+
+    返回 `group` 中每个入口点的 `(name, value)`, 如果 :mod:`importlib.metadata`
+    可用就使用它.
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            entry_points = None
+
+    if entry_points is not None:
+        eps = entry_points()
+
+        if hasattr(eps, "select"):
+            eps = eps.select(group=group)
+        else:
+            eps = eps.get(group, ())
+
+        return [(ep.name, ep.value) for ep in eps]
+
+    try:
+        import pkg_resources
+    except ImportError:
+        return []
+
+    return [
+        (ep.name, "%s:%s" % (ep.module_name, ".".join(ep.attrs)))
+        for ep in pkg_resources.iter_entry_points(group)
+    ]
+
+
+def _import_command(import_path):
+    """Import the command at ``import_path``, in the ``module:attr``
+    format of entry points.
+
+    导入 `import_path` 处的命令, 格式与入口点的 `module:attr` 相同.
+    """
+    module, _, attrs = import_path.partition(":")
+    rv = import_module(module.strip())
+
+    # drop the extras of an entry point, "module:attr [extra]"
+    #
+    # 去掉入口点的 extras, 即 "module:attr [extra]"
+    attrs = attrs.partition("[")[0].strip()
+
+    for attr in attrs.split(".") if attrs else ():
+        rv = getattr(rv, attr)
+
+    return rv
+
+
+def _get_commands_cache_path():
+    """The file the plugin commands are cached in. Set
+    ``FLASK_COMMANDS_CACHE`` to another file, or to an empty string to
+    disable the cache.
+
+    缓存插件命令的文件. 将 `FLASK_COMMANDS_CACHE` 设置为其他文件, 或者设置为
+    空字符串来禁用缓存.
+    """
+    rv = os.environ.get("FLASK_COMMANDS_CACHE")
+
+    if rv is None:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        rv = os.path.join(cache_home, "flask", "commands.json")
+
+    return rv or None
+
+
+def _get_sys_path_key():
+    """Installing or removing a distribution changes the modification
+    time of its directory on ``sys.path``, and with it this key.
+
+    安装或移除一个发行包会改变它在 `sys.path` 上的目录的修改时间, 从而改变
+    这个键.
+    """
+    parts = [sys.executable, sys.version]
+
+    for path in sys.path:
+        try:
+            mtime = os.stat(path or os.curdir).st_mtime
+        except OSError:
+            mtime = None
+
+        parts.append("%s %r" % (path, mtime))
+
+    return sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
 class AppGroup(click.Group):
     """This works similar to a regular click :class:`~click.Group` but it
     changes the behavior of the :meth:`command` decorator so that it
@@ -479,6 +578,11 @@ class FlaskGroup(AppGroup):
     :param set_debug_flag: Set the app's debug flag based on the active
         environment
 
+    .. versionchanged:: 1.2
+        Plugin commands are found with :mod:`importlib.metadata`, cached
+        on disk, and only imported when they are used. Added
+        :meth:`add_lazy_command`.
+
     .. versionchanged:: 1.0
         If installed, python-dotenv will be used to load environment variables
         from :file:`.env` and :file:`.flaskenv` files.
@@ -505,27 +609,140 @@ class FlaskGroup(AppGroup):
 
         if add_default_commands:
             self.add_command(run_command)
+            self.add_command(serve_command)
             self.add_command(shell_command)
             self.add_command(routes_command)
+            self.add_command(profile_cli)
+
+        self._lazy_commands = {}
+        self._imported_commands = set()
+        self._plugin_commands = None
+        self._plugin_commands_cache = None
+
+    def add_lazy_command(self, name, import_path, short_help=None):
+        """Register a command that is only imported from ``import_path``
+        when it is invoked, in the ``module:attr`` format of entry
+        points. The ``short_help`` is shown by ``--help`` instead of
+        importing the command to get it.
 
-        self._loaded_plugin_commands = False
+        注册一个只在被调用时才从 `import_path` 导入的命令, `import_path` 的格式
+        与入口点的 `module:attr` 相同. `--help` 显示 `short_help`, 而不是为了
+        获取它而导入命令.
+
+        .. versionadded:: 1.2
+        """
+        self._lazy_commands[name] = {"import": import_path, "short_help": short_help}
 
     def _load_plugin_commands(self):
-        if self._loaded_plugin_commands:
+        """Find the commands in the ``flask.commands`` entry points
+        without importing them. The entry points, and the help of the
+        commands that were imported before, are cached on disk until a
+        distribution is installed or removed.
+
+        在不导入的情况下查找 `flask.commands` 入口点中的命令. 入口点以及之前
+        导入过的命令的帮助信息会缓存在磁盘上, 直到安装或移除一个发行包.
+        """
+        if self._plugin_commands is not None:
+            return self._plugin_commands
+
+        path = _get_commands_cache_path()
+        key = _get_sys_path_key()
+        commands = None
+
+        if path is not None:
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+
+                if data["key"] == key:
+                    commands = data["commands"]
+            except Exception:
+                pass
+
+        if commands is None:
+            commands = {}
+
+            for name, value in _entry_points("flask.commands"):
+                commands[name] = {"import": value}
+
+            self._save_plugin_commands(path, key, commands)
+
+        self._plugin_commands = commands
+        self._plugin_commands_cache = (path, key)
+        return commands
+
+    def _save_plugin_commands(self, path, key, commands):
+        if path is None:
             return
+
         try:
-            import pkg_resources
-        except ImportError:
-            self._loaded_plugin_commands = True
-            return
+            directory = os.path.dirname(path)
 
-        for ep in pkg_resources.iter_entry_points("flask.commands"):
-            self.add_command(ep.load(), ep.name)
-        self._loaded_plugin_commands = True
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
 
-    def get_command(self, ctx, name):
-        self._load_plugin_commands()
+            fd, tmp = tempfile.mkstemp(dir=directory or None, suffix=".tmp")
+
+            with os.fdopen(fd, "w") as f:
+                json.dump({"key": key, "commands": commands}, f)
+
+            # rename is atomic, other processes see the old or the new file
+            #
+            # 重命名是原子的, 其他进程看到的是旧文件或新文件
+            getattr(os, "replace", os.rename)(tmp, path)
+        except (IOError, OSError):
+            # the cache is only an optimization
+            #
+            # 缓存只是一种优化
+            pass
+
+    def _get_lazy_command(self, ctx, name):
+        """Return the lazy or plugin command ``name``, importing it
+        unless its help is only needed to list it.
+
+        返回惰性或插件命令 `name`, 除非只需要它的帮助信息来列出它, 否则会
+        导入它.
+        """
+        if name in self._imported_commands:
+            return None
+
+        plugins = self._load_plugin_commands()
+        info = self._lazy_commands.get(name)
+        is_plugin = info is None
 
+        if is_plugin:
+            info = plugins.get(name)
+
+            if info is None:
+                return None
+
+        if ctx.meta.get("flask.describe_commands") and info.get("short_help"):
+            rv = click.Command(
+                name, help=info.get("help"), short_help=info["short_help"]
+            )
+            # Click < 7 doesn't know about hidden commands
+            #
+            # Click 7 之前的版本不支持隐藏的命令
+            rv.hidden = info.get("hidden", False)
+            return rv
+
+        rv = _import_command(info["import"])
+        self.add_command(rv, name)
+        self._imported_commands.add(name)
+
+        if is_plugin and "short_help" not in info:
+            get_short_help = getattr(rv, "get_short_help_str", None)
+            info.update(
+                short_help=get_short_help() if get_short_help else rv.short_help,
+                help=rv.help,
+                hidden=getattr(rv, "hidden", False),
+            )
+            path, key = self._plugin_commands_cache
+            self._save_plugin_commands(path, key, plugins)
+
+        return rv
+
+    def get_command(self, ctx, name):
         # We load built-in commands first as these should always be the
         # same no matter what the app does.  If the app does want to
         # override this it needs to make a custom instance of this group
@@ -533,7 +750,17 @@ class FlaskGroup(AppGroup):
         #
         # This also means that the script stays functional in case the
         # application completely fails.
-        rv = AppGroup.get_command(self, ctx, name)
+        #
+        # Lazy and plugin commands are imported first, they replace the
+        # built-in commands of the same name like plugins always did.
+        #
+        # 惰性命令和插件命令会先被导入, 它们会像插件一直以来那样替换同名的
+        # 内置命令.
+        rv = self._get_lazy_command(ctx, name)
+
+        if rv is None:
+            rv = AppGroup.get_command(self, ctx, name)
+
         if rv is not None:
             return rv
 
@@ -546,11 +773,11 @@ class FlaskGroup(AppGroup):
             pass
 
     def list_commands(self, ctx):
-        self._load_plugin_commands()
-
         # The commands available is the list of both the application (if
         # available) plus the builtin commands.
         rv = set(click.Group.list_commands(self, ctx))
+        rv.update(self._lazy_commands)
+        rv.update(self._load_plugin_commands())
         info = ctx.ensure_object(ScriptInfo)
         try:
             rv.update(info.load_app().cli.list_commands(ctx))
@@ -564,6 +791,18 @@ class FlaskGroup(AppGroup):
             traceback.print_exc()
         return sorted(rv)
 
+    def format_commands(self, ctx, formatter):
+        # list the lazy commands with their cached help, without
+        # importing them
+        #
+        # 使用缓存的帮助信息列出惰性命令, 而不导入它们
+        ctx.meta["flask.describe_commands"] = True
+
+        try:
+            AppGroup.format_commands(self, ctx, formatter)
+        finally:
+            del ctx.meta["flask.describe_commands"]
+
     def main(self, *args, **kwargs):
         # Set a global flag that indicates that we were invoked from the
         # command line interface. This is detected by Flask.run to make the
@@ -861,6 +1100,65 @@ def run_command(
     )
 
 
+@click.command("serve", short_help="Run a preforking server.")
+@click.option("--host", "-h", default="127.0.0.1", help="The interface to bind to.")
+@click.option("--port", "-p", default=5000, help="The port to bind to.")
+@click.option("--workers", "-w", default=2, help="The number of worker processes.")
+@click.option(
+    "--threads", default=8, help="The connections each worker handles at once."
+)
+@click.option(
+    "--backlog", default=128, help="The connections that can wait to be accepted."
+)
+@click.option(
+    "--keep-alive",
+    default=5.0,
+    help="Seconds an idle connection is kept open for another request.",
+)
+@click.option(
+    "--graceful-timeout",
+    default=30.0,
+    help="Seconds a stopping worker can take to finish its connections.",
+)
+@click.option(
+    "--warmup/--no-warmup",
+    default=True,
+    help="Call 'app.warmup()' before forking the workers.",
+)
+@pass_script_info
+def serve_command(
+    info, host, port, workers, threads, backlog, keep_alive, graceful_timeout, warmup
+):
+    """Run the app with a preforking, multi-threaded server.
+
+    The app is loaded and warmed up once, then the worker processes are
+    forked from it. Send SIGHUP to reload the config files and replace
+    the workers gracefully, and SIGTERM or SIGINT to stop. Not
+    available on Windows.
+    """
+    if not hasattr(os, "fork"):
+        raise click.UsageError("'flask serve' requires 'os.fork'.")
+
+    from .serving import PreforkServer
+
+    server = PreforkServer(
+        info.load_app(),
+        host,
+        port,
+        workers=workers,
+        threads=threads,
+        backlog=backlog,
+        keep_alive=keep_alive,
+        graceful_timeout=graceful_timeout,
+    )
+    server.bind()
+    click.echo(
+        " * Serving on http://%s:%d/ with %d workers, %d threads each"
+        " (Press CTRL+C to quit)" % (host, server.port, workers, threads)
+    )
+    server.run(warmup=warmup)
+
+
 @click.command("shell", short_help="Run a shell in the app context.")
 @with_appcontext
 def shell_command():
@@ -942,6 +1240,53 @@ def routes_command(sort, all_methods):
         click.echo(row.format(rule.endpoint, methods, rule.rule).rstrip())
 
 
+profile_cli = AppGroup("profile", help="Work with the sampling profiler.")
+
+
+@profile_cli.command("dump")
+@click.option(
+    "--server",
+    "-s",
+    default="http://127.0.0.1:5000",
+    help="The URL of the running application to get the stacks from.",
+)
+@click.option("--endpoint", "-e", help="Only show the stacks of this endpoint.")
+def profile_dump_command(server, endpoint):
+    """Show the stacks sampled by the profiler of a running application
+    in the collapsed format, which can be rendered by flame graph tools.
+    The application must register the endpoint with
+    ``app.profiler.register_endpoint()`` and set ``PROFILER_TOKEN``.
+    """
+    try:
+        from urllib.request import Request, urlopen
+        from urllib.parse import urlencode
+    except ImportError:
+        from urllib2 import Request, urlopen
+        from urllib import urlencode
+
+    rule = current_app.profiler.rule
+    token = current_app.config["PROFILER_TOKEN"]
+
+    if rule is None or not token:
+        raise click.UsageError(
+            "Call 'app.profiler.register_endpoint()' and set 'PROFILER_TOKEN'"
+            " to dump the profiler stacks."
+        )
+
+    url = server.rstrip("/") + rule
+
+    if endpoint is not None:
+        url += "?" + urlencode({"endpoint": endpoint})
+
+    req = Request(url, headers={"Authorization": "Bearer " + token})
+    response = urlopen(req)
+
+    try:
+        click.echo(response.read().decode("utf-8"), nl=False)
+    finally:
+        response.close()
+
+
 cli = FlaskGroup(
     help="""\
 A general utility script for Flask applications.
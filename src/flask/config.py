@@ -13,6 +13,8 @@
 import errno
 import os
 import types
+from threading import Event
+from threading import Thread
 
 from werkzeug.utils import import_string
 
@@ -21,6 +23,77 @@ from ._compat import iteritems
 from ._compat import string_types
 
 
+# compiled config files, mapping the file name to its modification
+# time, size and code object
+#
+# 编译后的配置文件, 将文件名映射到其修改时间, 大小和代码对象
+_code_cache = {}
+
+
+def _compile_file(filename):
+    """Return the code object of a Python file, reusing the compiled code
+    as long as the file's modification time and size don't change.
+
+    返回 Python 文件的代码对象, 只要文件的修改时间和大小不变, 就复用编译后的代码.
+    """
+    with open(filename, mode="rb") as config_file:
+        st = os.fstat(config_file.fileno())
+        key = (getattr(st, "st_mtime_ns", st.st_mtime), st.st_size)
+        cached = _code_cache.get(filename)
+
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        code = compile(config_file.read(), filename, "exec")
+
+    _code_cache[filename] = (key, code)
+    return code
+
+
+# keys that are read while handling requests, :meth:`Config.freeze`
+# copies them to the attributes of :attr:`Config.frozen`
+#
+# 处理请求时读取的键, `Config.freeze` 会将它们复制到 `Config.frozen` 的属性中
+_frozen_keys = (
+    "ENV",
+    "DEBUG",
+    "TESTING",
+    "SECRET_KEY",
+    "SESSION_COOKIE_NAME",
+    "PERMANENT_SESSION_LIFETIME",
+    "USE_X_SENDFILE",
+    "SEND_FILE_MAX_AGE_DEFAULT",
+    "SERVER_NAME",
+    "APPLICATION_ROOT",
+    "PREFERRED_URL_SCHEME",
+    "MAX_CONTENT_LENGTH",
+    "MAX_COOKIE_SIZE",
+    "EXPLAIN_TEMPLATE_LOADING",
+    "JSON_AS_ASCII",
+    "JSON_SORT_KEYS",
+    "JSONIFY_PRETTYPRINT_REGULAR",
+    "JSONIFY_MIMETYPE",
+)
+
+
+class FrozenConfig(object):
+    """The values of the config keys that are read while handling
+    requests, taken when :meth:`Config.freeze` was called. Each key is
+    an attribute, for example ``config.frozen.SERVER_NAME``.
+
+    调用 `Config.freeze` 时获取的处理请求时读取的配置键的值. 每个键都是一个属性,
+    例如 `config.frozen.SERVER_NAME`.
+
+    .. versionadded:: 1.2
+    """
+
+    __slots__ = _frozen_keys
+
+    def __init__(self, config):
+        for key in _frozen_keys:
+            setattr(self, key, config.get(key))
+
+
 class ConfigAttribute(object):
     """Makes an attribute forward to the config
 
@@ -31,11 +104,16 @@ class ConfigAttribute(object):
     def __init__(self, name, get_converter=None):
         self.__name__ = name
         self.get_converter = get_converter
+        self._frozen = name in _frozen_keys
 
     def __get__(self, obj, type=None):
         if obj is None:
             return self
-        rv = obj.config[self.__name__]
+        frozen = getattr(obj.config, "frozen", None)
+        if frozen is not None and self._frozen:
+            rv = getattr(frozen, self.__name__)
+        else:
+            rv = obj.config[self.__name__]
         if self.get_converter is not None:
             rv = self.get_converter(rv)
         return rv
@@ -116,6 +194,223 @@ class Config(dict):
         dict.__init__(self, defaults or {})
         self.root_path = root_path
 
+        #: A :class:`FrozenConfig` with the values of the keys that are
+        #: read while handling requests, once :meth:`freeze` was called.
+        #: ``None`` before that.
+        #:
+        #: .. versionadded:: 1.2
+        #
+        # 调用 `freeze` 之后, 为包含处理请求时读取的键的值的 `FrozenConfig`.
+        # 在此之前为 `None`.
+        self.frozen = None
+
+        # keys that Flask detected from other keys, like the session
+        # cookie domain from SERVER_NAME, they are detected again after
+        # a reload
+        #
+        # Flask 根据其他键检测出的键, 例如根据 SERVER_NAME 检测出的会话 cookie 域名,
+        # 重新加载之后会再次检测
+        self._derived_keys = frozenset()
+
+        # what reload replays, in order: (loader method name, file name,
+        # None) for each loaded file, and ("set", key, value) or
+        # ("delete", key, None) for each key changed after the first file
+        #
+        # reload 按顺序重放的内容: 每个已加载文件为 (加载方法名, 文件名, None),
+        # 加载第一个文件之后修改的每个键为 ("set", key, value) 或
+        # ("delete", key, None)
+        self._sources = []
+
+        # greater than zero while a file is being loaded, the keys it sets
+        # are not recorded
+        #
+        # 加载文件时大于零, 文件设置的键不会被记录
+        self._loading = 0
+
+    def _add_source(self, loader, filename):
+        if (loader, filename, None) not in self._sources:
+            self._sources = self._sources + [(loader, filename, None)]
+
+    def _record(self, kind, key, value=None):
+        if not self._sources or self._loading:
+            return
+
+        # only the last change to a key since the last file matters
+        #
+        # 自最后一个文件以来, 只有对键的最后一次修改是有意义的
+        start = len(self._sources)
+
+        while start and self._sources[start - 1][0] in ("set", "delete"):
+            start -= 1
+
+        self._sources = (
+            self._sources[:start]
+            + [entry for entry in self._sources[start:] if entry[1] != key]
+            + [(kind, key, value)]
+        )
+
+    @property
+    def files(self):
+        """The names of the files loaded with :meth:`from_pyfile`,
+        :meth:`from_envvar` and :meth:`from_json`, in the order they were
+        first loaded.
+
+        通过 `from_pyfile`, `from_envvar` 和 `from_json` 加载的文件名, 按首次加载的
+        顺序排列.
+
+        .. versionadded:: 1.2
+        """
+        return [
+            filename
+            for kind, filename, _ in self._sources
+            if kind not in ("set", "delete")
+        ]
+
+    def reload(self):
+        """Return a new config with the current values, updated by
+        loading the :attr:`files` again in order. The new config is
+        frozen if this one is. This config is not changed.
+
+        返回一个包含当前值的新配置, 并按顺序再次加载 `files` 来更新它. 如果此配置是
+        冻结的, 新配置也会冻结. 此配置不会被修改.
+
+        Keys that were set or deleted after the first file was loaded,
+        directly or with a method like :meth:`from_mapping`, are set or
+        deleted again in the same order relative to the files, so a file
+        doesn't revert them. Keys that were removed from a file keep
+        their value. Files that don't exist anymore are skipped. Values
+        that Flask detected, like the ``SESSION_COOKIE_DOMAIN`` detected
+        from ``SERVER_NAME``, are reset to ``None`` to be detected again.
+
+        加载第一个文件之后直接或通过 `from_mapping` 等方法设置或删除的键, 会按照
+        相对于文件的相同顺序再次设置或删除, 所以文件不会还原它们. 从文件中删除的键
+        会保留其值. 不再存在的文件会被跳过. Flask 检测出的值, 例如根据 `SERVER_NAME`
+        检测出的 `SESSION_COOKIE_DOMAIN`, 会被重置为 `None` 以便再次检测.
+
+        .. versionadded:: 1.2
+        """
+        rv = self.__class__(self.root_path, self)
+
+        for key in self._derived_keys:
+            rv[key] = None
+
+        for kind, key, value in self._sources:
+            if kind == "set":
+                rv[key] = value
+            elif kind == "delete":
+                rv.pop(key, None)
+            else:
+                getattr(rv, kind)(key, silent=True)
+
+        if self.frozen is not None:
+            rv.freeze()
+
+        return rv
+
+    def _set_derived(self, key, value):
+        """Set a key detected from other keys, even if the config is
+        frozen. :meth:`reload` sets it to ``None`` so it is detected
+        again.
+        """
+        dict.__setitem__(self, key, value)
+        self._derived_keys = self._derived_keys | {key}
+
+    def _set_runtime(self, key, value):
+        """Set a key that Flask changes at runtime, like ``DEBUG`` from
+        the ``FLASK_DEBUG`` environment variable, even if the config is
+        frozen. The :attr:`frozen` snapshot is updated too.
+        """
+        dict.__setitem__(self, key, value)
+
+        if self.frozen is not None and key in _frozen_keys:
+            setattr(self.frozen, key, value)
+
+    def freeze(self):
+        """Prevent further changes to the config, and take a
+        :class:`FrozenConfig` snapshot of the keys that are read while
+        handling requests, which Flask uses instead of looking them up
+        in the dict. Call this once the application is set up::
+
+        阻止对配置的进一步修改, 并为处理请求时读取的键创建一个 `FrozenConfig` 快照,
+        Flask 会使用它而不是在字典中查找这些键. 在应用设置完成后调用:
+
+            app = create_app()
+            app.config.freeze()
+
+        Setting or deleting keys afterwards, including through the
+        ``from_`` methods, raises a :exc:`TypeError`.
+
+        之后设置或删除键, 包括通过 `from_` 开头的方法, 都会抛出 `TypeError`.
+
+        Flask still sets ``DEBUG`` and ``ENV`` from the environment when
+        the CLI loads the application or :meth:`~flask.Flask.run` starts
+        the server.
+
+        当 CLI 加载应用或 `Flask.run` 启动服务器时, Flask 仍然会根据环境变量设置
+        `DEBUG` 和 `ENV`.
+
+        .. versionadded:: 1.2
+        """
+        self.frozen = FrozenConfig(self)
+
+    def _check_frozen(self):
+        if self.frozen is not None:
+            raise TypeError("The config is frozen and can't be changed.")
+
+    def __setitem__(self, key, value):
+        self._check_frozen()
+        dict.__setitem__(self, key, value)
+        self._record("set", key, value)
+
+    def __delitem__(self, key):
+        self._check_frozen()
+        dict.__delitem__(self, key)
+        self._record("delete", key)
+
+    def clear(self):
+        self._check_frozen()
+
+        for key in list(self) if self._sources else ():
+            self._record("delete", key)
+
+        dict.clear(self)
+
+    def pop(self, *args):
+        self._check_frozen()
+
+        if args and args[0] in self:
+            self._record("delete", args[0])
+
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._check_frozen()
+        rv = dict.popitem(self)
+        self._record("delete", rv[0])
+        return rv
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._check_frozen()
+            self._record("set", key, default)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._check_frozen()
+
+        if self._sources and not self._loading:
+            for key, value in dict(*args, **kwargs).items():
+                self[key] = value
+        else:
+            dict.update(self, *args, **kwargs)
+
+    def __reduce__(self):
+        # pass the items to the constructor, copying or unpickling a
+        # frozen config would set them after the attributes otherwise
+        #
+        # 将项传给构造函数, 否则复制或反序列化冻结的配置时会在设置属性之后设置它们
+        return self.__class__, (self.root_path, dict(self)), self.__dict__
+
     def from_envvar(self, variable_name, silent=False):
         """Loads a configuration from an environment variable pointing to
         a configuration file.  This is basically just a shortcut with nicer
@@ -166,19 +461,108 @@ class Config(dict):
 
         .. versionadded:: 0.7
            `silent` parameter.
+
+        .. versionchanged:: 1.2
+            The compiled code is reused while the file's modification time
+            and size stay the same.
         """
         filename = os.path.join(self.root_path, filename)
+        self._add_source("from_pyfile", filename)
         d = types.ModuleType("config")
         d.__file__ = filename
         try:
-            with open(filename, mode="rb") as config_file:
-                exec(compile(config_file.read(), filename, "exec"), d.__dict__)
+            exec(_compile_file(filename), d.__dict__)
         except IOError as e:
             if silent and e.errno in (errno.ENOENT, errno.EISDIR, errno.ENOTDIR):
                 return False
             e.strerror = "Unable to load configuration file (%s)" % e.strerror
             raise
-        self.from_object(d)
+        self._loading += 1
+        try:
+            self.from_object(d)
+        finally:
+            self._loading -= 1
+        return True
+
+    def from_prefixed_env(self, prefix="FLASK", loads=json.loads):
+        """Load any environment variables that start with ``FLASK_``,
+        dropping the prefix from the env key for the config key. Values
+        are passed through a loading function to attempt to convert them
+        to more specific types than strings::
+
+        加载所有以 `FLASK_` 开头的环境变量, 去掉前缀后作为配置的键. 值会传给一个加载
+        函数, 尝试将其转换为比字符串更具体的类型:
+
+            $ export FLASK_SECRET_KEY=dev
+            $ export FLASK_MAX_CONTENT_LENGTH=1048576
+            $ export FLASK_DATABASE__PORT=5432
+
+        Keys are loaded in :func:`sorted` order. The default loading
+        function attempts to parse values as any valid JSON type,
+        including dicts and lists. If it fails, the value stays a string.
+        Specific items in nested dicts can be set by separating the keys
+        with double underscores (``__``). If an intermediate key doesn't
+        exist, it will be initialized to an empty dict.
+
+        键按 `sorted` 的顺序加载. 默认的加载函数尝试将值解析为任意有效的 JSON 类型,
+        包括字典和列表. 如果解析失败, 值仍为字符串. 可以使用双下划线 (`__`) 分隔键来
+        设置嵌套字典中的特定项. 如果中间的键不存在, 会初始化为空字典.
+
+        :param prefix: Load env vars that start with this prefix,
+            separated with an underscore (``_``).
+        参数 prefix: 加载以此前缀开头并以下划线 (`_`) 分隔的环境变量.
+
+        :param loads: Pass each string value to this function and use
+            the returned value as the config value. If any error is
+            raised it is ignored and the value remains a string.
+        参数 loads: 将每个字符串值传给这个函数, 并使用其返回值作为配置值. 如果抛出
+            任何错误, 都会被忽略, 值仍为字符串.
+
+        .. versionadded:: 1.2
+        """
+        prefix = prefix + "_"
+        len_prefix = len(prefix)
+
+        for key in sorted(os.environ):
+            if not key.startswith(prefix):
+                continue
+
+            value = os.environ[key]
+
+            try:
+                value = loads(value)
+            except Exception:
+                # keep the value as a string if loading failed
+                #
+                # 如果加载失败, 保留字符串值
+                pass
+
+            key = key[len_prefix:]
+
+            if "__" not in key:
+                # a non-nested key, set directly
+                #
+                # 非嵌套的键, 直接设置
+                self[key] = value
+                continue
+
+            # traverse nested dictionaries with keys separated by "__"
+            #
+            # 遍历以 "__" 分隔键的嵌套字典
+            current = self
+            parts = key.split("__")
+
+            for part in parts[:-1]:
+                # create any missing nested dictionaries
+                #
+                # 创建缺失的嵌套字典
+                if part not in current:
+                    current[part] = {}
+
+                current = current[part]
+
+            current[parts[-1]] = value
+
         return True
 
     def from_object(self, obj):
@@ -258,6 +642,7 @@ class Config(dict):
         .. versionadded:: 0.11
         """
         filename = os.path.join(self.root_path, filename)
+        self._add_source("from_json", filename)
 
         try:
             with open(filename) as json_file:
@@ -267,7 +652,11 @@ class Config(dict):
                 return False
             e.strerror = "Unable to load configuration file (%s)" % e.strerror
             raise
-        return self.from_mapping(obj)
+        self._loading += 1
+        try:
+            return self.from_mapping(obj)
+        finally:
+            self._loading -= 1
 
     def from_mapping(self, *mapping, **kwargs):
         """Updates the config like :meth:`update` ignoring items with non-upper
@@ -347,3 +736,70 @@ class Config(dict):
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, dict.__repr__(self))
+
+
+class ConfigWatcher(object):
+    """Checks the modification time of the application's config
+    :attr:`~Config.files` every ``interval`` seconds in a background
+    thread, and calls :meth:`Flask.reload_config
+    <flask.Flask.reload_config>` when one of them changed. Returned by
+    :meth:`Flask.watch_config <flask.Flask.watch_config>`.
+
+    在后台线程中每隔 `interval` 秒检查一次应用配置的 `Config.files` 的修改时间,
+    当其中一个发生变化时调用 `Flask.reload_config`. 由 `Flask.watch_config` 返回.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, app, interval=1.0):
+        self.app = app
+        self.interval = interval
+        self._stopped = Event()
+        self._mtimes = self._get_mtimes()
+        self._thread = Thread(target=self._run, name="flask-config-watcher")
+        self._thread.daemon = True
+
+    def _get_mtimes(self):
+        rv = {}
+
+        for filename in self.app.config.files:
+            try:
+                rv[filename] = os.stat(filename).st_mtime
+            except OSError:
+                rv[filename] = None
+
+        return rv
+
+    def start(self):
+        """Start the background thread.
+
+        启动后台线程.
+        """
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and wait for it to finish.
+
+        停止后台线程并等待其结束.
+        """
+        self._stopped.set()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            mtimes = self._get_mtimes()
+
+            if mtimes == self._mtimes:
+                continue
+
+            self._mtimes = mtimes
+
+            try:
+                self.app.reload_config()
+            except Exception:
+                # keep the current config if a file can't be loaded
+                #
+                # 如果某个文件无法加载, 保留当前配置
+                self.app.logger.exception("Failed to reload the configuration.")
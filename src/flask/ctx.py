@@ -21,6 +21,8 @@ from .globals import _app_ctx_stack
 from .globals import _request_ctx_stack
 from .signals import appcontext_popped
 from .signals import appcontext_pushed
+from .timing import RequestTiming
+from .timing import timer
 
 
 # a singleton sentinel value for parameter defaults
@@ -251,10 +253,28 @@ class AppContext(object):
     应用上下文隐式绑定到当前线程或 `greenlet` 的应用对象. 类似于 `RequestContext`
     绑定请求信息的实现方式. 如果请求上下文被创建, 应用上下文也隐式创建,
     但应用不在单个应用上下文的栈顶.
+
+    .. versionchanged:: 1.2
+        The attributes are stored in ``__slots__``. A ``__dict__`` is
+        only created if other attributes are set on the context.
     """
 
+    __slots__ = (
+        "app",
+        "url_adapter",
+        "g",
+        "_refcnt",
+        "_config",
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(self, app):
         self.app = app
+        # the config the URL adapter was created from
+        #
+        # 创建 URL 适配器时使用的配置
+        self._config = app.config
         self.url_adapter = app.create_url_adapter(None)
         self.g = app.app_ctx_globals_class()
 
@@ -271,7 +291,8 @@ class AppContext(object):
         if hasattr(sys, "exc_clear"):
             sys.exc_clear()
         _app_ctx_stack.push(self)
-        appcontext_pushed.send(self.app)
+        if appcontext_pushed.receivers:
+            appcontext_pushed.send(self.app)
 
     def pop(self, exc=_sentinel):
         """Pops the app context.
@@ -286,7 +307,8 @@ class AppContext(object):
         finally:
             rv = _app_ctx_stack.pop()
         assert rv is self, "Popped wrong app context.  (%r instead of %r)" % (rv, self)
-        appcontext_popped.send(self.app)
+        if appcontext_popped.receivers:
+            appcontext_popped.send(self.app)
 
     def __enter__(self):
         self.push()
@@ -346,20 +368,34 @@ class RequestContext(object):
     你会发现这在单元测试时很有用. 单元测试时需要上下文的信息多保留一段时间.
     在这种情况下一定要正确地自行通过 `werkzeug.LocalStack.pop` 方法弹出上下文,
     否则单元测试将会出现泄漏内存的情况.
+
+    .. versionchanged:: 1.2
+        The attributes are stored in ``__slots__``. A ``__dict__`` is
+        only created if other attributes are set on the context, for
+        example by extensions.
+
+        属性存储在 `__slots__` 中. 只有当上下文上设置了其他属性时(例如由拓展设置)
+        才会创建 `__dict__`.
     """
 
+    __slots__ = (
+        "app",
+        "request",
+        "url_adapter",
+        "flashes",
+        "session",
+        "_implicit_app_ctx_stack",
+        "preserved",
+        "_preserved_exc",
+        "_after_request_functions",
+        "timing",
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(self, app, environ, request=None, session=None):
         self.app = app
-        if request is None:
-            request = app.request_class(environ)
-        self.request = request
-        self.url_adapter = None
-        try:
-            self.url_adapter = app.create_url_adapter(self.request)
-        except HTTPException as e:
-            self.request.routing_exception = e
-        self.flashes = None
-        self.session = session
+        self._bind(environ, request, session)
 
         # Request contexts can be pushed multiple times and interleaved with
         # other request contexts.  Now only if the last level is popped we
@@ -390,6 +426,37 @@ class RequestContext(object):
         # 函数之前调用.
         self._after_request_functions = []
 
+    def _bind(self, environ, request=None, session=None):
+        #: The :class:`~flask.timing.RequestTiming` of this request if
+        #: :data:`REQUEST_TIMING` is enabled, otherwise ``None``.
+        #
+        # 如果启用了 `REQUEST_TIMING`, 为此请求的 `flask.timing.RequestTiming`,
+        # 否则为 `None`.
+        self.timing = RequestTiming() if self.app.config["REQUEST_TIMING"] else None
+
+        if request is None:
+            request = self.app.request_class(environ)
+        self.request = request
+        self.url_adapter = None
+        try:
+            self.url_adapter = self.app.create_url_adapter(self.request)
+        except HTTPException as e:
+            self.request.routing_exception = e
+        self.flashes = None
+        self.session = session
+
+    def _reset(self, app, environ):
+        """Prepare a request context that was cleared by
+        :class:`_RequestContextPool` to be used for a new WSGI
+        environment.
+
+        为新的 WSGI 环境准备一个被 `_RequestContextPool` 清空的请求上下文.
+        """
+        self.app = app
+        self._bind(environ)
+        self.preserved = False
+        self._preserved_exc = None
+
     @property
     def g(self):
         return _app_ctx_stack.top.g
@@ -460,7 +527,7 @@ class RequestContext(object):
         # 推入请求上下文前必须保证有应用上下文.
         app_ctx = _app_ctx_stack.top
         if app_ctx is None or app_ctx.app != self.app:
-            app_ctx = self.app.app_context()
+            app_ctx = self.app._app_context_pool.acquire()
             app_ctx.push()
             self._implicit_app_ctx_stack.append(app_ctx)
         else:
@@ -471,6 +538,10 @@ class RequestContext(object):
 
         _request_ctx_stack.push(self)
 
+        timing = self.timing
+        if timing is not None:
+            timing.add("context", timing.started)
+
         # Open the session at the moment that the request context is available.
         # This allows a custom open_session method to use the request context.
         # Only open a new session if this is the first time the request was
@@ -479,15 +550,27 @@ class RequestContext(object):
         # 在请求上下文可用时打开会话. 允许自定义的 open_session 方法使用应用上下文.
         # 只有第一次推入请求的时候才开启新的会话, 不然 stream_with_context 会丢失会话.
         if self.session is None:
+            if timing is not None:
+                start = timer()
+
             session_interface = self.app.session_interface
             self.session = session_interface.open_session(self.app, self.request)
 
             if self.session is None:
                 self.session = session_interface.make_null_session(self.app)
 
+            if timing is not None:
+                timing.add("session", start)
+
         if self.url_adapter is not None:
+            if timing is not None:
+                start = timer()
+
             self.match_request()
 
+            if timing is not None:
+                timing.add("match", start)
+
     def pop(self, exc=_sentinel):
         """Pops the request context and unbinds it by doing that.  This will
         also trigger the execution of functions registered by the
@@ -507,8 +590,17 @@ class RequestContext(object):
                 self._preserved_exc = None
                 if exc is _sentinel:
                     exc = sys.exc_info()[1]
+
+                timing = self.timing
+                if timing is not None:
+                    start = timer()
+
                 self.app.do_teardown_request(exc)
 
+                if timing is not None:
+                    timing.add("teardown", start)
+                    self.app.timing_stats.add(timing)
+
                 # If this interpreter supports clearing the exception information
                 # we do that now.  This will only go into effect on Python 2.x,
                 # on 3.x it disappears automatically at the end of the exception
@@ -536,6 +628,7 @@ class RequestContext(object):
             # 如果有必要, 同样弹出 app
             if app_ctx is not None:
                 app_ctx.pop(exc)
+                self.app._app_context_pool.release(app_ctx)
 
             assert rv is self, "Popped wrong request context. (%r instead of %r)" % (
                 rv,
@@ -576,3 +669,132 @@ class RequestContext(object):
             self.request.method,
             self.app.name,
         )
+
+
+class _AppContextPool(object):
+    """Keeps the application contexts that were pushed implicitly by
+    :meth:`RequestContext.push` around so the next request can push them
+    again instead of creating a new one. At most
+    :data:`APP_CONTEXT_POOL_SIZE` contexts are kept, the default of ``0``
+    disables pooling.
+
+    保存由 `RequestContext.push` 隐式推入的应用上下文, 以便下一个请求再次推入它们,
+    而不是创建新的. 最多保存 `APP_CONTEXT_POOL_SIZE` 个上下文, 默认值 `0` 表示禁用池.
+
+    A reused context gets a new :data:`~flask.g` and is pushed and popped
+    as usual, so the :data:`~flask.appcontext_pushed` signal and the
+    :meth:`~flask.Flask.teardown_appcontext` functions still run for
+    every request. Its URL adapter is kept, contexts created from a
+    config that was since replaced by :meth:`~flask.Flask.reload_config`
+    are dropped.
+
+    复用的上下文会获得一个新的 `flask.g`, 并像往常一样推入和弹出, 所以每个请求仍然会
+    发送 `flask.appcontext_pushed` 信号并调用 `flask.Flask.teardown_appcontext`
+    注册的函数. 其 URL 适配器被保留, 根据已被 `flask.Flask.reload_config` 替换的配置
+    创建的上下文会被丢弃.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._free = []
+
+    def acquire(self):
+        while self._free:
+            try:
+                ctx = self._free.pop()
+            except IndexError:
+                break
+
+            # a context released while the config was reloaded
+            #
+            # 在重新加载配置期间被归还的上下文
+            if ctx._config is not self.app.config:
+                continue
+
+            ctx.g = self.app.app_ctx_globals_class()
+            return ctx
+        return self.app.app_context()
+
+    def release(self, ctx):
+        if (
+            ctx._refcnt > 0
+            or type(ctx) is not AppContext
+            or ctx._config is not self.app.config
+            or len(self._free) >= self.app.config["APP_CONTEXT_POOL_SIZE"]
+        ):
+            return
+
+        ctx.g = None
+        ctx.__dict__.clear()
+        self._free.append(ctx)
+
+    def clear(self):
+        """Drop the kept contexts, for example because their URL adapter
+        was created from an old config.
+
+        丢弃保存的上下文, 例如因为它们的 URL 适配器是根据旧配置创建的.
+        """
+        del self._free[:]
+
+
+class _RequestContextPool(object):
+    """Keeps request contexts that finished handling a request around so
+    that :meth:`~flask.Flask.wsgi_app` can reuse them instead of creating
+    a new one for each request. At most :data:`REQUEST_CONTEXT_POOL_SIZE`
+    contexts are kept, the default of ``0`` disables pooling.
+
+    保存已处理完请求的请求上下文, 以便 `flask.Flask.wsgi_app` 复用它们,
+    而不是为每个请求都创建一个新的. 最多保存 `REQUEST_CONTEXT_POOL_SIZE` 个上下文,
+    默认值 `0` 表示禁用池.
+
+    The request object and URL adapter depend on the WSGI environment
+    and are always created again. A context is only given back to the
+    pool if it was popped completely, so a context that was preserved or
+    is still pushed by :func:`~flask.stream_with_context` is never
+    reused. Copies made by :func:`copy_current_request_context` are
+    separate objects and are not affected.
+
+    请求对象和 URL 适配器依赖 WSGI 环境, 总是重新创建. 只有完全弹出的上下文才会
+    还给池, 所以被保留的上下文或仍然被 `flask.stream_with_context` 推入的上下文
+    永远不会被复用. 由 `copy_current_request_context` 创建的拷贝是独立的对象, 不受影响.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._free = []
+
+    def acquire(self, environ):
+        # list operations are atomic, no lock is needed to share the
+        # free list between threads
+        #
+        # 列表操作是原子的, 线程间共享空闲列表不需要加锁
+        if self._free:
+            try:
+                ctx = self._free.pop()
+            except IndexError:
+                pass
+            else:
+                ctx._reset(self.app, environ)
+                return ctx
+        return self.app.request_context(environ)
+
+    def release(self, ctx):
+        if (
+            ctx.preserved
+            or ctx._implicit_app_ctx_stack
+            or type(ctx) is not RequestContext
+            or len(self._free) >= self.app.config["REQUEST_CONTEXT_POOL_SIZE"]
+        ):
+            return
+
+        after_request_functions = ctx._after_request_functions
+
+        # drop the finished request right away, and anything extensions
+        # stored on the context so it can't leak into the next request
+        #
+        # 立即丢弃已完成的请求, 以及拓展存放在上下文中的任何数据, 使其无法泄漏到下一个请求
+        ctx.request = ctx.url_adapter = ctx.session = ctx.flashes = None
+        ctx.timing = None
+        ctx.__dict__.clear()
+        del after_request_functions[:]
+        self._free.append(ctx)
@@ -541,9 +541,10 @@ def flash(message, category="message"):
     flashes = session.get("_flashes", [])
     flashes.append((category, message))
     session["_flashes"] = flashes
-    message_flashed.send(
-        current_app._get_current_object(), message=message, category=category
-    )
+    if message_flashed.receivers:
+        message_flashed.send(
+            current_app._get_current_object(), message=message, category=category
+        )
 
 
 def get_flashed_messages(with_categories=False, category_filter=()):
@@ -1239,19 +1240,39 @@ class _PackageBoundObject(object):
         self.root_path = root_path
         self._static_folder = None
         self._static_url_path = None
+        self._cli = None
 
-        # circular import
-        # 循环导入
-        from .cli import AppGroup
+    @property
+    def cli(self):
+        """The Click command group for registration of CLI commands
+        on the application and associated blueprints. These commands
+        are accessible via the :command:`flask` command once the
+        application has been discovered and blueprints registered.
+
+        用于在 app 和相关蓝图上注册 CLI 命令的 Click 命令组. 在 app 发现且
+        蓝图注册完毕后, 这些命令可以通过 `flask` 命令调用.
+
+        .. versionchanged:: 1.2
+            The group is created when it is first accessed, so Click is
+            only imported by applications that use the CLI.
+        """
+        if self._cli is None:
+            # circular import
+            # 循环导入
+            from .cli import AppGroup
 
-        #: The Click command group for registration of CLI commands
-        #: on the application and associated blueprints. These commands
-        #: are accessible via the :command:`flask` command once the
-        #: application has been discovered and blueprints registered.
-        #
-        # 用于在 app 和相关蓝图上注册 CLI 命令的 Click 命令组. 在 app 发现且
-        # 蓝图注册完毕后, 这些命令可以通过 `flask` 命令调用.
-        self.cli = AppGroup()
+            self._cli = AppGroup(self._cli_name)
+
+        return self._cli
+
+    @cli.setter
+    def cli(self, value):
+        self._cli = value
+
+    #: The name of the :attr:`cli` group when it is created.
+    #
+    # 创建 `cli` 组时使用的名称.
+    _cli_name = None
 
     @property
     def static_folder(self):
@@ -18,8 +18,10 @@ from werkzeug.http import http_date
 
 from .._compat import PY2
 from .._compat import text_type
+from ..globals import _request_ctx_stack
 from ..globals import current_app
 from ..globals import request
+from ..timing import timer
 
 try:
     # 注: 支持 python 3.7+ 的 数据类.
@@ -141,10 +143,19 @@ def _dump_arg_defaults(kwargs, app=None):
             "cls", bp.json_encoder if bp and bp.json_encoder else app.json_encoder
         )
 
-        if not app.config["JSON_AS_ASCII"]:
+        frozen = app.config.frozen
+
+        if frozen is not None:
+            as_ascii = frozen.JSON_AS_ASCII
+            sort_keys = frozen.JSON_SORT_KEYS
+        else:
+            as_ascii = app.config["JSON_AS_ASCII"]
+            sort_keys = app.config["JSON_SORT_KEYS"]
+
+        if not as_ascii:
             kwargs.setdefault("ensure_ascii", False)
 
-        kwargs.setdefault("sort_keys", app.config["JSON_SORT_KEYS"])
+        kwargs.setdefault("sort_keys", sort_keys)
     else:
         kwargs.setdefault("sort_keys", True)
         kwargs.setdefault("cls", JSONEncoder)
@@ -443,8 +454,17 @@ def jsonify(*args, **kwargs):
 
     indent = None
     separators = (",", ":")
+    config = current_app.config
+    frozen = config.frozen
+
+    if frozen is not None:
+        pretty = frozen.JSONIFY_PRETTYPRINT_REGULAR or frozen.DEBUG
+        mimetype = frozen.JSONIFY_MIMETYPE
+    else:
+        pretty = config["JSONIFY_PRETTYPRINT_REGULAR"] or current_app.debug
+        mimetype = config["JSONIFY_MIMETYPE"]
 
-    if current_app.config["JSONIFY_PRETTYPRINT_REGULAR"] or current_app.debug:
+    if pretty:
         indent = 2
         separators = (", ", ": ")
 
@@ -455,11 +475,32 @@ def jsonify(*args, **kwargs):
     else:
         data = args or kwargs
 
-    return current_app.response_class(
-        dumps(data, indent=indent, separators=separators) + "\n",
-        mimetype=current_app.config["JSONIFY_MIMETYPE"],
-    )
+    reqctx = _request_ctx_stack.top
+    timing = reqctx.timing if reqctx is not None else None
+
+    if timing is None:
+        body = dumps(data, indent=indent, separators=separators)
+    else:
+        start = timer()
+        body = dumps(data, indent=indent, separators=separators)
+        timing.add("json", start)
+
+    return current_app.response_class(body + "\n", mimetype=mimetype)
 
 
 def tojson_filter(obj, **kwargs):
     return Markup(htmlsafe_dumps(obj, **kwargs))
+
+
+def __getattr__(name):
+    # flask.json.tag is only imported when the session is first used,
+    # make it available as an attribute like an imported submodule
+    #
+    # flask.json.tag 只在第一次使用会话时才被导入, 让它像已导入的子模块
+    # 一样可以作为属性访问
+    if name == "tag":
+        from importlib import import_module
+
+        return import_module(".tag", __name__)
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
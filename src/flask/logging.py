@@ -8,14 +8,32 @@ flask.logging
 """
 from __future__ import absolute_import
 
+import atexit
+import json
 import logging
+import os
 import sys
+import time
 import warnings
+import weakref
+from itertools import count
+from json.encoder import encode_basestring as _quote
+from threading import Lock
+from threading import Thread
 
 from werkzeug.local import LocalProxy
 
 from .globals import request
 
+try:
+    from queue import Empty
+    from queue import Full
+    from queue import Queue
+except ImportError:  # Python 2
+    from Queue import Empty
+    from Queue import Full
+    from Queue import Queue
+
 
 @LocalProxy
 def wsgi_errors_stream():
@@ -68,6 +86,345 @@ default_handler.setFormatter(
 )
 
 
+class JSONFormatter(logging.Formatter):
+    """Format each record as a JSON object with the ``time``, ``level``,
+    ``logger``, ``module`` and ``message`` of the record, and the
+    formatted ``exc_info`` if there is one.
+
+    将每条记录格式化为一个 JSON 对象, 包含记录的 `time`, `level`, `logger`,
+    `module` 和 `message`, 如果有异常信息, 还包含格式化后的 `exc_info`.
+
+    .. versionadded:: 1.2
+    """
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+
+        return json.dumps(data)
+
+
+_stop = object()
+
+
+def _register_at_fork(obj, method):
+    register_at_fork = getattr(os, "register_at_fork", None)
+
+    if register_at_fork is None:
+        return
+
+    ref = weakref.ref(obj)
+
+    def after_in_child():
+        obj = ref()
+
+        if obj is not None:
+            method(obj)
+
+    register_at_fork(after_in_child=after_in_child)
+
+
+class QueueHandler(logging.Handler):
+    """Put records on a bounded queue and pass them to ``handlers`` in a
+    background thread, so formatting and writing the records, including
+    tracebacks, does not block the thread that logged them.
+
+    把记录放入一个有界队列, 并在一个后台线程中传递给 `handlers`, 这样格式化和
+    写入记录 (包括 traceback) 不会阻塞记录日志的线程.
+
+    The message of a record is merged with its arguments before it is
+    queued, in case they change later. If the queue is full, the record
+    is dropped and counted in :attr:`dropped`. The queued records are
+    handled before the interpreter exits.
+
+    记录的消息在入队之前与其参数合并, 以防参数之后被修改. 如果队列已满, 记录会被
+    丢弃并计入 `dropped`. 解释器退出之前会处理完队列中的记录.
+
+    :param handlers: The handlers that handle the records in the
+        background thread.
+    参数 handlers: 在后台线程中处理记录的 handler.
+
+    :param maxsize: The number of records that can be queued.
+    参数 maxsize: 可以入队的记录数量.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, handlers, maxsize=1000, level=logging.NOTSET):
+        logging.Handler.__init__(self, level)
+        self.handlers = list(handlers)
+        self.queue = Queue(maxsize)
+
+        #: The number of records dropped because the queue was full.
+        #
+        # 因队列已满而被丢弃的记录数量.
+        self.dropped = 0
+
+        self._start()
+        atexit.register(self.stop)
+        _register_at_fork(self, QueueHandler._start)
+
+    def _start(self):
+        self._thread = Thread(target=self._run, name="flask-logging")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            self.queue.put_nowait(record)
+        except Full:
+            # emit is called with the handler lock held
+            #
+            # 调用 emit 时持有 handler 的锁
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+
+            if record is _stop:
+                break
+
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def stop(self):
+        """Handle the queued records and stop the background thread.
+
+        处理队列中的记录并停止后台线程.
+        """
+        if self._thread.is_alive():
+            self.queue.put(_stop)
+            self._thread.join()
+
+
+_access_template = (
+    '{"time":%.3f,"method":%s,"path":%s,"endpoint":%s,"status":%d,'
+    '"bytes":%s,"duration":%s,"request_id":%s}\n'
+)
+
+
+class AccessLog(object):
+    """Writes a JSON line for each request with the ``time``,
+    ``method``, ``path``, ``endpoint``, ``status``, response ``bytes``,
+    ``duration`` in seconds and ``request_id``, if :data:`ACCESS_LOG` is
+    enabled. Available as :attr:`Flask.access_log
+    <flask.Flask.access_log>`.
+
+    如果启用了 `ACCESS_LOG`, 为每个请求写入一行 JSON, 包含 `time`, `method`,
+    `path`, `endpoint`, `status`, 响应的 `bytes`, 以秒为单位的 `duration` 以及
+    `request_id`. 可以通过 `Flask.access_log` 访问.
+
+    The request id is taken from the :data:`ACCESS_LOG_REQUEST_ID_HEADER`
+    header, or generated. The lines are formatted from a fixed template
+    and put on a bounded queue, a background thread writes them to
+    :attr:`stream` in batches. Lines that don't fit in the queue are
+    dropped and counted in :attr:`dropped`. ``bytes`` is ``null`` for
+    streamed responses, ``duration`` is ``null`` for requests that ended
+    with an unhandled exception.
+
+    请求 id 取自 `ACCESS_LOG_REQUEST_ID_HEADER` 头, 或者自动生成. 每行由固定的
+    模板格式化并放入一个有界队列, 一个后台线程分批将它们写入 `stream`. 放不进
+    队列的行会被丢弃并计入 `dropped`. 对于流式响应, `bytes` 为 `null`, 对于以
+    未处理异常结束的请求, `duration` 为 `null`.
+
+    .. versionadded:: 1.2
+    """
+
+    #: The most lines written at once.
+    #
+    # 一次最多写入的行数.
+    batch_size = 100
+
+    def __init__(self, app, maxsize=10000):
+        self.app = app
+        self._maxsize = maxsize
+        self._lock = Lock()
+        self._thread = None
+
+        #: The queue of lines waiting to be written. ``None`` until the
+        #: first line is logged.
+        #
+        # 等待写入的行的队列. 在记录第一行之前为 `None`.
+        self.queue = None
+
+        #: The stream the lines are written to. ``None`` writes to
+        #: ``sys.stdout``.
+        #
+        # 写入日志行的流. `None` 表示写入 `sys.stdout`.
+        self.stream = None
+
+        #: The number of lines dropped because the queue was full.
+        #
+        # 因队列已满而被丢弃的行数.
+        self.dropped = 0
+
+    def log(self, response, duration):
+        """Write the line for the current request, which finished with
+        ``response`` after ``duration`` seconds.
+
+        为当前请求写入一行日志, 该请求以 `response` 结束并耗时 `duration` 秒.
+        """
+        if self.queue is None:
+            self._setup()
+
+        rule = request.url_rule
+        request_id = request.headers.get(
+            self.app.config["ACCESS_LOG_REQUEST_ID_HEADER"]
+        ) or self._id_prefix + "%x" % next(self._ids)
+        length = response.calculate_content_length()
+        line = _access_template % (
+            time.time(),
+            _quote(request.method),
+            _quote(request.path),
+            _quote(rule.endpoint) if rule is not None else "null",
+            response.status_code,
+            length if length is not None else "null",
+            "%.6f" % duration if duration is not None else "null",
+            _quote(request_id),
+        )
+
+        try:
+            self.queue.put_nowait(line)
+        except Full:
+            with self._lock:
+                self.dropped += 1
+            return
+
+        if self._thread is None:
+            self._start()
+
+    def _setup(self):
+        # only an app that uses the access log pays for the queue and the
+        # fork hook, which can't be unregistered
+        #
+        # 只有使用访问日志的应用才需要承担队列和 fork 钩子的开销, 钩子无法注销
+        with self._lock:
+            if self.queue is not None:
+                return
+
+            self._reset_ids()
+            _register_at_fork(self, AccessLog._reset)
+            self.queue = Queue(self._maxsize)
+
+    def _reset(self):
+        # a forked process has no background thread and needs its own
+        # request ids
+        #
+        # 派生的进程没有后台线程, 并且需要自己的请求 id
+        self._lock = Lock()
+        self._thread = None
+        self._reset_ids()
+
+    def _reset_ids(self):
+        self._ids = count()
+        self._id_prefix = "%x-%x-" % (os.getpid(), int(time.time()))
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = Thread(target=self._run, name="flask-access-log")
+            self._thread.daemon = True
+            self._thread.start()
+
+        atexit.register(self.stop)
+
+    def _run(self):
+        stop = False
+
+        while not stop:
+            line = self.queue.get()
+            batch = []
+
+            while True:
+                if line is _stop:
+                    stop = True
+                    break
+
+                batch.append(line)
+
+                if len(batch) >= self.batch_size:
+                    break
+
+                try:
+                    line = self.queue.get_nowait()
+                except Empty:
+                    break
+
+            if batch:
+                self._write("".join(batch))
+
+    def _write(self, data):
+        stream = self.stream if self.stream is not None else sys.stdout
+
+        try:
+            stream.write(data)
+            stream.flush()
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to write the access log.")
+
+    def stop(self):
+        """Write the queued lines and stop the background thread.
+
+        写入队列中的行并停止后台线程.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is not None and thread.is_alive():
+            self.queue.put(_stop)
+            thread.join()
+
+
+def _create_default_handler(app):
+    """Return :data:`default_handler`, or a handler that formats records
+    as JSON or handles them in a background thread if the app is
+    configured to.
+    """
+    queue_size = app.config["LOGGING_QUEUE_SIZE"]
+    use_json = app.config["LOGGING_JSON"]
+
+    if not queue_size and not use_json:
+        return default_handler
+
+    if queue_size:
+        # there is no request in the background thread, write to stderr
+        # directly instead of resolving wsgi_errors_stream
+        #
+        # 后台线程中没有请求, 直接写入 stderr, 而不是解析 wsgi_errors_stream
+        handler = logging.StreamHandler(sys.stderr)
+    else:
+        handler = logging.StreamHandler(wsgi_errors_stream)
+
+    if use_json:
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(default_handler.formatter)
+
+    if queue_size:
+        handler = QueueHandler([handler], queue_size)
+
+    return handler
+
+
 def _has_config(logger):
     """Decide if a logger has direct configuration applied by checking
     its properties against the defaults.
@@ -106,6 +463,12 @@ def create_logger(app):
 
     如果这个 logger 的有效日志等级没有可用的 handler, 以一个基本日志格式为
     `flask.logging.wsgi_errors_stream` 添加一个 `logging.StreamHandler`.
+
+    .. versionchanged:: 1.2
+        The added handler formats records with :class:`JSONFormatter` if
+        :data:`LOGGING_JSON` is enabled, and handles them in a background
+        thread with :class:`QueueHandler` if :data:`LOGGING_QUEUE_SIZE`
+        is set.
     """
     logger = logging.getLogger(app.name)
 
@@ -129,6 +492,6 @@ def create_logger(app):
         logger.setLevel(logging.DEBUG)
 
     if not has_level_handler(logger):
-        logger.addHandler(default_handler)
+        logger.addHandler(_create_default_handler(app))
 
     return logger
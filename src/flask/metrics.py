@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.metrics
+    ~~~~~~~~~~~~~
+
+    Counts requests, their latency and exceptions per endpoint if
+    :data:`METRICS` is enabled, and formats them in the Prometheus text
+    exposition format.
+
+    如果启用了 `METRICS`, 按端点统计请求数量, 请求延迟和异常, 并以 Prometheus
+    文本格式输出.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import json
+import os
+import struct
+import time
+import weakref
+from bisect import bisect_left
+from threading import current_thread
+from threading import local
+from threading import Lock
+from threading import Thread
+
+from .globals import request
+from .timing import TimingStats
+
+_families = (
+    ("flask_requests_total", "counter", "The number of handled requests."),
+    (
+        "flask_request_duration_seconds",
+        "histogram",
+        "The time spent dispatching requests.",
+    ),
+    ("flask_exceptions_total", "counter", "The number of raised exceptions."),
+)
+
+
+def _request_endpoint():
+    rule = request.url_rule
+    return rule.endpoint if rule is not None else ""
+
+
+def _format_label(name, value):
+    if name == "le":
+        value = "+Inf" if value == float("inf") else repr(value)
+
+    value = value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+    return '%s="%s"' % (name, value)
+
+
+class _Shard(object):
+    """The metrics recorded by a single thread. Only that thread writes
+    to it, so recording needs no lock.
+    """
+
+    __slots__ = ("thread", "requests", "latency", "exceptions")
+
+    def __init__(self, thread=None):
+        self.thread = weakref.ref(thread) if thread is not None else None
+        self.requests = {}
+        self.latency = {}
+        self.exceptions = {}
+
+    def is_alive(self):
+        thread = self.thread() if self.thread is not None else None
+        return thread is not None and thread.is_alive()
+
+    def merge(self, other):
+        for key, value in other.requests.copy().items():
+            self.requests[key] = self.requests.get(key, 0) + value
+
+        for key, value in other.exceptions.copy().items():
+            self.exceptions[key] = self.exceptions.get(key, 0) + value
+
+        for key, (count, total, counts) in other.latency.copy().items():
+            stat = self.latency.get(key)
+
+            if stat is None:
+                stat = self.latency[key] = [0, 0.0, [0] * len(counts)]
+
+            stat[0] += count
+            stat[1] += total
+            stat[2] = [a + b for a, b in zip(stat[2], counts)]
+
+
+class _MmapFile(object):
+    """The samples of one process, stored in a memory mapped file so the
+    other processes can read them. The file starts with the number of
+    used bytes, followed by entries of a key length, a JSON key padded
+    to eight bytes, and a double.
+    """
+
+    initial_size = 1 << 16
+
+    def __init__(self, path):
+        # only processes that use the multiprocess mode import mmap
+        #
+        # 只有使用多进程模式的进程才会导入 mmap
+        import mmap
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC)
+        self._size = self.initial_size
+        os.ftruncate(self._fd, self._size)
+        self._map = mmap.mmap(self._fd, self._size)
+        self._used = 8
+        self._positions = {}
+        struct.pack_into("<i", self._map, 0, self._used)
+
+    def write(self, samples):
+        for key, value in samples.items():
+            position = self._positions.get(key)
+
+            if position is None:
+                position = self._add(key)
+
+            struct.pack_into("<d", self._map, position, value)
+
+    def _add(self, key):
+        import mmap
+
+        encoded = json.dumps(key).encode("utf-8")
+        encoded += b" " * (8 - (len(encoded) + 4) % 8)
+        entry = struct.pack("<i", len(encoded)) + encoded + struct.pack("<d", 0.0)
+        end = self._used + len(entry)
+
+        if end > self._size:
+            while end > self._size:
+                self._size *= 2
+
+            self._map.close()
+            os.ftruncate(self._fd, self._size)
+            self._map = mmap.mmap(self._fd, self._size)
+
+        self._map[self._used : end] = entry
+        self._used = end
+        struct.pack_into("<i", self._map, 0, end)
+        position = self._positions[key] = end - 8
+        return position
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+def _read_mmap_file(path):
+    with open(path, "rb") as f:
+        data = f.read()
+
+    used = struct.unpack_from("<i", data, 0)[0] if len(data) >= 8 else 0
+    position = 8
+
+    while position < used:
+        length = struct.unpack_from("<i", data, position)[0]
+        position += 4
+        name, labels = json.loads(data[position : position + length].decode("utf-8"))
+        position += length
+        value = struct.unpack_from("<d", data, position)[0]
+        position += 8
+        yield (name, tuple(tuple(label) for label in labels)), value
+
+
+class MetricsRegistry(object):
+    """Counts requests per endpoint and status, their latency per
+    endpoint, and exceptions per endpoint and type. Available as
+    :attr:`Flask.metrics <flask.Flask.metrics>`.
+
+    按端点和状态码统计请求数量, 按端点统计请求延迟, 按端点和类型统计异常.
+    可以通过 `Flask.metrics` 访问.
+
+    Each thread records into its own shard without locking, the shards
+    are merged when the metrics are collected. The latency of requests
+    that end with an unhandled exception is not observed, but they are
+    counted with the status 500.
+
+    每个线程在无锁的情况下记录到自己的分片中, 收集指标时再合并各个分片. 以未处理
+    异常结束的请求的延迟不会被记录, 但会以状态码 500 计数.
+
+    If :data:`METRICS_MULTIPROCESS_DIR` is set, each process writes its
+    metrics to a memory mapped file in that directory every
+    :attr:`flush_interval` seconds, and :meth:`collect` adds up the
+    files of all processes. The directory should be emptied before the
+    server starts.
+
+    如果设置了 `METRICS_MULTIPROCESS_DIR`, 每个进程每隔 `flush_interval` 秒把
+    自己的指标写入该目录中的一个内存映射文件, `collect` 会把所有进程的文件相加.
+    服务器启动之前应该清空该目录.
+
+    :param app: The application to read the configuration from.
+    参数 app: 用于读取配置的应用.
+
+    :param buckets: The upper bounds of the latency histogram buckets
+        in seconds.
+    参数 buckets: 延迟直方图各个桶的上限, 以秒为单位.
+
+    .. versionadded:: 1.2
+    """
+
+    #: The default bucket upper bounds, the same as
+    #: :attr:`TimingStats.default_buckets
+    #: <flask.timing.TimingStats.default_buckets>`.
+    #
+    # 默认的桶上限, 与 `TimingStats.default_buckets` 相同.
+    default_buckets = TimingStats.default_buckets
+
+    #: How many seconds pass between writing the metrics of a process to
+    #: its file in multiprocess mode.
+    #
+    # 多进程模式下, 把进程的指标写入其文件的间隔秒数.
+    flush_interval = 1.0
+
+    def __init__(self, app, buckets=None):
+        self.app = app
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+        self._reset()
+
+    def _reset(self):
+        self._lock = Lock()
+        self._local = local()
+        self._shards = []
+        self._retired = _Shard()
+        self._file = None
+        self._flusher = None
+
+    def _get_shard(self):
+        shard = getattr(self._local, "shard", None)
+
+        if shard is None:
+            shard = self._local.shard = _Shard(current_thread())
+
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append(shard)
+
+            if self.app.config["METRICS_MULTIPROCESS_DIR"]:
+                self._start_flusher()
+
+        return shard
+
+    def observe(self, status, seconds):
+        """Count a request to the current endpoint that finished with
+        ``status`` after ``seconds``.
+
+        为当前端点记录一个以 `status` 结束并耗时 `seconds` 的请求.
+        """
+        shard = self._get_shard()
+        endpoint = _request_endpoint()
+        key = (endpoint, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        stat = shard.latency.get(endpoint)
+
+        if stat is None:
+            stat = shard.latency[endpoint] = [0, 0.0, [0] * (len(self.buckets) + 1)]
+
+        stat[0] += 1
+        stat[1] += seconds
+        stat[2][bisect_left(self.buckets, seconds)] += 1
+
+    def observe_exception(self, e, status=None):
+        """Count the exception ``e`` raised by the current endpoint. If
+        ``status`` is given, also count the request with that status
+        without observing its latency.
+
+        为当前端点记录抛出的异常 `e`. 如果给出了 `status`, 同时以该状态码为请求
+        计数, 但不记录延迟.
+        """
+        shard = self._get_shard()
+        endpoint = _request_endpoint()
+        key = (endpoint, type(e).__name__)
+        shard.exceptions[key] = shard.exceptions.get(key, 0) + 1
+
+        if status is not None:
+            key = (endpoint, status)
+            shard.requests[key] = shard.requests.get(key, 0) + 1
+
+    def _retire_dead_shards(self):
+        # the shards of finished threads are merged into one, otherwise
+        # a server starting a thread per request would keep them all
+        #
+        # 已结束线程的分片被合并为一个, 否则每个请求启动一个线程的服务器会
+        # 保留所有分片
+        live = []
+
+        for shard in self._shards:
+            if shard.is_alive():
+                live.append(shard)
+            else:
+                self._retired.merge(shard)
+
+        self._shards = live
+
+    def _merge(self):
+        rv = _Shard()
+
+        with self._lock:
+            self._retire_dead_shards()
+            rv.merge(self._retired)
+            live = list(self._shards)
+
+        for shard in live:
+            rv.merge(shard)
+
+        return rv
+
+    def _samples(self):
+        shard = self._merge()
+        bounds = self.buckets + (float("inf"),)
+        rv = {}
+
+        for (endpoint, status), value in shard.requests.items():
+            labels = (("endpoint", endpoint), ("status", str(status)))
+            rv[("flask_requests_total", labels)] = value
+
+        for endpoint, (count, total, counts) in shard.latency.items():
+            seen = 0
+
+            for bound, value in zip(bounds, counts):
+                seen += value
+                labels = (("endpoint", endpoint), ("le", bound))
+                rv[("flask_request_duration_seconds_bucket", labels)] = seen
+
+            labels = (("endpoint", endpoint),)
+            rv[("flask_request_duration_seconds_sum", labels)] = total
+            rv[("flask_request_duration_seconds_count", labels)] = count
+
+        for (endpoint, name), value in shard.exceptions.items():
+            labels = (("endpoint", endpoint), ("exception", name))
+            rv[("flask_exceptions_total", labels)] = value
+
+        return rv
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is not None:
+                return
+
+            self._flusher = Thread(target=self._flush_loop, name="flask-metrics")
+            self._flusher.daemon = True
+            self._flusher.start()
+
+        register_at_fork = getattr(os, "register_at_fork", None)
+
+        if register_at_fork is not None:
+            ref = weakref.ref(self)
+
+            def reset():
+                registry = ref()
+
+                if registry is not None:
+                    registry._reset()
+
+            register_at_fork(after_in_child=reset)
+
+    def _flush_loop(self):
+        flusher = self._flusher
+
+        while self._flusher is flusher:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write the metrics of this process to its file in multiprocess
+        mode. This is done periodically and when collecting.
+
+        在多进程模式下, 把本进程的指标写入其文件. 这会定期执行, 收集指标时也会执行.
+        """
+        directory = self.app.config["METRICS_MULTIPROCESS_DIR"]
+
+        if not directory:
+            return
+
+        samples = self._samples()
+
+        with self._lock:
+            if self._file is None:
+                path = os.path.join(directory, "flask-metrics-%d.db" % os.getpid())
+                self._file = _MmapFile(path)
+
+            self._file.write(samples)
+
+    def collect(self):
+        """Return a dict mapping ``(name, labels)`` tuples to the value
+        of each sample, where ``labels`` is a tuple of ``(name, value)``
+        tuples. In multiprocess mode this adds up the values of all
+        processes.
+
+        返回一个字典, 将 `(name, labels)` 元组映射到每个样本的值, 其中 `labels` 是
+        由 `(name, value)` 元组组成的元组. 在多进程模式下, 会把所有进程的值相加.
+        """
+        directory = self.app.config["METRICS_MULTIPROCESS_DIR"]
+
+        if not directory:
+            return self._samples()
+
+        self.flush()
+        rv = {}
+
+        for filename in os.listdir(directory):
+            if not (filename.startswith("flask-metrics-") and filename.endswith(".db")):
+                continue
+
+            for key, value in _read_mmap_file(os.path.join(directory, filename)):
+                rv[key] = rv.get(key, 0) + value
+
+        return rv
+
+    def generate_latest(self):
+        """Format the collected metrics in the Prometheus text exposition
+        format.
+
+        以 Prometheus 文本格式输出收集的指标.
+        """
+        samples = self.collect()
+        lines = []
+
+        for family, kind, description in _families:
+            lines.append("# HELP %s %s" % (family, description))
+            lines.append("# TYPE %s %s" % (family, kind))
+            family_samples = [
+                (labels, name, value)
+                for (name, labels), value in samples.items()
+                if name == family or name.startswith(family + "_")
+            ]
+
+            for labels, name, value in sorted(family_samples):
+                lines.append(
+                    "%s{%s} %s"
+                    % (
+                        name,
+                        ",".join(_format_label(*label) for label in labels),
+                        repr(float(value)),
+                    )
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Remove all recorded metrics of this process.
+
+        清除本进程记录的所有指标.
+        """
+        with self._lock:
+            self._retired = _Shard()
+
+            for shard in self._shards:
+                shard.requests.clear()
+                shard.latency.clear()
+                shard.exceptions.clear()
+
+    def register_endpoint(self, rule="/metrics", endpoint="_metrics"):
+        """Add a URL rule that returns :meth:`generate_latest`. The view
+        is not protected, restrict access to it with a
+        :meth:`~flask.Flask.before_request` function or in the server if
+        needed.
+
+        添加一个返回 `generate_latest` 的 URL 规则. 该视图不受保护, 如有需要,
+        可以用 `before_request` 函数或在服务器中限制对它的访问.
+        """
+        self.app.add_url_rule(rule, endpoint, self._view)
+
+    def _view(self):
+        return (
+            self.generate_latest(),
+            {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    def __repr__(self):
+        return "<%s %d shards>" % (self.__class__.__name__, len(self._shards))
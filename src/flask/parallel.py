@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.parallel
+    ~~~~~~~~~~~~~~
+
+    Runs several calls at the same time on the application's worker
+    threads, with the current contexts available to them.
+
+    在应用的工作线程上同时执行多个调用, 并且这些调用可以使用当前的上下文.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import TimeoutError
+from concurrent.futures import wait
+from copy import copy
+from itertools import islice
+from threading import Event
+from threading import local
+
+from .globals import _app_ctx_stack
+from .globals import _request_ctx_stack
+from .timing import timer
+
+_local = local()
+
+
+class _Group(object):
+    """The contexts and cancellation flag shared by the calls of one
+    :func:`map` or :func:`gather`.
+
+    一次 `map` 或 `gather` 的所有调用共享的上下文和取消标志.
+    """
+
+    __slots__ = ("app_ctx", "request_ctx", "cancelled")
+
+    def __init__(self):
+        app_ctx = _app_ctx_stack.top
+
+        if app_ctx is None:
+            raise RuntimeError(
+                "Working outside of application context. Parallel calls"
+                " can only be made when an application context is pushed."
+            )
+
+        # one copy of g is shared by the calls, changes made by them are
+        # not seen by the caller
+        #
+        # 所有调用共享一份 g 的拷贝, 调用对其的修改对调用者不可见
+        self.app_ctx = copy(app_ctx)
+        self.app_ctx.g = copy(app_ctx.g)
+        request_ctx = _request_ctx_stack.top
+
+        # calls that outlive the caller must not see the caller's context
+        # after it is reset for another request by the context pool
+        #
+        # 比调用者存活更久的调用不能看到调用者的上下文被上下文池重置给另一个请求之后的样子
+        if request_ctx is not None:
+            request_ctx = request_ctx.copy()
+            request = request_ctx.request
+
+            # the form and JSON body are read from the input stream the
+            # first time they are accessed, read them now so the calls
+            # don't race on the stream
+            #
+            # 表单和 JSON 请求体在第一次访问时才从输入流中读取, 现在就读取它们,
+            # 以免调用之间在输入流上产生竞争
+            request._load_form_data()
+
+            if request.is_json:
+                request.get_data()
+
+        self.request_ctx = request_ctx
+        self.cancelled = Event()
+
+    def run(self, f, args):
+        # the caller stopped waiting before the call started
+        #
+        # 调用开始之前调用者已经不再等待
+        if self.cancelled.is_set():
+            return None
+
+        # the contexts are bound without pushing them, so no signals are
+        # sent and no teardown functions are called
+        #
+        # 上下文只是被绑定而没有推入, 所以不会发送信号, 也不会调用销毁函数
+        _app_ctx_stack.push(self.app_ctx)
+
+        if self.request_ctx is not None:
+            _request_ctx_stack.push(self.request_ctx)
+
+        _local.group = self
+
+        try:
+            return f(*args)
+        finally:
+            _local.group = None
+
+            if self.request_ctx is not None:
+                _request_ctx_stack.pop()
+
+            _app_ctx_stack.pop()
+
+
+def _run_all(calls, max_workers, timeout):
+    if not calls:
+        return []
+
+    # calls made from a parallel call run in order, waiting for the
+    # shared pool from one of its threads could deadlock
+    #
+    # 在并行调用中发起的调用按顺序执行, 在共享线程池的线程中等待该线程池可能会死锁
+    if getattr(_local, "group", None) is not None:
+        return [f(*args) for f, args in calls]
+
+    group = _Group()
+    pool = group.app_ctx.app.parallel_pool
+    deadline = None if timeout is None else timer() + timeout
+    results = [None] * len(calls)
+    pending = {}
+    remaining_calls = enumerate(calls)
+
+    def submit(n):
+        for index, (f, args) in islice(remaining_calls, n):
+            pending[pool.submit(group.run, f, args)] = index
+
+    try:
+        submit(max_workers or len(calls))
+
+        while pending:
+            wait_for = None
+
+            if deadline is not None:
+                wait_for = deadline - timer()
+
+                if wait_for <= 0:
+                    raise TimeoutError()
+
+            done = wait(pending, wait_for, FIRST_COMPLETED)[0]
+
+            if not done:
+                raise TimeoutError()
+
+            for future in done:
+                results[pending.pop(future)] = future.result()
+
+            submit(len(done))
+    except BaseException:
+        group.cancelled.set()
+
+        for future in pending:
+            future.cancel()
+
+        raise
+
+    return results
+
+
+def map(f, items, max_workers=None, timeout=None):
+    """Call ``f`` with each item of ``items`` on the threads of
+    :attr:`Flask.parallel_pool <flask.Flask.parallel_pool>` and return
+    the list of results in the same order. ::
+
+    在 `Flask.parallel_pool` 的线程上对 `items` 中的每一项调用 `f`, 并以相同的
+    顺序返回结果列表.
+
+        from flask import parallel
+
+        @app.route("/dashboard")
+        def dashboard():
+            orders, messages = parallel.map(fetch, ["orders", "messages"])
+            ...
+
+    The calls see the current application and request context, they
+    share :data:`~flask.request` and :data:`~flask.session` with the
+    caller and must only read them. They get a copy of :data:`~flask.g`
+    made when ``map`` is called. The contexts are bound as they are, no
+    signals are sent and no teardown functions are called for the calls.
+
+    调用可以访问当前的应用上下文和请求上下文, 它们与调用者共享 `flask.request` 和
+    `flask.session`, 并且只能读取它们. 调用 `map` 时会为它们创建一份 `flask.g`
+    的拷贝. 上下文按原样绑定, 不会为这些调用发送信号或调用销毁函数.
+
+    The form, files and JSON body of the request are read before the
+    calls start. Any other body must be read with
+    :meth:`~flask.Request.get_data` before calling ``map``, the calls
+    must not read :attr:`~flask.Request.stream`.
+
+    请求的表单, 文件和 JSON 请求体会在调用开始之前读取. 其他请求体必须在调用
+    `map` 之前通过 `flask.Request.get_data` 读取, 调用不能读取
+    `flask.Request.stream`.
+
+    If a call raises an exception or the timeout expires, the calls that
+    didn't start yet are cancelled and the exception, or a
+    :exc:`~concurrent.futures.TimeoutError`, is raised. Calls that are
+    already running continue in the background, they can check
+    :func:`is_cancelled` to stop early.
+
+    如果某个调用抛出异常或超时, 尚未开始的调用会被取消, 并抛出该异常或
+    `concurrent.futures.TimeoutError`. 已经在运行的调用会在后台继续运行, 它们可以
+    检查 `is_cancelled` 来提前结束.
+
+    Calling ``map`` or :func:`gather` from a call runs the inner calls
+    one after another in the same thread.
+
+    在调用中调用 `map` 或 `gather` 时, 内部调用会在同一线程中依次执行.
+
+    :param f: The function to call with each item.
+    参数 f: 对每一项调用的函数.
+
+    :param items: The items to pass to ``f``.
+    参数 items: 传给 `f` 的项.
+
+    :param max_workers: The most calls to run at the same time. Defaults
+        to one per item, limited by the size of the pool.
+    参数 max_workers: 同时运行的最多调用数量. 默认每项一个, 受线程池大小限制.
+
+    :param timeout: The seconds to wait for all the calls to finish.
+    参数 timeout: 等待所有调用完成的秒数.
+
+    .. versionadded:: 1.2
+    """
+    return _run_all([(f, (item,)) for item in items], max_workers, timeout)
+
+
+def gather(*callables, **kwargs):
+    """Call each of ``callables`` without arguments on the threads of
+    :attr:`Flask.parallel_pool <flask.Flask.parallel_pool>` and return
+    the list of results in the same order. Pass ``max_workers`` and
+    ``timeout`` as keyword arguments, they work like they do for
+    :func:`map`. ::
+
+    在 `Flask.parallel_pool` 的线程上不带参数地调用每个 `callables`, 并以相同的
+    顺序返回结果列表. 以关键字参数传入 `max_workers` 和 `timeout`, 它们的作用与
+    `map` 中相同.
+
+        user, orders = parallel.gather(
+            lambda: users.get(user_id),
+            partial(orders.list, user_id),
+            timeout=2,
+        )
+
+    .. versionadded:: 1.2
+    """
+    max_workers = kwargs.pop("max_workers", None)
+    timeout = kwargs.pop("timeout", None)
+
+    if kwargs:
+        raise TypeError("Unexpected keyword arguments %s." % ", ".join(kwargs))
+
+    return _run_all([(f, ()) for f in callables], max_workers, timeout)
+
+
+def is_cancelled():
+    """Return ``True`` if the current call was made by :func:`map` or
+    :func:`gather` and the caller stopped waiting for it, because
+    another call failed or the timeout expired.
+
+    如果当前调用由 `map` 或 `gather` 发起, 并且调用者因为其他调用失败或超时而不再
+    等待它, 返回 `True`.
+
+    .. versionadded:: 1.2
+    """
+    group = getattr(_local, "group", None)
+    return group is not None and group.cancelled.is_set()
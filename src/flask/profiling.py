@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.profiling
+    ~~~~~~~~~~~~~~~
+
+    A sampling profiler that records the stacks of a fraction of the
+    requests, if :data:`PROFILER_SAMPLE_RATE` is set.
+
+    一个采样分析器, 如果设置了 `PROFILER_SAMPLE_RATE`, 记录一部分请求的调用栈.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import hmac
+import sys
+import time
+from itertools import count
+from threading import current_thread
+from threading import Lock
+from threading import Thread
+
+from werkzeug.exceptions import Forbidden
+from werkzeug.exceptions import NotFound
+
+from .globals import request
+
+
+def _frame_label(frame):
+    return "%s:%s" % (frame.f_globals.get("__name__", "?"), frame.f_code.co_name)
+
+
+class SamplingProfiler(object):
+    """Profiles one in every N requests to an endpoint by sampling the
+    stack of the thread handling it. Available as :attr:`Flask.profiler
+    <flask.Flask.profiler>`.
+
+    对每个端点每 N 个请求分析其中一个, 方法是对处理该请求的线程的调用栈进行采样.
+    可以通过 `Flask.profiler` 访问.
+
+    While a profiled request runs :meth:`Flask.full_dispatch_request
+    <flask.Flask.full_dispatch_request>`, a background thread records
+    its stack every :data:`PROFILER_INTERVAL` seconds. Requests that
+    are not profiled only pay for a counter, and the thread only runs
+    while a profiled request is active. The stacks are aggregated per
+    endpoint in memory and returned in the collapsed format used by
+    flame graph tools by :meth:`collapsed`.
+
+    当被分析的请求运行 `Flask.full_dispatch_request` 时, 一个后台线程每隔
+    `PROFILER_INTERVAL` 秒记录一次它的调用栈. 未被分析的请求只需要增加一个计数器,
+    并且该线程只在有被分析的请求时运行. 调用栈按端点在内存中汇总, 并由 `collapsed`
+    以火焰图工具使用的折叠格式返回.
+
+    Stacks are sampled per thread, requests handled by greenlets that
+    share a thread are not sampled reliably.
+
+    调用栈按线程采样, 由共享同一线程的 greenlet 处理的请求无法可靠地采样.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = Lock()
+        self._counters = {}
+        self._active = {}
+        self._stacks = {}
+        self._thread = None
+
+        #: A dict mapping endpoints to the number of profiled requests.
+        #
+        # 将端点映射到被分析的请求数量的字典.
+        self.profiled = {}
+
+        #: The URL rule of the endpoint registered by
+        #: :meth:`register_endpoint`, used by ``flask profile dump``.
+        #
+        # 由 `register_endpoint` 注册的端点的 URL 规则, 由
+        # `flask profile dump` 使用.
+        self.rule = None
+        self._endpoint = None
+
+    def get_sample_rate(self, endpoint):
+        """Return N for profiling one in N requests to ``endpoint``, or
+        ``0`` to not profile it.
+
+        返回 N, 表示对 `endpoint` 的每 N 个请求分析一个, 返回 `0` 表示不分析.
+        """
+        rates = self.app.config["PROFILER_ENDPOINT_SAMPLE_RATES"]
+        rate = self.app.config["PROFILER_SAMPLE_RATE"]
+
+        if rates:
+            rate = rates.get(endpoint, rate)
+
+        return rate
+
+    def dispatch(self, req):
+        """Call :meth:`Flask.full_dispatch_request
+        <flask.Flask.full_dispatch_request>`, profiling it if it is the
+        N-th request to the matched endpoint.
+
+        调用 `Flask.full_dispatch_request`, 如果它是匹配端点的第 N 个请求, 则对其
+        进行分析.
+        """
+        if req.url_rule is None:
+            return self.app.full_dispatch_request()
+
+        endpoint = req.url_rule.endpoint
+
+        # don't put the stacks of dumping the stacks into the dump
+        #
+        # 不要把导出调用栈时的调用栈放入导出结果中
+        if endpoint == self._endpoint:
+            return self.app.full_dispatch_request()
+
+        rate = self.get_sample_rate(endpoint)
+        counter = self._counters.get(endpoint)
+
+        if counter is None:
+            counter = self._counters.setdefault(endpoint, count())
+
+        if not rate or next(counter) % rate:
+            return self.app.full_dispatch_request()
+
+        ident = current_thread().ident
+
+        with self._lock:
+            self._active[ident] = (endpoint, sys._getframe())
+            self.profiled[endpoint] = self.profiled.get(endpoint, 0) + 1
+
+            if self._thread is None:
+                self._thread = Thread(target=self._sample, name="flask-profiler")
+                self._thread.daemon = True
+                self._thread.start()
+
+        try:
+            return self.app.full_dispatch_request()
+        finally:
+            with self._lock:
+                del self._active[ident]
+
+    def _sample(self):
+        interval = self.app.config["PROFILER_INTERVAL"]
+
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+
+                active = list(self._active.items())
+
+            frames = sys._current_frames()
+            samples = []
+
+            for ident, (endpoint, top) in active:
+                frame = frames.get(ident)
+                stack = []
+
+                while frame is not None and frame is not top:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+
+                # the request finished after the active list was copied, or
+                # the thread is in dispatch outside of full_dispatch_request
+                #
+                # 请求在复制活跃列表之后已经结束, 或者线程位于 dispatch 中
+                # full_dispatch_request 之外的地方
+                if frame is None or not stack:
+                    continue
+
+                stack.append(endpoint)
+                stack.reverse()
+                samples.append((endpoint, ";".join(stack)))
+
+            del frames
+
+            with self._lock:
+                for endpoint, stack in samples:
+                    stacks = self._stacks.setdefault(endpoint, {})
+                    stacks[stack] = stacks.get(stack, 0) + 1
+
+            time.sleep(interval)
+
+    def collapsed(self, endpoint=None):
+        """Return the sampled stacks in the collapsed format, one
+        ``endpoint;frame;frame count`` line per distinct stack, starting
+        from :meth:`Flask.full_dispatch_request
+        <flask.Flask.full_dispatch_request>`.
+
+        以折叠格式返回采样的调用栈, 每个不同的调用栈一行 `endpoint;frame;frame count`,
+        从 `Flask.full_dispatch_request` 开始.
+
+        :param endpoint: Only return the stacks of this endpoint.
+        参数 endpoint: 只返回这个端点的调用栈.
+        """
+        with self._lock:
+            if endpoint is not None:
+                items = list(self._stacks.get(endpoint, {}).items())
+            else:
+                items = [
+                    item for stacks in self._stacks.values() for item in stacks.items()
+                ]
+
+        return "".join("%s %d\n" % item for item in sorted(items))
+
+    def clear(self):
+        """Remove all sampled stacks.
+
+        清除所有采样的调用栈.
+        """
+        with self._lock:
+            self._stacks.clear()
+            self.profiled.clear()
+
+    def register_endpoint(self, rule="/_profile", endpoint="_profile"):
+        """Add a URL rule that returns :meth:`collapsed` as text. Pass
+        ``?endpoint=`` to only return the stacks of one endpoint.
+
+        添加一个以文本形式返回 `collapsed` 的 URL 规则. 传入 `?endpoint=` 可以只返回
+        一个端点的调用栈.
+
+        The view requires an ``Authorization: Bearer <token>`` header
+        matching :data:`PROFILER_TOKEN`, and returns 404 if the token is
+        not configured.
+
+        该视图要求 `Authorization: Bearer <token>` 头与 `PROFILER_TOKEN` 匹配,
+        如果没有配置令牌, 返回 404.
+
+        Requests to this endpoint are never profiled.
+
+        对此端点的请求永远不会被分析.
+        """
+        self.rule = rule
+        self._endpoint = endpoint
+        self.app.add_url_rule(rule, endpoint, self._view)
+
+    def _view(self):
+        token = self.app.config["PROFILER_TOKEN"]
+
+        if not token:
+            raise NotFound()
+
+        given = request.headers.get("Authorization", "")
+
+        if not hmac.compare_digest(
+            given.encode("utf-8"), ("Bearer " + token).encode("utf-8")
+        ):
+            raise Forbidden()
+
+        body = self.collapsed(request.args.get("endpoint"))
+        return body, {"Content-Type": "text/plain; charset=utf-8"}
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.profiled)
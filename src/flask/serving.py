@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.serving
+    ~~~~~~~~~~~~~
+
+    A preforking, multi-threaded WSGI server for running the application
+    without an external server, used by the ``flask serve`` command.
+
+    一个预派生 (preforking) 的多线程 WSGI 服务器, 用于在没有外部服务器的情况下
+    运行应用, 由 `flask serve` 命令使用.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import atexit
+import errno
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from threading import Condition
+from threading import Thread
+
+from werkzeug.serving import get_sockaddr
+from werkzeug.serving import select_address_family
+from werkzeug.serving import ThreadedWSGIServer
+from werkzeug.serving import WSGIRequestHandler
+
+from .timing import timer
+
+_logger = logging.getLogger(__name__)
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    # HTTP/1.1 keeps the connection open between requests, the timeout
+    # closes idle connections
+    #
+    # HTTP/1.1 在请求之间保持连接打开, 超时会关闭空闲的连接
+    protocol_version = "HTTP/1.1"
+
+
+class _WorkerServer(ThreadedWSGIServer):
+    """The server that runs in each worker process. It accepts
+    connections from the socket shared with the other workers and handles
+    each one in a new thread, at most ``threads`` at the same time.
+
+    在每个工作进程中运行的服务器. 它从与其他工作进程共享的套接字接受连接, 并在新
+    线程中处理每个连接, 同一时间最多 `threads` 个.
+    """
+
+    multiprocess = True
+
+    def __init__(self, app, sock, threads, keep_alive):
+        host, port = sock.getsockname()[:2]
+        handler = type(
+            "RequestHandler", (_KeepAliveRequestHandler,), {"timeout": keep_alive}
+        )
+        ThreadedWSGIServer.__init__(self, host, port, app, handler, fd=sock.fileno())
+        self.threads = threads
+        self._active = 0
+        self._idle = Condition()
+
+    def process_request(self, request, client_address):
+        # while all threads are busy, connections wait in the listen
+        # queue, where other workers can accept them
+        #
+        # 当所有线程都在忙时, 连接在监听队列中等待, 其他工作进程可以接受它们
+        with self._idle:
+            while self._active >= self.threads:
+                self._idle.wait()
+
+            self._active += 1
+
+        try:
+            ThreadedWSGIServer.process_request(self, request, client_address)
+        except Exception:
+            self._release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            ThreadedWSGIServer.process_request_thread(self, request, client_address)
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+
+    def wait_idle(self, timeout):
+        """Wait until the connections being handled are closed, at most
+        ``timeout`` seconds. Returns ``True`` if they are.
+
+        等待正在处理的连接关闭, 最多 `timeout` 秒. 如果全部关闭, 返回 `True`.
+        """
+        deadline = timer() + timeout
+
+        with self._idle:
+            while self._active:
+                remaining = deadline - timer()
+
+                if remaining <= 0:
+                    return False
+
+                self._idle.wait(remaining)
+
+        return True
+
+
+class PreforkServer(object):
+    """Serve an application from several worker processes that are
+    forked from this process, each handling requests in several
+    threads::
+
+    在从此进程派生的多个工作进程中运行应用, 每个工作进程在多个线程中处理请求:
+
+        server = PreforkServer(app, "0.0.0.0", 8000, workers=4)
+        server.run()
+
+    The master process binds the socket, calls :meth:`Flask.warmup
+    <flask.Flask.warmup>`, and moves the objects created so far out of
+    the reach of the garbage collector with :func:`gc.freeze`, so the
+    workers share that memory instead of copying it. Then it forks the
+    workers and replaces any that exit.
+
+    主进程绑定套接字, 调用 `Flask.warmup`, 并使用 `gc.freeze` 将目前创建的对象移出
+    垃圾回收器的管理范围, 这样工作进程共享这些内存而不是复制它们. 然后派生工作进程,
+    并替换任何退出的工作进程.
+
+    ``SIGHUP`` reloads the config files with :meth:`Flask.reload_config
+    <flask.Flask.reload_config>`, starts new workers and stops the old
+    ones gracefully. Changes to the code are only loaded by a restart.
+    ``SIGTERM`` and ``SIGINT`` stop the workers gracefully and exit. A
+    worker that stops closes the socket, finishes the connections it is
+    handling and exits, or is killed after ``graceful_timeout`` seconds.
+
+    `SIGHUP` 使用 `Flask.reload_config` 重新加载配置文件, 启动新的工作进程并优雅地
+    停止旧的工作进程. 代码的修改只有重启才会加载. `SIGTERM` 和 `SIGINT` 会优雅地
+    停止工作进程并退出. 停止的工作进程会关闭套接字, 完成正在处理的连接并退出,
+    或者在 `graceful_timeout` 秒后被杀死.
+
+    This requires :func:`os.fork` and is not available on Windows.
+
+    需要 `os.fork`, 在 Windows 上不可用.
+
+    :param app: The application to serve.
+    参数 app: 要运行的应用.
+
+    :param host: The interface to bind to.
+    参数 host: 绑定的网络接口.
+
+    :param port: The port to bind to, ``0`` picks a free port.
+    参数 port: 绑定的端口, `0` 表示选择一个空闲端口.
+
+    :param workers: The number of worker processes.
+    参数 workers: 工作进程的数量.
+
+    :param threads: The number of connections each worker handles at
+        the same time.
+    参数 threads: 每个工作进程同时处理的连接数量.
+
+    :param backlog: The number of connections that can wait to be
+        accepted, further connections are refused by the system.
+    参数 backlog: 可以等待被接受的连接数量, 之后的连接会被系统拒绝.
+
+    :param keep_alive: Seconds an idle connection is kept open for
+        another request.
+    参数 keep_alive: 空闲连接为下一个请求保持打开的秒数.
+
+    :param graceful_timeout: Seconds a stopping worker can take to
+        finish its connections.
+    参数 graceful_timeout: 正在停止的工作进程完成其连接的最长秒数.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(
+        self,
+        app,
+        host="127.0.0.1",
+        port=5000,
+        workers=2,
+        threads=8,
+        backlog=128,
+        keep_alive=5,
+        graceful_timeout=30,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.backlog = backlog
+        self.keep_alive = keep_alive
+        self.graceful_timeout = graceful_timeout
+        self.socket = None
+        self._workers = set()
+        self._retiring = {}
+        self._stopping = False
+        self._reloading = False
+
+    def bind(self):
+        """Create the listening socket. Called by :meth:`run` if it
+        wasn't called before. Afterwards :attr:`port` is the bound port.
+
+        创建监听套接字. 如果之前没有调用, 会由 `run` 调用. 之后 `port` 为绑定的端口.
+        """
+        family = select_address_family(self.host, self.port)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(get_sockaddr(self.host, int(self.port), family))
+        sock.listen(self.backlog)
+        self.socket = sock
+        self.port = sock.getsockname()[1]
+
+    def run(self, warmup=True):
+        """Start the workers and supervise them until ``SIGTERM`` or
+        ``SIGINT`` is received.
+
+        启动工作进程并监管它们, 直到收到 `SIGTERM` 或 `SIGINT`.
+
+        :param warmup: Call :meth:`Flask.warmup <flask.Flask.warmup>`
+            before forking the workers.
+        参数 warmup: 在派生工作进程之前调用 `Flask.warmup`.
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("The prefork server requires 'os.fork'.")
+
+        if self.socket is None:
+            self.bind()
+
+        if warmup:
+            self.app.warmup()
+
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        try:
+            self._spawn_workers()
+
+            while not self._stopping:
+                if self._reloading:
+                    self._reloading = False
+                    self._reload()
+
+                self._reap()
+                time.sleep(0.1)
+        finally:
+            self._stop()
+
+    def _handle_reload(self, signum, frame):
+        self._reloading = True
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _spawn_workers(self):
+        # objects that survived until now are shared with the workers,
+        # the garbage collector would touch them and copy the memory
+        #
+        # 存活到现在的对象与工作进程共享, 垃圾回收器会访问它们从而导致内存被复制
+        if hasattr(gc, "freeze"):
+            gc.collect()
+            gc.freeze()
+
+        while len(self._workers) < self.workers:
+            self._spawn()
+
+    def _spawn(self):
+        pid = os.fork()
+
+        if pid:
+            self._workers.add(pid)
+            return
+
+        status = 0
+
+        try:
+            self._serve()
+        except BaseException:
+            _logger.exception("Exception in worker %d", os.getpid())
+            status = 1
+        finally:
+            # don't return into the master's code, but flush the logs and
+            # queues like a normal exit would
+            #
+            # 不要返回到主进程的代码中, 但像正常退出一样刷新日志和队列
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def _serve(self):
+        server = _WorkerServer(self.app, self.socket, self.threads, self.keep_alive)
+
+        def stop(signum, frame):
+            # shutdown waits for serve_forever, which runs in this thread
+            #
+            # shutdown 会等待 serve_forever, 而后者在此线程中运行
+            Thread(target=server.shutdown).start()
+
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.socket.close()
+        server.serve_forever()
+        server.wait_idle(self.graceful_timeout)
+
+    def _reload(self):
+        if self.app.config.files:
+            try:
+                self.app.reload_config()
+            except Exception:
+                _logger.exception("Failed to reload the configuration.")
+
+        old = self._workers
+        self._workers = set()
+        self._spawn_workers()
+
+        for pid in old:
+            self._retire(pid)
+
+    def _retire(self, pid):
+        self._retiring[pid] = timer() + self.graceful_timeout
+        self._kill(pid, signal.SIGTERM)
+
+    def _kill(self, pid, signum):
+        try:
+            os.kill(pid, signum)
+        except OSError as e:
+            if e.errno != errno.ESRCH:
+                raise
+
+    def _reap(self):
+        while True:
+            try:
+                pid = os.waitpid(-1, os.WNOHANG)[0]
+            except OSError as e:
+                if e.errno != errno.ECHILD:
+                    raise
+
+                pid = 0
+
+            if not pid:
+                break
+
+            self._retiring.pop(pid, None)
+
+            if pid in self._workers:
+                self._workers.discard(pid)
+
+                if not self._stopping:
+                    _logger.warning("Worker %d exited, starting a new one.", pid)
+                    self._spawn()
+
+        now = timer()
+
+        for pid, deadline in list(self._retiring.items()):
+            if now > deadline:
+                self._kill(pid, signal.SIGKILL)
+
+    def _stop(self):
+        self._stopping = True
+
+        for pid in self._workers:
+            self._retire(pid)
+
+        self._workers = set()
+
+        while self._retiring:
+            self._reap()
+            time.sleep(0.05)
+
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
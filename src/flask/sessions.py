@@ -12,6 +12,7 @@
     :license: BSD-3-Clause
 """
 import hashlib
+import sys
 import warnings
 from datetime import datetime
 
@@ -22,7 +23,14 @@ from werkzeug.datastructures import CallbackDict
 from ._compat import collections_abc
 from .helpers import is_ip
 from .helpers import total_seconds
-from .json.tag import TaggedJSONSerializer
+
+
+def _cache_cookie_domain(app, value):
+    # the detected domain is cached even if the config is frozen, and
+    # detected again after the config is reloaded
+    #
+    # 即使配置已冻结, 也会缓存检测到的域名, 并在重新加载配置之后再次检测
+    app.config._set_derived("SESSION_COOKIE_DOMAIN", value)
 
 
 class SessionMixin(collections_abc.MutableMapping):
@@ -258,7 +266,7 @@ class SessionInterface(object):
         # server name not set, cache False to return none next time
         # SERVER_NAME 未设置, 缓存 False, 下次直接返回 None
         if not rv:
-            app.config["SESSION_COOKIE_DOMAIN"] = False
+            _cache_cookie_domain(app, False)
             return None
 
         # chop off the port which is usually not supported by browsers
@@ -279,7 +287,7 @@ class SessionInterface(object):
                 " Add an entry to your hosts file, for example"
                 ' "{rv}.localdomain", and use that instead.'.format(rv=rv)
             )
-            app.config["SESSION_COOKIE_DOMAIN"] = False
+            _cache_cookie_domain(app, False)
             return None
 
         ip = is_ip(rv)
@@ -299,7 +307,7 @@ class SessionInterface(object):
         if self.get_cookie_path(app) == "/" and not ip:
             rv = "." + rv
 
-        app.config["SESSION_COOKIE_DOMAIN"] = rv
+        _cache_cookie_domain(app, rv)
         return rv
 
     def get_cookie_path(self, app):
@@ -398,7 +406,39 @@ class SessionInterface(object):
         raise NotImplementedError()
 
 
-session_json_serializer = TaggedJSONSerializer()
+_session_json_serializer = None
+
+
+def _get_session_json_serializer():
+    global _session_json_serializer
+
+    if _session_json_serializer is None:
+        from .json.tag import TaggedJSONSerializer
+
+        _session_json_serializer = TaggedJSONSerializer()
+
+    return _session_json_serializer
+
+
+class _LazySerializer(object):
+    # the tagged JSON serializer is imported and created when a session
+    # is first used instead of when Flask is imported
+    #
+    # 带标签的 JSON 序列化器在第一次使用会话时才导入和创建, 而不是在导入 Flask 时
+
+    def __get__(self, obj, cls):
+        return _get_session_json_serializer()
+
+
+if sys.version_info < (3, 7):
+    session_json_serializer = _get_session_json_serializer()
+else:
+
+    def __getattr__(name):
+        if name == "session_json_serializer":
+            return _get_session_json_serializer()
+
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 class SecureCookieSessionInterface(SessionInterface):
@@ -427,7 +467,7 @@ class SecureCookieSessionInterface(SessionInterface):
     #
     # 用于有效负载的 python 序列化器. 默认是一个简单的由 JSON 派生的序列化器, 并
     # 支持一些额外的 Python 类型, 例如 datetime 和元组.
-    serializer = session_json_serializer
+    serializer = _LazySerializer()
     session_class = SecureCookieSession
 
     def get_signing_serializer(self, app):
@@ -11,12 +11,16 @@
     :copyright: 2010 Pallets
     :license: BSD-3-Clause
 """
+from threading import Lock
+
 try:
+    from blinker import ANY
     from blinker import Namespace
 
     signals_available = True
 except ImportError:
     signals_available = False
+    ANY = None
 
     class Namespace(object):
         def signal(self, name, doc=None):
@@ -36,6 +40,12 @@ except ImportError:
             self.name = name
             self.__doc__ = doc
 
+        #: Always empty, checking it before sending a signal lets the
+        #: caller skip building the arguments.
+        #
+        # 始终为空, 发送信号前检查此属性可以让调用者跳过构造参数.
+        receivers = {}
+
         def send(self, *args, **kwargs):
             pass
 
@@ -61,8 +71,14 @@ _signals = Namespace()
 # Core signals.  For usage examples grep the source code or consult
 # the API documentation in docs/api.rst as well as docs/signals.rst
 #
+# Flask only calls ``send`` when ``signal.receivers`` is not empty, so a
+# signal nobody connected to costs a single attribute check.
+#
 # 核心信号. 了解用法请在源码中进行查找或者查看 API 文档,
 # 如 `docs/api.rst` 和 `docs/signals.rst`
+#
+# 只有 `signal.receivers` 不为空时 Flask 才调用 `send`, 所以没有连接任何接收者的信号
+# 只有一次属性检查的开销.
 template_rendered = _signals.signal("template-rendered")
 before_render_template = _signals.signal("before-render-template")
 request_started = _signals.signal("request-started")
@@ -73,3 +89,87 @@ appcontext_tearing_down = _signals.signal("appcontext-tearing-down")
 appcontext_pushed = _signals.signal("appcontext-pushed")
 appcontext_popped = _signals.signal("appcontext-popped")
 message_flashed = _signals.signal("message-flashed")
+
+
+_deferred_pool = None
+_deferred_pool_lock = Lock()
+
+
+def get_deferred_pool():
+    """Return the :class:`~flask.workers.WorkerPool` used by
+    :func:`connect_deferred` if no pool is passed. It is created on first
+    use with one thread and room for 1000 queued calls, further calls are
+    dropped. Its ``queue_depth`` and ``dropped`` attributes can be
+    reported as metrics.
+
+    返回 `connect_deferred` 在没有传入线程池时使用的 `flask.workers.WorkerPool`.
+    首次使用时创建, 拥有一个线程, 最多可以排队 1000 个调用, 之后的调用将被丢弃.
+    其 `queue_depth` 和 `dropped` 属性可以作为指标上报.
+
+    .. versionadded:: 1.2
+    """
+    global _deferred_pool
+
+    if _deferred_pool is None:
+        with _deferred_pool_lock:
+            if _deferred_pool is None:
+                from .workers import WorkerPool
+
+                _deferred_pool = WorkerPool(1, max_queue=1000, overflow="drop")
+
+    return _deferred_pool
+
+
+def connect_deferred(signal, receiver, sender=ANY, pool=None):
+    """Connect ``receiver`` to ``signal`` so that it is called on a worker
+    thread instead of in the thread that sends the signal. The request
+    that sent the signal does not wait for the receiver, so its latency
+    is not added to the response. ::
+
+    将 `receiver` 连接到 `signal`, 使其在工作线程中调用, 而不是在发送信号的线程中调用.
+    发送信号的请求不会等待接收者, 所以接收者的耗时不会计入响应时间.
+
+        def audit(sender, response, **extra):
+            audit_log.write(response.status_code)
+
+        connect_deferred(request_finished, audit, app)
+
+    The receiver runs without an application or request context, so it
+    must only use the arguments passed with the signal and not proxies
+    such as :data:`~flask.request`. The arguments may be used by the
+    request at the same time, don't modify them.
+
+    接收者在没有应用上下文和请求上下文的情况下运行, 所以只能使用随信号传入的参数,
+    不能使用 `flask.request` 这样的代理对象. 这些参数可能同时被请求使用, 不要修改它们.
+
+    :param signal: The signal to connect to.
+    参数 signal: 要连接的信号.
+
+    :param receiver: Called with the sender and the keyword arguments of
+        the signal.
+    参数 receiver: 调用时传入发送者和信号的关键字参数.
+
+    :param sender: Only receive the signal for this sender.
+    参数 sender: 只接收此发送者发出的信号.
+
+    :param pool: The :class:`~flask.workers.WorkerPool` that runs the
+        receiver. Defaults to :func:`get_deferred_pool`. Its size and
+        overflow policy control the backpressure.
+    参数 pool: 运行接收者的 `flask.workers.WorkerPool`. 默认为 `get_deferred_pool`
+        的返回值. 其大小和溢出策略决定了背压的处理方式.
+
+    :return: The function that was connected to the signal, pass it to
+        ``signal.disconnect`` to disconnect the receiver.
+    返回: 连接到信号的函数, 将其传给 `signal.disconnect` 以断开接收者.
+
+    .. versionadded:: 1.2
+    """
+    if pool is None:
+        pool = get_deferred_pool()
+
+    def deferred(sender, **kwargs):
+        pool.submit(receiver, sender, **kwargs)
+
+    deferred.receiver = receiver
+    signal.connect(deferred, sender, weak=False)
+    return deferred
@@ -18,6 +18,7 @@ from .globals import _app_ctx_stack
 from .globals import _request_ctx_stack
 from .signals import before_render_template
 from .signals import template_rendered
+from .timing import timer
 
 
 def _default_template_ctx_processor():
@@ -64,7 +65,14 @@ class DispatchingJinjaLoader(BaseLoader):
         self.app = app
 
     def get_source(self, environment, template):
-        if self.app.config["EXPLAIN_TEMPLATE_LOADING"]:
+        config = self.app.config
+        frozen = config.frozen
+
+        if (
+            frozen.EXPLAIN_TEMPLATE_LOADING
+            if frozen is not None
+            else config["EXPLAIN_TEMPLATE_LOADING"]
+        ):
             return self._get_source_explained(environment, template)
         return self._get_source_fast(environment, template)
 
@@ -128,9 +136,21 @@ def _render(template, context, app):
     渲染模板并发送信号.
     """
 
-    before_render_template.send(app, template=template, context=context)
-    rv = template.render(context)
-    template_rendered.send(app, template=template, context=context)
+    if before_render_template.receivers:
+        before_render_template.send(app, template=template, context=context)
+
+    reqctx = _request_ctx_stack.top
+    timing = reqctx.timing if reqctx is not None else None
+
+    if timing is None:
+        rv = template.render(context)
+    else:
+        start = timer()
+        rv = template.render(context)
+        timing.add("render", start)
+
+    if template_rendered.receivers:
+        template_rendered.send(app, template=template, context=context)
     return rv
 
 
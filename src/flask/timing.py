@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.timing
+    ~~~~~~~~~~~~
+
+    Records how long the phases of handling a request take, if
+    :data:`REQUEST_TIMING` is enabled.
+
+    如果启用了 `REQUEST_TIMING`, 记录处理请求的各个阶段所花费的时间.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import re
+from bisect import bisect_left
+from threading import Lock
+
+from .globals import _request_ctx_stack
+
+# characters that are not allowed in a Server-Timing metric name, which
+# is an HTTP token
+#
+# Server-Timing 指标名 (HTTP token) 中不允许的字符
+_non_token_re = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+try:
+    from time import perf_counter as timer
+except ImportError:  # Python 2
+    from time import time as timer
+
+
+class RequestTiming(object):
+    """The phases of a single request and how long they took, in the
+    order they finished. Phases can be nested, for example a template
+    rendered by the view is part of the ``view`` phase as well.
+
+    单个请求的各个阶段及其耗时, 按结束的顺序排列. 阶段可以嵌套, 例如视图中渲染的模板
+    同时也是 `view` 阶段的一部分.
+
+    The phases recorded by Flask are ``context`` (creating and pushing
+    the request context), ``session`` (opening the session), ``match``
+    (URL matching), ``before.<name>`` for each
+    :meth:`~flask.Flask.before_request` function, ``view``, ``render``
+    for each rendered template, ``json`` for each :func:`~flask.jsonify`
+    call, ``after.<name>`` for each :meth:`~flask.Flask.after_request`
+    function, ``save_session`` and ``teardown``.
+
+    Flask 记录的阶段有 `context` (创建并推入请求上下文), `session` (打开会话),
+    `match` (URL 匹配), 每个 `before_request` 函数的 `before.<name>`, `view`,
+    每次渲染模板的 `render`, 每次调用 `jsonify` 的 `json`, 每个 `after_request`
+    函数的 `after.<name>`, `save_session` 以及 `teardown`.
+
+    .. versionadded:: 1.2
+    """
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        #: When the request context was created, as returned by
+        #: :func:`timer`.
+        #
+        # 请求上下文创建的时间, 由 `timer` 返回.
+        self.started = timer()
+
+        #: A list of ``(name, seconds)`` tuples.
+        #
+        # 由 `(name, seconds)` 元组组成的列表.
+        self.phases = []
+
+    def add(self, name, start):
+        """Record the phase ``name`` that started at ``start``, a value
+        returned by :func:`timer`, and ends now.
+
+        记录从 `start` (由 `timer` 返回的值) 开始到现在结束的阶段 `name`.
+        """
+        self.phases.append((name, timer() - start))
+
+    def to_header(self):
+        """Format the phases as the value of a ``Server-Timing`` header,
+        with durations in milliseconds. Characters that are not allowed
+        in a metric name, like the ``<`` and ``>`` of ``before.<lambda>``,
+        are replaced with ``_``.
+
+        将各阶段格式化为 `Server-Timing` 头的值, 耗时以毫秒为单位. 指标名中不允许的
+        字符, 例如 `before.<lambda>` 中的 `<` 和 `>`, 会被替换为 `_`.
+        """
+        return ", ".join(
+            "%s;dur=%.3f" % (_non_token_re.sub("_", name), seconds * 1000)
+            for name, seconds in self.phases
+        )
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.phases)
+
+
+def get_request_timing():
+    """Return the :class:`RequestTiming` of the current request, or
+    ``None`` if :data:`REQUEST_TIMING` is disabled or there is no request
+    context.
+
+    返回当前请求的 `RequestTiming`, 如果禁用了 `REQUEST_TIMING` 或没有请求上下文,
+    返回 `None`.
+
+    .. versionadded:: 1.2
+    """
+    ctx = _request_ctx_stack.top
+    return ctx.timing if ctx is not None else None
+
+
+class TimingStats(object):
+    """Aggregates the phases of finished requests into a histogram per
+    phase name. Available as :attr:`Flask.timing_stats
+    <flask.Flask.timing_stats>`.
+
+    将已完成请求的各阶段按阶段名汇总为直方图. 可以通过 `Flask.timing_stats` 访问.
+
+    :param buckets: The upper bounds of the histogram buckets in
+        seconds. A last bucket for everything slower is always added.
+    参数 buckets: 直方图各个桶的上限, 以秒为单位. 总是会添加最后一个桶用于统计更慢的值.
+
+    .. versionadded:: 1.2
+    """
+
+    #: The default bucket upper bounds, from half a millisecond to ten
+    #: seconds.
+    #
+    # 默认的桶上限, 从半毫秒到十秒.
+    default_buckets = (
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+        self._lock = Lock()
+        self._stats = {}
+
+    def add(self, timing):
+        """Add the phases of a :class:`RequestTiming`.
+
+        添加一个 `RequestTiming` 的各个阶段.
+        """
+        buckets = self.buckets
+
+        with self._lock:
+            for name, seconds in timing.phases:
+                stat = self._stats.get(name)
+
+                if stat is None:
+                    stat = self._stats[name] = [0, 0.0, [0] * (len(buckets) + 1)]
+
+                stat[0] += 1
+                stat[1] += seconds
+                stat[2][bisect_left(buckets, seconds)] += 1
+
+    def snapshot(self):
+        """Return a dict mapping phase names to a dict with the
+        ``count``, the ``sum`` of the durations in seconds, and the
+        ``buckets``, a list of ``(upper_bound, count)`` tuples with the
+        cumulative count of durations less than or equal to the bound.
+        The last bound is ``float("inf")``.
+
+        返回一个字典, 将阶段名映射到一个字典, 其中包含 `count`, 耗时之和 `sum` (秒),
+        以及 `buckets`, 一个由 `(upper_bound, count)` 元组组成的列表, count 为
+        小于等于上限的耗时的累计数量. 最后一个上限为 `float("inf")`.
+        """
+        bounds = self.buckets + (float("inf"),)
+        rv = {}
+
+        with self._lock:
+            for name, (count, total, counts) in self._stats.items():
+                cumulative = []
+                seen = 0
+
+                for bound, n in zip(bounds, counts):
+                    seen += n
+                    cumulative.append((bound, seen))
+
+                rv[name] = {"count": count, "sum": total, "buckets": cumulative}
+
+        return rv
+
+    def clear(self):
+        """Remove all recorded data.
+
+        清除所有记录的数据.
+        """
+        with self._lock:
+            self._stats.clear()
@@ -85,6 +85,19 @@ class View(object):
     #: .. versionadded:: 0.8
     decorators = ()
 
+    #: Create a new instance of this class for every request. If this is
+    #: ``False``, :meth:`as_view` creates a single instance that handles
+    #: all requests, which saves creating it each time. Only disable
+    #: this if the view doesn't store anything on ``self`` during a
+    #: request, since the instance is shared between threads.
+    #:
+    #: .. versionadded:: 1.2
+    #
+    # 为每个请求创建这个类的一个新实例. 如果为 `False`, `as_view` 只创建一个
+    # 实例来处理所有请求, 省去每次创建实例的开销. 只有当视图在请求期间不在
+    # `self` 上存储任何东西时才禁用它, 因为实例会在线程之间共享.
+    init_every_request = True
+
     def dispatch_request(self):
         """Subclasses have to override this method to implement the
         actual view function code.  This method is called with all
@@ -109,11 +122,21 @@ class View(object):
 
         传递给 `as_view` 方法的参数将转发给类的构造函数.
 
+        .. versionchanged:: 1.2
+            If :attr:`init_every_request` is ``False``, the class is
+            instantiated once here instead of on each request.
         """
+        if cls.init_every_request:
+
+            def view(*args, **kwargs):
+                self = view.view_class(*class_args, **class_kwargs)
+                return self.dispatch_request(*args, **kwargs)
 
-        def view(*args, **kwargs):
-            self = view.view_class(*class_args, **class_kwargs)
-            return self.dispatch_request(*args, **kwargs)
+        else:
+            self = cls(*class_args, **class_kwargs)
+
+            def view(*args, **kwargs):
+                return self.dispatch_request(*args, **kwargs)
 
         if cls.decorators:
             view.__name__ = name
@@ -170,6 +193,16 @@ class MethodViewType(type):
             if methods:
                 cls.methods = methods
 
+        # map request methods to the names of the methods that handle
+        # them, the handlers are still looked up on the instance so
+        # descriptors and handlers added later work
+        #
+        # 将请求方法映射到处理它们的方法名, 处理函数仍然在实例上查找, 因此描述符和
+        # 之后添加的处理函数也可以正常工作
+        keys = set(http_method_funcs)
+        keys.update(method.lower() for method in cls.methods or ())
+        cls._method_names = dict((key.upper(), key) for key in keys)
+
 
 class MethodView(with_metaclass(MethodViewType, View)):
     """A class-based view that dispatches request methods to the corresponding
@@ -188,17 +221,22 @@ class MethodView(with_metaclass(MethodViewType, View)):
                 return 'OK'
 
         app.add_url_rule('/counter', view_func=CounterAPI.as_view('counter'))
+
+    .. versionchanged:: 1.2
+        The name of the method that handles each request method is
+        found once when the class is created, not on each request.
     """
 
     def dispatch_request(self, *args, **kwargs):
-        meth = getattr(self, request.method.lower(), None)
+        method = request.method
+        meth = getattr(self, self._method_names.get(method) or method.lower(), None)
 
         # If the request method is HEAD and we don't have a handler for it
         # retry with GET.
         #
-        # 如果请求方法是 HEAD, 无需进行处理, 会使用 GET 重试.
-        if meth is None and request.method == "HEAD":
+        # 如果请求方法是 HEAD 并且没有处理它的函数, 使用 GET 重试.
+        if meth is None and method == "HEAD":
             meth = getattr(self, "get", None)
 
-        assert meth is not None, "Unimplemented method %r" % request.method
+        assert meth is not None, "Unimplemented method %r" % method
         return meth(*args, **kwargs)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+    flask.workers
+    ~~~~~~~~~~~~~
+
+    A bounded pool of worker threads used to run work outside of the
+    thread handling a request.
+
+    一个有界的工作线程池, 用于在处理请求的线程之外执行任务.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import atexit
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from threading import Lock
+from threading import Semaphore
+
+_logger = logging.getLogger(__name__)
+
+
+class WorkerPool(object):
+    """Runs callables on a fixed number of threads. At most
+    ``max_queue`` callables can be waiting or running at the same time,
+    what happens to further ones depends on ``overflow``.
+
+    在固定数量的线程上执行可调用对象. 同一时间最多有 `max_queue` 个可调用对象在
+    等待或运行, 之后提交的对象如何处理取决于 `overflow`.
+
+    Exceptions raised by a callable are logged to the ``flask.workers``
+    logger and set on the returned future.
+
+    可调用对象抛出的异常会记录到 `flask.workers` logger, 并设置到返回的 future 上.
+
+    On Python 2 this requires the ``futures`` backport.
+
+    在 Python 2 中需要安装 `futures` 向后移植包.
+
+    :param max_workers: The number of threads. Defaults to the default
+        of :class:`~concurrent.futures.ThreadPoolExecutor`.
+    参数 max_workers: 线程数量. 默认使用 `concurrent.futures.ThreadPoolExecutor`
+        的默认值.
+
+    :param max_queue: The number of callables that can be waiting or
+        running. ``0`` means unbounded.
+    参数 max_queue: 可以等待或运行的可调用对象数量. `0` 表示没有限制.
+
+    :param overflow: ``"block"`` waits until there is room in the
+        queue, ``"drop"`` discards the callable and counts it in
+        :attr:`dropped`.
+    参数 overflow: `"block"` 等待直到队列有空位, `"drop"` 丢弃可调用对象并计入
+        `dropped`.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, max_workers=None, max_queue=0, overflow="block"):
+        if overflow not in ("block", "drop"):
+            raise ValueError("overflow must be 'block' or 'drop'.")
+
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._slots = Semaphore(max_queue) if max_queue else None
+        self._lock = Lock()
+
+        #: The number of callables that are waiting or running.
+        #
+        # 正在等待或运行的可调用对象数量.
+        self.queue_depth = 0
+
+        #: The number of callables that finished, including failed ones.
+        #
+        # 已完成的可调用对象数量, 包括失败的.
+        self.completed = 0
+
+        #: The number of callables that raised an exception.
+        #
+        # 抛出异常的可调用对象数量.
+        self.failed = 0
+
+        #: The number of callables discarded because the queue was full.
+        #
+        # 因队列已满而被丢弃的可调用对象数量.
+        self.dropped = 0
+
+    def submit(self, func, *args, **kwargs):
+        """Schedule ``func(*args, **kwargs)`` to run on a worker thread.
+        Returns a :class:`~concurrent.futures.Future`, or ``None`` if the
+        queue is full and the overflow policy is ``"drop"``.
+
+        安排 `func(*args, **kwargs)` 在工作线程上运行. 返回一个
+        `concurrent.futures.Future` 对象, 如果队列已满且溢出策略为 `"drop"`,
+        返回 `None`.
+        """
+        if self._slots is not None and not self._slots.acquire(
+            self.overflow == "block"
+        ):
+            with self._lock:
+                self.dropped += 1
+            return None
+
+        with self._lock:
+            self.queue_depth += 1
+
+        try:
+            future = self._executor.submit(self._run, func, args, kwargs)
+        except Exception:
+            self._release()
+            raise
+
+        # also called if the future is cancelled before it runs
+        #
+        # 如果 future 在运行前被取消, 也会调用
+        future.add_done_callback(self._done)
+        return future
+
+    def _run(self, func, args, kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            _logger.exception("Exception in worker task %r", func)
+            raise
+
+    def _done(self, future):
+        if not future.cancelled():
+            with self._lock:
+                self.completed += 1
+                if future.exception() is not None:
+                    self.failed += 1
+        self._release()
+
+    def _release(self):
+        with self._lock:
+            self.queue_depth -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def shutdown(self, wait=True):
+        """Stop accepting callables. If ``wait`` is true, wait for the
+        queued callables to finish.
+
+        停止接受可调用对象. 如果 `wait` 为真, 等待队列中的可调用对象执行完毕.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def __repr__(self):
+        return "<%s queue_depth=%d dropped=%d>" % (
+            self.__class__.__name__,
+            self.queue_depth,
+            self.dropped,
+        )
+
+
+class BackgroundExecutor(object):
+    """Runs functions in the background inside an application context,
+    so that work such as sending email doesn't delay the response.
+    Available as :attr:`Flask.background <flask.Flask.background>`. ::
+
+    在后台的应用上下文中执行函数, 这样像发送邮件这样的工作不会延迟响应. 可以通过
+    `Flask.background` 访问.
+
+        @app.route("/register", methods=["POST"])
+        def register():
+            user = create_user(request.form)
+            app.background.submit(send_welcome_email, user.id)
+            return redirect(url_for("index"))
+
+    The functions run on a :class:`WorkerPool` that is created on first
+    use from :data:`BACKGROUND_WORKERS`, :data:`BACKGROUND_QUEUE_SIZE`
+    and :data:`BACKGROUND_OVERFLOW`. Each function runs in a new
+    application context, there is no request context, so pass the data
+    it needs from the request as arguments.
+
+    函数在首次使用时根据 `BACKGROUND_WORKERS`, `BACKGROUND_QUEUE_SIZE` 和
+    `BACKGROUND_OVERFLOW` 创建的 `WorkerPool` 上运行. 每个函数在新的应用上下文中
+    运行, 没有请求上下文, 所以需要将它用到的请求数据作为参数传入.
+
+    The queued functions are run before the interpreter exits, see
+    :meth:`shutdown`.
+
+    解释器退出前会执行队列中的函数, 参见 `shutdown`.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._pool = None
+        self._lock = Lock()
+        self._pending = set()
+
+    @property
+    def pool(self):
+        """The :class:`WorkerPool` that runs the functions.
+
+        执行函数的 `WorkerPool`.
+        """
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    config = self.app.config
+                    self._pool = WorkerPool(
+                        config["BACKGROUND_WORKERS"],
+                        max_queue=config["BACKGROUND_QUEUE_SIZE"],
+                        overflow=config["BACKGROUND_OVERFLOW"],
+                    )
+                    atexit.register(self.shutdown)
+
+        return self._pool
+
+    def submit(self, f, *args, **kwargs):
+        """Schedule ``f(*args, **kwargs)`` to run in the background.
+        Returns a :class:`~concurrent.futures.Future`, or ``None`` if the
+        queue is full and :data:`BACKGROUND_OVERFLOW` is ``"drop"``.
+
+        安排 `f(*args, **kwargs)` 在后台运行. 返回一个
+        `concurrent.futures.Future` 对象, 如果队列已满且 `BACKGROUND_OVERFLOW`
+        为 `"drop"`, 返回 `None`.
+        """
+        future = self.pool.submit(self._run, f, args, kwargs)
+
+        if future is not None:
+            with self._lock:
+                self._pending.add(future)
+
+            future.add_done_callback(self._done)
+
+        return future
+
+    def _run(self, f, args, kwargs):
+        with self.app.app_context():
+            return f(*args, **kwargs)
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def stats(self):
+        """Return a dict with the ``queue_depth``, ``completed``,
+        ``failed`` and ``dropped`` counts of the pool, to report them as
+        metrics.
+
+        返回一个包含线程池的 `queue_depth`, `completed`, `failed` 和 `dropped`
+        计数的字典, 用于作为指标上报.
+        """
+        pool = self._pool
+        keys = ("queue_depth", "completed", "failed", "dropped")
+        return {key: getattr(pool, key, 0) for key in keys}
+
+    def shutdown(self, timeout=None):
+        """Stop accepting functions and wait for the queued ones to
+        finish. Functions that didn't start within ``timeout`` seconds
+        are cancelled. Returns ``True`` if all the functions finished.
+
+        停止接受函数并等待队列中的函数执行完毕. 在 `timeout` 秒内没有开始的函数会被
+        取消. 如果所有函数都执行完毕, 返回 `True`.
+        """
+        pool = self._pool
+
+        if pool is None:
+            return True
+
+        pool.shutdown(wait=False)
+
+        with self._lock:
+            pending = list(self._pending)
+
+        not_done = wait(pending, timeout)[1]
+
+        for future in not_done:
+            future.cancel()
+
+        return not not_done
@@ -89,7 +89,12 @@ class Request(RequestBase, JSONMixin):
         `MAX_CONTENT_LENGTH` 配置项的只读视图.
         """
         if current_app:
-            return current_app.config["MAX_CONTENT_LENGTH"]
+            config = current_app.config
+
+            if config.frozen is not None:
+                return config.frozen.MAX_CONTENT_LENGTH
+
+            return config["MAX_CONTENT_LENGTH"]
 
     @property
     def endpoint(self):
@@ -174,7 +179,12 @@ class Response(ResponseBase, JSONMixin):
         参见 Werkzeug 文档的 `werkzeug.wrappers.BaseResponse.max_cookie_size` 属性.
         """
         if current_app:
-            return current_app.config["MAX_COOKIE_SIZE"]
+            config = current_app.config
+
+            if config.frozen is not None:
+                return config.frozen.MAX_COOKIE_SIZE
+
+            return config["MAX_COOKIE_SIZE"]
 
         # return Werkzeug's default when not in an app context
         # 不在应用上下文中时返回 Werkzeug 默认值.
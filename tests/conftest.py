@@ -30,6 +30,7 @@ def _standard_os_environ():
         (os.environ, "FLASK_ENV", monkeypatch.notset),
         (os.environ, "FLASK_DEBUG", monkeypatch.notset),
         (os.environ, "FLASK_RUN_FROM_CLI", monkeypatch.notset),
+        (os.environ, "FLASK_COMMANDS_CACHE", ""),
         (os.environ, "WERKZEUG_RUN_MAIN", monkeypatch.notset),
     )
 
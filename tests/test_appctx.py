@@ -218,3 +218,64 @@ def test_clean_pop(app):
 
     assert called == ["flask_test", "TEARDOWN"]
     assert not flask.current_app
+
+
+def test_app_context_pool(app, client):
+    app.config["APP_CONTEXT_POOL_SIZE"] = 1
+    contexts = []
+    called = []
+
+    @app.teardown_appcontext
+    def teardown(exc):
+        called.append(flask.g.get("value"))
+
+    @app.route("/<value>")
+    def index(value):
+        assert "value" not in flask.g
+        flask.g.value = value
+        contexts.append(flask._app_ctx_stack.top)
+        return value
+
+    assert client.get("/a").data == b"a"
+    assert client.get("/b").data == b"b"
+    assert contexts[0] is contexts[1]
+    assert called == ["a", "b"]
+
+
+def test_app_context_pool_explicit_context(app):
+    app.config["APP_CONTEXT_POOL_SIZE"] = 1
+
+    # a request inside an explicitly pushed app context uses that one
+    with app.app_context() as app_ctx:
+        with app.test_request_context():
+            assert flask._app_ctx_stack.top is app_ctx
+
+    with app.test_request_context():
+        first = flask._app_ctx_stack.top
+
+    assert first is not app_ctx
+
+    with app.test_request_context():
+        assert flask._app_ctx_stack.top is first
+
+
+def test_app_context_pool_reload_config(app, client):
+    app.config["APP_CONTEXT_POOL_SIZE"] = 1
+    contexts = []
+
+    @app.route("/<reload>")
+    def index(reload):
+        contexts.append(flask._app_ctx_stack.top)
+
+        # the config is reloaded while this request is handled
+        if reload == "yes":
+            app.reload_config()
+
+        return ""
+
+    client.get("/yes")
+    client.get("/no")
+    client.get("/no")
+    assert contexts[0] is not contexts[1]
+    assert contexts[1] is contexts[2]
+    assert contexts[1]._config is app.config
@@ -1235,6 +1235,75 @@ def test_response_type_errors():
     pytest.raises(TypeError, c.get, "/bad_wsgi")
 
 
+@pytest.mark.parametrize("value", [5, object()])
+def test_response_type_not_callable(app, client, value):
+    @app.route("/")
+    def index():
+        return value
+
+    with pytest.raises(TypeError) as e:
+        client.get("/")
+
+    assert str(e.value).startswith("The view function did not return")
+    assert "it was a %s." % type(value).__name__ in str(e.value)
+    assert "not callable" not in str(e.value)
+
+
+def test_response_converter(app, client):
+    class Point(object):
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    class Point3D(Point):
+        pass
+
+    class Text(str):
+        pass
+
+    @app.response_converter(Point)
+    def convert_point(rv):
+        return {"x": rv.x, "y": rv.y}
+
+    def stream(rv):
+        return app.response_class(rv, mimetype="text/plain")
+
+    app.add_response_converter(type(x for x in ()), stream)
+
+    @app.route("/point")
+    def point():
+        return Point(1, 2), 201
+
+    @app.route("/point3d")
+    def point3d():
+        return Point3D(3, 4)
+
+    @app.route("/stream")
+    def generate():
+        return (c for c in "abc")
+
+    @app.route("/text")
+    def text():
+        return Text("text"), 201
+
+    rv = client.get("/point")
+    assert rv.status_code == 201
+    assert rv.get_json() == {"x": 1, "y": 2}
+    assert client.get("/point3d").get_json() == {"x": 3, "y": 4}
+    rv = client.get("/stream")
+    assert rv.data == b"abc"
+    assert rv.mimetype == "text/plain"
+    rv = client.get("/text")
+    assert rv.status_code == 201
+    assert rv.data == b"text"
+
+    @app.response_converter(dict)
+    def convert_dict(rv):
+        return ", ".join(sorted(rv))
+
+    assert client.get("/point").data == b"x, y"
+
+
 def test_make_response(app, req_ctx):
     rv = flask.make_response()
     assert rv.status_code == 200
@@ -1913,6 +1982,17 @@ def test_run_server_port(monkeypatch, app):
     assert rv["result"] == "running on %s:%s ..." % (hostname, port)
 
 
+def test_run_frozen_config(monkeypatch, app):
+    monkeypatch.setattr(werkzeug.serving, "run_simple", lambda *a, **kw: None)
+    monkeypatch.setenv("FLASK_ENV", "development")
+    app.config.freeze()
+    app.run()
+    assert app.env == "development"
+    assert app.debug
+    app.run(debug=False)
+    assert not app.debug
+
+
 @pytest.mark.parametrize(
     "host,port,server_name,expect_host,expect_port",
     (
@@ -1965,3 +2045,83 @@ def test_max_cookie_size(app, client, recwarn):
 
     client.get("/")
     assert len(recwarn) == 0
+
+
+def test_warmup(app, client):
+    got = []
+
+    @app.before_first_request
+    def foo():
+        got.append(flask.current_app.name)
+
+    @app.route("/")
+    def index():
+        return "Hello"
+
+    app.add_template_filter(lambda s: s[::-1], "super_reverse")
+    app.warmup()
+    assert got == [app.name]
+    assert app.got_first_request
+    assert "simple_template.html" in [t.name for t in app.jinja_env.cache.values()]
+
+    assert client.get("/").data == b"Hello"
+    assert got == [app.name]
+
+
+def test_warmup_freezes_setup(app):
+    app.debug = True
+    app.warmup(templates=False)
+    assert not app.jinja_env.cache
+
+    with pytest.raises(AssertionError):
+        app.add_url_rule("/", "index", lambda: "")
+
+
+def test_warmup_skips_other_files(tmpdir):
+    tmpdir.join("index.html").write("index")
+    tmpdir.join("logo.png").write_binary(b"\x89PNG\r\n\x1a\n\xff\xfe")
+    tmpdir.join("broken.txt").write_binary(b"\xff\xfe")
+    app = flask.Flask(__name__, template_folder=str(tmpdir))
+
+    with pytest.warns(UserWarning, match="broken.txt"):
+        app.warmup()
+
+    names = {t.name for t in app.jinja_env.cache.values()}
+    assert names == {"index.html"}
+
+
+def test_warmup_template_filter(app):
+    app.warmup(templates=lambda name: name.endswith(".txt"))
+    names = {t.name for t in app.jinja_env.cache.values()}
+    assert "mail.txt" in names
+    assert "simple_template.html" not in names
+
+
+@pytest.mark.parametrize(
+    ("eager", "use_reloader", "run_main", "expect"),
+    (
+        (False, False, None, []),
+        (True, False, None, [42]),
+        (True, True, None, []),
+        (True, True, "true", [42]),
+    ),
+)
+def test_run_eager_before_first_request(
+    monkeypatch, app, eager, use_reloader, run_main, expect
+):
+    got = []
+    monkeypatch.setattr(werkzeug.serving, "run_simple", lambda *a, **kw: None)
+
+    if run_main is None:
+        monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    else:
+        monkeypatch.setenv("WERKZEUG_RUN_MAIN", run_main)
+
+    @app.before_first_request
+    def foo():
+        assert flask.current_app._get_current_object() is app
+        got.append(42)
+
+    app.config["EAGER_BEFORE_FIRST_REQUEST"] = eager
+    app.run(use_reloader=use_reloader)
+    assert got == expect
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.batch
+    ~~~~~~~~~~~
+
+    Tests the batch endpoint.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import pytest
+
+import flask
+from flask.batch import BatchDispatcher
+from flask.workers import WorkerPool
+
+
+@pytest.fixture
+def batch(app):
+    app.secret_key = "secret"
+    dispatcher = BatchDispatcher(app, max_requests=3)
+    dispatcher.register_endpoint()
+
+    @app.route("/echo", methods=["GET", "POST"])
+    def echo():
+        return flask.jsonify(
+            method=flask.request.method,
+            args=flask.request.args.to_dict(),
+            json=flask.request.get_json(silent=True),
+            lang=flask.request.headers.get("Accept-Language"),
+        )
+
+    @app.route("/text/<name>")
+    def text(name):
+        return name
+
+    @app.route("/count")
+    def count():
+        flask.session["count"] = flask.session.get("count", 0) + 1
+        return str(flask.session["count"])
+
+    @app.route("/fail")
+    def fail():
+        1 // 0
+
+    return dispatcher
+
+
+def test_batch(app, client, batch):
+    rv = client.post(
+        "/batch",
+        json=[
+            {"path": "/echo?a=1"},
+            {"path": "/echo", "method": "post", "json": {"b": 2}},
+            {"path": "/text/caf%C3%A9"},
+        ],
+    )
+    assert rv.status_code == 200
+    first, second, third = rv.get_json()
+    assert first["status"] == 200
+    assert first["headers"]["Content-Type"] == "application/json"
+    assert first["body"]["method"] == "GET"
+    assert first["body"]["args"] == {"a": "1"}
+    assert second["body"]["method"] == "POST"
+    assert second["body"]["json"] == {"b": 2}
+    assert second["body"]["args"] == {}
+    assert third["body"] == u"café"
+
+
+def test_headers(client, batch):
+    rv = client.post(
+        "/batch",
+        json=[
+            {"path": "/echo"},
+            {"path": "/echo", "headers": {"Accept-Language": "de"}},
+        ],
+        headers={"Accept-Language": "en"},
+    )
+    first, second = rv.get_json()
+    assert first["body"]["lang"] == "en"
+    assert second["body"]["lang"] == "de"
+
+
+def test_shared_session(client, batch):
+    rv = client.post("/batch", json=[{"path": "/count"}, {"path": "/count"}])
+    assert [item["body"] for item in rv.get_json()] == ["1", "2"]
+    assert "Set-Cookie" not in rv.get_json()[0]["headers"]
+    assert "Set-Cookie" in rv.headers
+    assert client.get("/count").data == b"3"
+
+
+def test_errors(app, client, batch):
+    app.testing = False
+    rv = client.post(
+        "/batch", json=[{"path": "/fail"}, {"path": "/missing"}, {"path": "/batch"}]
+    )
+    assert [item["status"] for item in rv.get_json()] == [500, 404, 400]
+
+
+def test_nested(app, client, batch):
+    # a quoted path is still the batch endpoint
+    rv = client.post(
+        "/batch", json=[{"path": "/%62atch", "method": "POST", "json": []}]
+    )
+    assert rv.get_json()[0]["status"] == 400
+
+    # another rule for the batch view is rejected by the sub-request
+    app.add_url_rule("/batch2", "batch2", batch._view, methods=["POST"])
+    rv = client.post(
+        "/batch2", json=[{"path": "/batch", "method": "POST", "json": []}]
+    )
+    assert rv.get_json()[0]["status"] == 400
+
+
+def test_invalid(client, batch):
+    assert client.post("/batch", json={"path": "/echo"}).status_code == 400
+    assert client.post("/batch", json=[{"method": "GET"}]).status_code == 400
+    assert client.post("/batch", json=[{"path": "/echo"}] * 4).status_code == 400
+    assert client.get("/batch").status_code == 405
+
+    for item in (
+        {"headers": ["a"]},
+        {"headers": {"a": 1}},
+        {"body": 5},
+        {"method": ["GET"]},
+    ):
+        item["path"] = "/echo"
+        assert client.post("/batch", json=[item]).status_code == 400
+
+
+def test_parallel(client, batch):
+    batch.pool = WorkerPool(2)
+
+    try:
+        rv = client.post(
+            "/batch",
+            json=[{"path": "/text/a"}, {"path": "/text/b"}, {"path": "/echo?c=3"}],
+        )
+    finally:
+        batch.pool.shutdown()
+
+    first, second, third = rv.get_json()
+    assert first["body"] == "a"
+    assert second["body"] == "b"
+    assert third["body"]["args"] == {"c": "3"}
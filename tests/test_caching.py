@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.caching
+    ~~~~~~~~~~~~~
+
+    Tests the response cache and the cache backends.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import threading
+import time
+
+import pytest
+
+import flask
+from flask.caching import FileSystemCache
+from flask.caching import LRUCache
+from flask.caching import SQLiteCache
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def test_cache_response(app, client, calls):
+    @app.route("/")
+    @app.cache_response()
+    def index():
+        calls.append(flask.request.args.get("q"))
+        return "index %d" % len(calls)
+
+    rv = client.get("/")
+    assert rv.data == b"index 1"
+    etag = rv.headers["ETag"]
+    assert client.get("/").data == b"index 1"
+    assert client.get("/").headers["ETag"] == etag
+    assert client.get("/?q=a").data == b"index 2"
+    assert client.post("/").status_code == 405
+    assert calls == [None, "a"]
+
+
+def test_not_modified(app, client, calls):
+    @app.route("/")
+    @app.cache_response()
+    def index():
+        calls.append(1)
+        return "index"
+
+    etag = client.get("/").headers["ETag"]
+    rv = client.get("/", headers={"If-None-Match": etag})
+    assert rv.status_code == 304
+    assert rv.data == b""
+    assert rv.headers["ETag"] == etag
+    assert client.get("/", headers={"If-None-Match": '"other"'}).data == b"index"
+    assert len(calls) == 1
+
+    app.response_cache.clear()
+    rv = client.get("/", headers={"If-None-Match": etag})
+    assert rv.status_code == 304
+    assert len(calls) == 2
+
+
+def test_timeout(app, client, calls):
+    @app.route("/")
+    @app.cache_response(timeout=0.01)
+    def index():
+        calls.append(1)
+        return "index"
+
+    client.get("/")
+    time.sleep(0.02)
+    client.get("/")
+    assert len(calls) == 2
+
+
+def test_key_and_vary(app, client, calls):
+    @app.route("/")
+    @app.cache_response(key=lambda: flask.g.lang or "", vary=["Accept"])
+    def index():
+        calls.append(1)
+        return "index"
+
+    @app.before_request
+    def set_lang():
+        flask.g.lang = flask.request.headers.get("X-Lang")
+
+    rv = client.get("/")
+    assert rv.headers["Vary"] == "Accept"
+    client.get("/")
+    client.get("/", headers={"Accept": "text/plain"})
+    client.get("/", headers={"X-Lang": "de"})
+    assert len(calls) == 3
+
+
+def test_key_is_unambiguous(app, client, calls):
+    @app.route("/items")
+    @app.cache_response()
+    def items():
+        calls.append(1)
+        return repr(sorted(flask.request.args.items(multi=True)))
+
+    client.get("/items?a=b%0Ac%3Dd")
+    assert client.get("/items?a=b&c=d").data == b"[('a', 'b'), ('c', 'd')]"
+    assert len(calls) == 2
+
+
+def test_uncacheable(app, client, calls):
+    @app.route("/error")
+    @app.cache_response()
+    def error():
+        calls.append(1)
+        return "error", 500
+
+    @app.route("/cookie")
+    @app.cache_response()
+    def cookie():
+        calls.append(1)
+        rv = flask.make_response("cookie")
+        rv.set_cookie("name", "value")
+        return rv
+
+    client.get("/error")
+    client.get("/error")
+    client.get("/cookie")
+    client.get("/cookie")
+    assert len(calls) == 4
+
+
+def test_session(app, client, calls):
+    app.secret_key = "secret"
+
+    @app.route("/")
+    @app.cache_response()
+    def index():
+        calls.append(1)
+        return "user %s" % flask.session.get("user")
+
+    @app.route("/vary")
+    @app.cache_response(vary=["Cookie"])
+    def vary():
+        calls.append(1)
+        return "user %s" % flask.session.get("user")
+
+    @app.route("/login/<name>")
+    def login(name):
+        flask.session["user"] = name
+        return ""
+
+    client.get("/")
+    client.get("/")
+    assert len(calls) == 2
+
+    client.get("/vary")
+    assert client.get("/vary").data == b"user None"
+    assert len(calls) == 3
+    client.get("/login/a")
+    assert client.get("/vary").data == b"user a"
+    assert client.get("/vary").data == b"user a"
+    assert len(calls) == 4
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    assert cache.get("a") == 1
+    cache.set("c", 3, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("c", 3, -1)
+    assert cache.get("c") is None
+    cache.delete("a")
+    assert cache.get("a") is None
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def shared_cache(request, tmpdir):
+    if request.param == "filesystem":
+        return FileSystemCache(str(tmpdir.join("cache")), threshold=3)
+
+    return SQLiteCache(str(tmpdir.join("cache.db")))
+
+
+def test_shared_cache(shared_cache):
+    value = (200, [("Content-Type", "text/plain")], b"body", "etag")
+    shared_cache.set("a", value, 60)
+    assert shared_cache.get("a") == value
+    assert shared_cache.get("b") is None
+    shared_cache.set("b", value, -1)
+    assert shared_cache.get("b") is None
+    shared_cache.delete("a")
+    assert shared_cache.get("a") is None
+    shared_cache.set("a", value, 60)
+    shared_cache.clear()
+    assert shared_cache.get("a") is None
+
+
+def test_filesystem_cache_threshold(tmpdir):
+    cache = FileSystemCache(str(tmpdir), threshold=2)
+    cache.set("expired", 0, -1)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    assert cache.get("a") == 1
+    cache.set("c", 3, 60)
+    assert len(tmpdir.listdir()) == 2
+    assert cache.get("c") == 3
+
+
+def test_cache_backend(app, client, tmpdir, calls):
+    cache = SQLiteCache(str(tmpdir.join("cache.db")))
+
+    @app.route("/")
+    @app.cache_response(cache=cache)
+    def index():
+        calls.append(1)
+        return "index"
+
+    client.get("/")
+    assert client.get("/").data == b"index"
+    assert len(calls) == 1
+    assert app.response_cache.get("index\n/") is None
+
+
+def test_single_flight(app, calls):
+    started = threading.Event()
+    release = threading.Event()
+    arrived = []
+
+    @app.before_request
+    def count():
+        arrived.append(1)
+
+    @app.route("/")
+    @app.single_flight()
+    def index():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "index %d" % len(calls)
+
+    results = []
+
+    def request(path="/"):
+        results.append(app.test_client().get(path).data)
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=request) for _ in range(3)]
+
+    for thread in followers:
+        thread.start()
+
+    while len(arrived) < 4:
+        time.sleep(0.01)
+
+    # give the followers time to wait for the leader
+    time.sleep(0.05)
+    release.set()
+
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [b"index 1"] * 4
+
+    request("/?q=a")
+    assert len(calls) == 2
+
+
+def test_single_flight_error(app, client, calls):
+    app.testing = False
+
+    @app.route("/")
+    @app.single_flight(timeout=1)
+    def index():
+        calls.append(1)
+
+        if len(calls) == 1:
+            raise ValueError()
+
+        return "index"
+
+    assert client.get("/").status_code == 500
+    assert client.get("/").data == b"index"
@@ -412,6 +412,20 @@ def test_flaskgroup_debug(runner, set_debug_flag):
     assert result.output == "%s\n" % str(not set_debug_flag)
 
 
+def test_load_app_frozen_config(monkeypatch):
+    monkeypatch.setenv("FLASK_DEBUG", "1")
+
+    def create_app():
+        app = Flask("frozen")
+        app.config.freeze()
+        return app
+
+    app = ScriptInfo(create_app=create_app).load_app()
+    assert app.debug
+    assert app.config.frozen.DEBUG
+    assert app.jinja_env.auto_reload
+
+
 def test_print_exceptions(runner):
     """Print the stacktrace if the CLI."""
 
@@ -665,3 +679,62 @@ def test_cli_empty(app):
 
     result = app.test_cli_runner().invoke(args=["blue", "--help"])
     assert result.exit_code == 2, "Unexpected success:\n\n" + result.output
+
+
+_lazy_module = '''\
+import click
+
+@click.command()
+def cli():
+    """Do the lazy work."""
+    click.echo("lazy")
+'''
+
+
+def _lazy_group():
+    return FlaskGroup(create_app=lambda info: Flask("flaskgroup"))
+
+
+def test_lazy_command(runner, tmpdir, monkeypatch):
+    tmpdir.join("lazy_command.py").write(_lazy_module)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delitem(sys.modules, "lazy_command", raising=False)
+    cli = _lazy_group()
+    cli.add_lazy_command("lazy", "lazy_command:cli", short_help="Do lazy work.")
+
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    assert "Do lazy work." in result.output
+    assert "lazy_command" not in sys.modules
+
+    result = runner.invoke(cli, ["lazy"])
+    assert result.output == "lazy\n"
+    assert "lazy_command" in sys.modules
+
+
+def test_plugin_commands_cache(runner, tmpdir, monkeypatch):
+    tmpdir.join("lazy_plugin.py").write(_lazy_module)
+    cache = tmpdir.mkdir("cache").join("commands.json")
+    # writing to a directory on sys.path would invalidate the cache
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.delitem(sys.modules, "lazy_plugin", raising=False)
+    monkeypatch.setenv("FLASK_COMMANDS_CACHE", str(cache))
+    monkeypatch.setattr(
+        "flask.cli._entry_points", lambda group: [("lazy", "lazy_plugin:cli")]
+    )
+
+    # the first run imports the plugin to get its help
+    result = runner.invoke(_lazy_group(), ["--help"])
+    assert "Do the lazy work." in result.output
+    assert "lazy_plugin" in sys.modules
+
+    # later runs use the cache instead of the entry points and the plugin
+    monkeypatch.delitem(sys.modules, "lazy_plugin")
+    monkeypatch.setattr("flask.cli._entry_points", None)
+    result = runner.invoke(_lazy_group(), ["--help"])
+    assert "Do the lazy work." in result.output
+    assert "lazy_plugin" not in sys.modules
+
+    result = runner.invoke(_lazy_group(), ["lazy"])
+    assert result.output == "lazy\n"
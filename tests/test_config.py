@@ -6,8 +6,10 @@
     :copyright: 2010 Pallets
     :license: BSD-3-Clause
 """
+import copy
 import os
 import textwrap
+import time
 from datetime import timedelta
 
 import pytest
@@ -200,3 +202,205 @@ def test_from_pyfile_weird_encoding(tmpdir, encoding):
     if PY2:
         value = value.decode(encoding)
     assert value == u"föö"
+
+
+def test_from_pyfile_cache(tmpdir):
+    f = tmpdir.join("cached.py")
+    f.write("TEST_VALUE = 1\n")
+    config = flask.Config(str(tmpdir))
+    assert config.from_pyfile("cached.py")
+    code = flask.config._code_cache[str(f)][1]
+    assert config.from_pyfile("cached.py")
+    assert flask.config._code_cache[str(f)][1] is code
+    f.write("TEST_VALUE = 22\n")
+    assert config.from_pyfile("cached.py")
+    assert config["TEST_VALUE"] == 22
+    assert flask.config._code_cache[str(f)][1] is not code
+
+
+def test_from_prefixed_env(monkeypatch):
+    monkeypatch.setenv("FLASK_STRING", "value")
+    monkeypatch.setenv("FLASK_BOOL", "true")
+    monkeypatch.setenv("FLASK_INT", "1")
+    monkeypatch.setenv("FLASK_FLOAT", "1.2")
+    monkeypatch.setenv("FLASK_LIST", "[1, 2]")
+    monkeypatch.setenv("FLASK_DICT", '{"k": "v"}')
+    monkeypatch.setenv("FLASK_EXIST__ok", "other")
+    monkeypatch.setenv("FLASK_NEW__K", "v")
+    monkeypatch.setenv("NOT_FLASK_OTHER", "other")
+
+    config = flask.Config(__file__)
+    config["EXIST"] = {"ok": "value", "flag": True}
+    assert config.from_prefixed_env()
+    assert config["STRING"] == "value"
+    assert config["BOOL"] is True
+    assert config["INT"] == 1
+    assert config["FLOAT"] == 1.2
+    assert config["LIST"] == [1, 2]
+    assert config["DICT"] == {"k": "v"}
+    assert config["EXIST"] == {"ok": "other", "flag": True}
+    assert config["NEW"] == {"K": "v"}
+    assert "OTHER" not in config
+
+    config = flask.Config(__file__)
+    config.from_prefixed_env(prefix="NOT_FLASK", loads=lambda x: x.upper())
+    assert config == {"OTHER": "OTHER"}
+
+
+def test_freeze(app):
+    app.config["SERVER_NAME"] = "localhost.localdomain"
+    app.config["JSON_SORT_KEYS"] = False
+    app.config.freeze()
+    assert app.config.frozen.SERVER_NAME == "localhost.localdomain"
+    assert app.use_x_sendfile is False
+
+    for f in (
+        lambda: app.config.__setitem__("SERVER_NAME", "example.com"),
+        lambda: app.config.__delitem__("DEBUG"),
+        lambda: app.config.update(DEBUG=True),
+        lambda: app.config.setdefault("NEW_KEY", 1),
+        lambda: app.config.pop("DEBUG"),
+        lambda: app.config.from_mapping(DEBUG=True),
+        app.config.popitem,
+        app.config.clear,
+    ):
+        with pytest.raises(TypeError):
+            f()
+
+    assert app.config.setdefault("DEBUG") is False
+
+    with pytest.raises(TypeError):
+        app.debug = True
+
+    @app.route("/")
+    def index():
+        flask.session["a"] = 1
+        return flask.jsonify(b=1, a=2)
+
+    rv = app.test_client().get("/")
+    assert rv.data == b'{"b":1,"a":2}\n'
+    assert "Domain=.localhost.localdomain" in rv.headers["Set-Cookie"]
+
+    with app.test_request_context():
+        assert flask.url_for("index", _external=True) == (
+            "http://localhost.localdomain/"
+        )
+
+
+def test_freeze_copy():
+    config = flask.Config("/", {"A": 1})
+    config.freeze()
+    copied = copy.copy(config)
+    assert copied == {"A": 1}
+    assert copied.frozen is not None
+    unfrozen = copy.copy(flask.Config("/", {"A": 1}))
+    unfrozen["B"] = 2
+
+
+def test_reload_config(tmpdir):
+    f = tmpdir.join("settings.py")
+    f.write("TEST_VALUE = 1\n")
+    j = tmpdir.join("settings.json")
+    j.write('{"JSON_VALUE": 1}')
+    app = flask.Flask(__name__)
+    app.config.from_pyfile(str(f))
+    app.config.from_json(str(j))
+    app.config.from_pyfile(str(tmpdir.join("missing.py")), silent=True)
+    app.config["OTHER"] = "other"
+    app.config.freeze()
+    assert app.config.files == [
+        str(f),
+        str(j),
+        str(tmpdir.join("missing.py")),
+    ]
+    calls = []
+
+    @app.after_config_reload
+    def rebuild():
+        calls.append(flask.current_app.config["TEST_VALUE"])
+
+    @app.route("/")
+    def index():
+        return flask.render_template_string("{{ config.TEST_VALUE }}")
+
+    client = app.test_client()
+    assert client.get("/").data == b"1"
+    old = app.config
+    f.write("TEST_VALUE = 22\n")
+    app.reload_config()
+    assert old["TEST_VALUE"] == 1
+    assert app.config["TEST_VALUE"] == 22
+    assert app.config["JSON_VALUE"] == 1
+    assert app.config["OTHER"] == "other"
+    assert app.config.frozen is not None
+    assert calls == [22]
+    assert client.get("/").data == b"22"
+
+
+def test_reload_config_overrides(tmpdir):
+    f = tmpdir.join("settings.py")
+    f.write('SECRET_KEY = "file"\nFEATURE = True\nREMOVED = 1\n')
+    j = tmpdir.join("settings.json")
+    j.write('{"LATER": "file"}')
+    app = flask.Flask(__name__)
+    app.config["DEFAULT"] = "default"
+    app.config.from_pyfile(str(f))
+    app.config["SECRET_KEY"] = "first"
+    app.config["SECRET_KEY"] = "override"
+    app.config.from_mapping(FEATURE=False)
+    app.config.update(LATER="before")
+    del app.config["REMOVED"]
+    app.config.from_json(str(j))
+    app.config.update(OTHER="other")
+    assert len(app.config._sources) == 7
+    app.reload_config()
+    assert app.config["DEFAULT"] == "default"
+    assert app.config["SECRET_KEY"] == "override"
+    assert app.config["FEATURE"] is False
+    assert "REMOVED" not in app.config
+    assert app.config["LATER"] == "file"
+    assert app.config["OTHER"] == "other"
+    assert app.config._sources == app.config.reload()._sources
+
+
+def test_reload_config_cookie_domain(tmpdir):
+    f = tmpdir.join("settings.py")
+    f.write('SERVER_NAME = "old.example.com"\n')
+    app = flask.Flask(__name__)
+    app.secret_key = "secret"
+    app.config.from_pyfile(str(f))
+
+    @app.route("/")
+    def index():
+        flask.session["a"] = 1
+        return ""
+
+    client = app.test_client()
+    rv = client.get("/", "http://old.example.com/")
+    assert "Domain=.old.example.com" in rv.headers["Set-Cookie"]
+    f.write('SERVER_NAME = "new.example.org"\n')
+    app.reload_config()
+    rv = client.get("/", "http://new.example.org/")
+    assert "Domain=.new.example.org" in rv.headers["Set-Cookie"]
+
+
+def test_watch_config(tmpdir):
+    f = tmpdir.join("settings.py")
+    f.write("TEST_VALUE = 1\n")
+    app = flask.Flask(__name__)
+    app.config.from_pyfile(str(f))
+    watcher = app.watch_config(interval=0.01)
+
+    try:
+        f.write("TEST_VALUE = 2\n")
+        f.setmtime(f.mtime() + 10)
+
+        for _ in range(500):
+            if app.config["TEST_VALUE"] == 2:
+                break
+
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+
+    assert app.config["TEST_VALUE"] == 2
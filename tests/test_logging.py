@@ -6,14 +6,20 @@ tests.test_logging
 :copyright: 2010 Pallets
 :license: BSD-3-Clause
 """
+import json
 import logging
 import sys
+import threading
 
 import pytest
 
+from flask import Flask
 from flask._compat import StringIO
+from flask.logging import AccessLog
 from flask.logging import default_handler
 from flask.logging import has_level_handler
+from flask.logging import JSONFormatter
+from flask.logging import QueueHandler
 from flask.logging import wsgi_errors_stream
 
 
@@ -113,3 +119,150 @@ def test_warn_old_config(app, request):
 
     with pytest.warns(UserWarning):
         assert app.logger.getEffectiveLevel() == logging.WARNING
+
+
+def test_json_logging(app, client):
+    app.config["LOGGING_JSON"] = True
+
+    @app.route("/")
+    def index():
+        app.logger.error("test %s", "arg")
+        return ""
+
+    stream = StringIO()
+    client.get("/", errors_stream=stream)
+    assert app.logger.handlers[0].formatter.__class__ is JSONFormatter
+    data = json.loads(stream.getvalue())
+    assert data["level"] == "ERROR"
+    assert data["logger"] == "flask_test"
+    assert data["message"] == "test arg"
+
+
+def test_json_formatter_exc_info():
+    try:
+        raise ValueError("test")
+    except ValueError:
+        record = logging.LogRecord(
+            "flask_test", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+        )
+
+    data = json.loads(JSONFormatter().format(record))
+    assert data["message"] == "failed"
+    assert "ValueError: test" in data["exc_info"]
+
+
+def test_queue_logging(app, client):
+    app.config["LOGGING_QUEUE_SIZE"] = 10
+    app.testing = False
+
+    @app.route("/")
+    def index():
+        raise Exception("test")
+
+    handler = app.logger.handlers[0]
+    assert isinstance(handler, QueueHandler)
+    stream = StringIO()
+    handler.handlers[0].stream = stream
+    client.get("/")
+    handler.stop()
+    err = stream.getvalue()
+    assert "Exception on / [GET]" in err
+    assert "Exception: test" in err
+
+
+def test_queue_handler_drops():
+    started = threading.Event()
+    release = threading.Event()
+    records = []
+
+    class Handler(logging.Handler):
+        def emit(self, record):
+            started.set()
+            release.wait()
+            records.append(record.getMessage())
+
+    handler = QueueHandler([Handler()], maxsize=1)
+    logger = logging.getLogger("flask_test")
+    logger.addHandler(handler)
+    logger.error("handled %d", 1)
+    started.wait()
+    logger.error("queued %d", 2)
+    logger.error("dropped %d", 3)
+    assert handler.dropped == 1
+
+    release.set()
+    handler.stop()
+    assert records == ["handled 1", "queued 2"]
+
+
+def test_access_log(app, client):
+    app.config["ACCESS_LOG"] = True
+    app.testing = False
+    stream = StringIO()
+    app.access_log.stream = stream
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    @app.route("/error")
+    def error():
+        raise Exception("test")
+
+    client.get("/")
+    client.get("/?a=b", headers={"X-Request-ID": "abc"})
+    client.get("/error")
+    client.get("/missing")
+    app.access_log.stop()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert lines[0]["method"] == "GET"
+    assert lines[0]["path"] == "/"
+    assert lines[0]["endpoint"] == "index"
+    assert lines[0]["status"] == 200
+    assert lines[0]["bytes"] == 5
+    assert lines[0]["duration"] >= 0
+    assert lines[0]["request_id"] != lines[2]["request_id"]
+    assert lines[1]["request_id"] == "abc"
+    assert lines[2]["status"] == 500
+    assert lines[2]["duration"] is None
+    assert lines[3]["status"] == 404
+    assert lines[3]["endpoint"] is None
+
+
+def test_access_log_lazy(monkeypatch):
+    hooks = []
+    monkeypatch.setattr(
+        "os.register_at_fork", lambda **kwargs: hooks.append(kwargs), raising=False
+    )
+    app = Flask(__name__)
+
+    @app.route("/")
+    def index():
+        return ""
+
+    app.test_client().get("/")
+    assert app.access_log.queue is None
+    assert hooks == []
+    app.config["ACCESS_LOG"] = True
+    app.access_log.stream = StringIO()
+    app.test_client().get("/")
+    app.access_log.stop()
+    assert app.access_log.queue is not None
+    assert len(hooks) == 1
+
+
+def test_access_log_drops(app, client):
+    app.config["ACCESS_LOG"] = True
+    app.access_log = AccessLog(app, maxsize=1)
+    app.access_log.stream = StringIO()
+    app.access_log._thread = threading.current_thread()
+
+    @app.route("/")
+    def index():
+        return ""
+
+    client.get("/")
+    client.get("/")
+    assert app.access_log.dropped == 1
+    app.access_log._thread = None
@@ -1,6 +1,50 @@
 import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import flask
 
 
 def test_changelog_utf8_compatible():
     with io.open("CHANGES.rst", encoding="UTF-8") as f:
         f.read()
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="Lazy submodules need module __getattr__."
+)
+def test_import_is_lazy():
+    """Importing Flask doesn't import the modules that are only needed by
+    the CLI, the test client or the session serializer.
+    """
+    lazy = (
+        "click",
+        "dotenv",
+        "flask.cli",
+        "flask.testing",
+        "flask.json.tag",
+        "sqlite3",
+        "mmap",
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(flask.__file__))]
+        + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    out = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, flask; flask.Flask(__name__);"
+            " print(' '.join(m for m in %r if m in sys.modules))" % (lazy,),
+        ],
+        env=env,
+    )
+    assert out.decode().split() == []
+
+    # the submodules are still available as attributes
+    assert flask.cli.FlaskGroup
+    assert flask.json.tag.TaggedJSONSerializer
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.metrics
+    ~~~~~~~~~~~~~
+
+    Tests the metrics registry.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import threading
+
+import pytest
+
+import flask
+from flask.metrics import _MmapFile
+from flask.metrics import _read_mmap_file
+
+
+@pytest.fixture
+def metrics_app(app):
+    app.config["METRICS"] = True
+    app.testing = False
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    @app.route("/missing")
+    def missing():
+        flask.abort(404)
+
+    @app.route("/error")
+    def error():
+        raise ValueError()
+
+    @app.route("/folder/")
+    def folder():
+        return "folder"
+
+    return app
+
+
+def test_disabled(app, client):
+    @app.route("/")
+    def index():
+        return "index"
+
+    client.get("/")
+    assert app.metrics.collect() == {}
+
+
+def test_collect(metrics_app, client):
+    client.get("/")
+    client.get("/")
+    client.get("/missing")
+    client.get("/error")
+    client.get("/not-found")
+    client.get("/folder")
+    samples = metrics_app.metrics.collect()
+
+    def requests(endpoint, status):
+        return samples[
+            ("flask_requests_total", (("endpoint", endpoint), ("status", status)))
+        ]
+
+    def exceptions(endpoint, name):
+        return samples[
+            ("flask_exceptions_total", (("endpoint", endpoint), ("exception", name)))
+        ]
+
+    assert requests("index", "200") == 2
+    assert requests("missing", "404") == 1
+    assert requests("error", "500") == 1
+    assert requests("", "404") == 1
+    assert exceptions("missing", "NotFound") == 1
+    assert exceptions("error", "ValueError") == 1
+    assert not any(
+        name == "flask_exceptions_total" and ("exception", "RequestRedirect") in labels
+        for name, labels in samples
+    )
+
+    count = ("flask_request_duration_seconds_count", (("endpoint", "index"),))
+    assert samples[count] == 2
+    labels = (("endpoint", "index"), ("le", float("inf")))
+    assert samples[("flask_request_duration_seconds_bucket", labels)] == 2
+    count = ("flask_request_duration_seconds_count", (("endpoint", "error"),))
+    assert count not in samples
+
+    metrics_app.metrics.clear()
+    assert metrics_app.metrics.collect() == {}
+
+
+def test_threads(metrics_app):
+    def request():
+        metrics_app.test_client().get("/")
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    request()
+    samples = metrics_app.metrics.collect()
+    key = ("flask_requests_total", (("endpoint", "index"), ("status", "200")))
+    assert samples[key] == 6
+    assert len(metrics_app.metrics._shards) == 1
+
+
+def test_endpoint(metrics_app, client):
+    metrics_app.metrics.register_endpoint()
+    client.get("/")
+    rv = client.get("/metrics")
+    assert rv.mimetype == "text/plain"
+    text = rv.data.decode()
+    assert "# TYPE flask_requests_total counter" in text
+    assert 'flask_requests_total{endpoint="index",status="200"} 1.0' in text
+    assert 'seconds_bucket{endpoint="index",le="+Inf"} 1.0' in text
+    assert 'seconds_bucket{endpoint="index",le="0.5"} 1.0' in text
+
+
+def test_multiprocess(metrics_app, client, tmpdir):
+    metrics_app.config["METRICS_MULTIPROCESS_DIR"] = str(tmpdir)
+    key = ("flask_requests_total", (("endpoint", "index"), ("status", "200")))
+    client.get("/")
+    metrics_app.metrics.flush()
+    own = tmpdir.listdir()[0]
+    assert dict(_read_mmap_file(str(own)))[key] == 1
+
+    # pretend another worker process wrote the same samples
+    tmpdir.join("flask-metrics-1.db").write_binary(own.read_binary())
+    assert metrics_app.metrics.collect()[key] == 2
+
+    client.get("/")
+    assert metrics_app.metrics.collect()[key] == 3
+
+
+def test_mmap_file_grows(tmpdir, monkeypatch):
+    monkeypatch.setattr(_MmapFile, "initial_size", 64)
+    path = str(tmpdir.join("flask-metrics-1.db"))
+    f = _MmapFile(path)
+    samples = {("name", (("label", str(i)),)): float(i) for i in range(20)}
+    f.write(samples)
+    f.write({("name", (("label", "1"),)): 42.0})
+    f.close()
+    samples[("name", (("label", "1"),))] = 42.0
+    assert dict(_read_mmap_file(path)) == samples
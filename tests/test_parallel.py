@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.parallel
+    ~~~~~~~~~~~~~~
+
+    Tests the parallel calls.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import io
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+import flask
+from flask import parallel
+
+
+def test_map(app, client):
+    threads = set()
+
+    def fetch(name):
+        threads.add(threading.current_thread().ident)
+        time.sleep(0.01)
+        return "%s %s %s" % (name, flask.request.args["q"], flask.g.user)
+
+    @app.route("/")
+    def index():
+        flask.g.user = "a"
+        return ", ".join(parallel.map(fetch, ["x", "y", "z"]))
+
+    assert client.get("/?q=1").data == b"x 1 a, y 1 a, z 1 a"
+    assert threading.current_thread().ident not in threads
+    assert len(threads) > 1
+
+
+def test_gather(app):
+    def set_g():
+        flask.g.value = 2
+        return flask.current_app.name
+
+    with app.app_context():
+        flask.g.value = 1
+        flask.g.user = "a"
+        assert parallel.gather(set_g, lambda: flask.g.user) == [app.name, "a"]
+        assert flask.g.value == 1
+        assert not flask.has_request_context()
+        assert parallel.gather() == []
+
+    with pytest.raises(TypeError):
+        parallel.gather(timeout=1, other=2)
+
+
+class _SlowStream(io.BytesIO):
+    def read(self, *args):
+        time.sleep(0.01)
+        return io.BytesIO.read(self, *args)
+
+    def readline(self, *args):
+        time.sleep(0.01)
+        return io.BytesIO.readline(self, *args)
+
+
+def test_request_body(app, client):
+    def read(name):
+        if name == "json":
+            return flask.request.get_json()["a"]
+
+        return flask.request.form.get(name, "")
+
+    @app.route("/", methods=["POST"])
+    def index():
+        names = ["json"] if flask.request.is_json else ["a", "b"]
+        return ",".join(parallel.map(read, names * 2))
+
+    def post(body, content_type):
+        return client.post(
+            "/",
+            input_stream=_SlowStream(body),
+            content_type=content_type,
+            content_length=len(body),
+        ).data
+
+    assert post(b"a=1&b=2", "application/x-www-form-urlencoded") == b"1,2,1,2"
+    assert post(b'{"a": "1"}', "application/json") == b"1,1"
+
+
+def test_outside_context():
+    with pytest.raises(RuntimeError):
+        parallel.map(str, [1])
+
+
+def test_max_workers(app):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(n):
+        with lock:
+            active.append(n)
+            peak.append(len(active))
+
+        time.sleep(0.01)
+
+        with lock:
+            active.remove(n)
+
+        return n * 2
+
+    with app.app_context():
+        assert parallel.map(work, range(6), max_workers=2) == [0, 2, 4, 6, 8, 10]
+
+    assert max(peak) <= 2
+
+
+def test_error_cancels(app):
+    started = []
+
+    def work(n):
+        if n == 0:
+            raise ValueError()
+
+        started.append(n)
+        time.sleep(0.01)
+
+    with app.app_context():
+        with pytest.raises(ValueError):
+            parallel.map(work, range(10), max_workers=1)
+
+    assert not started
+
+
+def test_timeout(app):
+    stopped = threading.Event()
+
+    def slow():
+        while not parallel.is_cancelled():
+            time.sleep(0.005)
+
+        stopped.set()
+
+    with app.app_context():
+        with pytest.raises(TimeoutError):
+            parallel.gather(slow, timeout=0.02)
+
+    assert stopped.wait(1)
+    assert not parallel.is_cancelled()
+
+
+def test_timeout_pooled_context(app, client):
+    app.config["REQUEST_CONTEXT_POOL_SIZE"] = 2
+    done = threading.Event()
+    paths = []
+
+    def slow():
+        time.sleep(0.1)
+        paths.append(flask.request.path)
+        done.set()
+
+    @app.route("/a")
+    def a():
+        try:
+            parallel.gather(slow, timeout=0.01)
+        except TimeoutError:
+            pass
+
+        return ""
+
+    @app.route("/b")
+    def b():
+        time.sleep(0.2)
+        return ""
+
+    client.get("/a")
+    client.get("/b")
+    assert done.wait(1)
+    assert paths == ["/a"]
+
+
+def test_nested(app):
+    def outer(n):
+        return parallel.map(lambda m: (n, m), [1, 2])
+
+    with app.app_context():
+        assert parallel.map(outer, [1]) == [[(1, 1), (1, 2)]]
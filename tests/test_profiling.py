@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.profiling
+    ~~~~~~~~~~~~~~~
+
+    Tests the sampling profiler.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+import flask
+from flask.cli import ScriptInfo
+from flask.cli import profile_cli
+
+
+@pytest.fixture
+def profiled_app(app):
+    app.config["PROFILER_SAMPLE_RATE"] = 2
+    app.config["PROFILER_INTERVAL"] = 0.001
+    app.config["PROFILER_TOKEN"] = "secret"
+    app.profiler.register_endpoint()
+
+    @app.route("/")
+    def index():
+        time.sleep(0.05)
+        return "index"
+
+    @app.route("/other")
+    def other():
+        return "other"
+
+    return app
+
+
+def test_sample_rate(profiled_app, client):
+    for _ in range(3):
+        client.get("/")
+
+    assert profiled_app.profiler.profiled == {"index": 2}
+    stacks = profiled_app.profiler.collapsed()
+    assert stacks
+
+    for line in stacks.splitlines():
+        stack, samples = line.rsplit(" ", 1)
+        assert stack.startswith("index;flask.app:full_dispatch_request;")
+        assert int(samples) > 0
+
+    assert any(":index" in line for line in stacks.splitlines())
+
+    profiled_app.profiler.clear()
+    assert profiled_app.profiler.collapsed() == ""
+    assert profiled_app.profiler.profiled == {}
+
+
+def test_sample_outside_dispatch(profiled_app):
+    profiler = profiled_app.profiler
+    started = threading.Event()
+    frames = []
+
+    def request():
+        frames.append(sys._getframe())
+        started.set()
+        time.sleep(0.05)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    started.wait()
+
+    # the thread's current frame is the top frame, as if it was in
+    # dispatch before calling full_dispatch_request
+    profiler._active[thread.ident] = ("index", frames[0])
+    sampler = threading.Thread(target=profiler._sample)
+    sampler.start()
+    thread.join()
+
+    with profiler._lock:
+        del profiler._active[thread.ident]
+
+    sampler.join()
+    assert profiler.collapsed() == ""
+
+
+def test_endpoint_sample_rates(profiled_app, client):
+    profiled_app.config["PROFILER_SAMPLE_RATE"] = 0
+    profiled_app.config["PROFILER_ENDPOINT_SAMPLE_RATES"] = {"other": 1}
+    client.get("/")
+    client.get("/other")
+    client.get("/other")
+    assert profiled_app.profiler.profiled == {"other": 2}
+
+
+def test_disabled(app, client):
+    @app.route("/")
+    def index():
+        return "index"
+
+    client.get("/")
+    assert app.profiler.profiled == {}
+
+
+def test_endpoint(profiled_app, client):
+    client.get("/")
+    rv = client.get("/_profile", headers={"Authorization": "Bearer secret"})
+    assert rv.status_code == 200
+    assert rv.mimetype == "text/plain"
+    assert rv.data.decode().startswith("index;")
+    assert "_profile" not in profiled_app.profiler.profiled
+
+    rv = client.get(
+        "/_profile?endpoint=other", headers={"Authorization": "Bearer secret"}
+    )
+    assert rv.data == b""
+
+    assert client.get("/_profile").status_code == 403
+    rv = client.get("/_profile", headers={"Authorization": "Bearer wrong"})
+    assert rv.status_code == 403
+
+    profiled_app.config["PROFILER_TOKEN"] = None
+    rv = client.get("/_profile", headers={"Authorization": "Bearer secret"})
+    assert rv.status_code == 404
+
+
+def test_dump_command(profiled_app, client, monkeypatch):
+    client.get("/")
+    requested = []
+
+    def urlopen(req):
+        requested.append(req.get_full_url())
+        rv = client.get(req.selector, headers=dict(req.header_items()))
+        return io.BytesIO(rv.data)
+
+    monkeypatch.setattr("urllib.request.urlopen", urlopen)
+    runner = profiled_app.test_cli_runner()
+    obj = ScriptInfo(create_app=lambda info: profiled_app)
+    result = runner.invoke(profile_cli, ["dump"], obj=obj)
+    assert result.exit_code == 0
+    assert result.output.startswith("index;")
+    assert requested == ["http://127.0.0.1:5000/_profile"]
+
+    result = runner.invoke(
+        profile_cli, ["dump", "-s", "http://example.com/", "-e", "other"], obj=obj
+    )
+    assert result.output == ""
+    assert requested[-1] == "http://example.com/_profile?endpoint=other"
+
+
+def test_dump_command_not_registered(app):
+    runner = app.test_cli_runner()
+    obj = ScriptInfo(create_app=lambda info: app)
+    result = runner.invoke(profile_cli, ["dump"], obj=obj)
+    assert result.exit_code != 0
+    assert "register_endpoint" in result.output
+
+
+def test_profiler_in_default_commands():
+    assert "profile" in flask.cli.cli.commands
@@ -283,3 +283,86 @@ def test_normal_environ_completes():
 
     response = app.test_client().get("/", headers={"host": "xn--on-0ia.com"})
     assert response.status_code == 200
+
+
+def test_request_context_pool(app, client):
+    app.config["REQUEST_CONTEXT_POOL_SIZE"] = 1
+    contexts = []
+
+    @app.route("/<name>")
+    def index(name):
+        ctx = flask._request_ctx_stack.top
+        contexts.append(ctx)
+        assert not hasattr(ctx, "user")
+        assert ctx.session is not None
+        ctx.user = name
+
+        @flask.after_this_request
+        def add_header(response):
+            response.headers["X-Name"] = name
+            return response
+
+        return flask.request.path
+
+    rv = client.get("/a")
+    assert rv.data == b"/a"
+    assert rv.headers.getlist("X-Name") == ["a"]
+    rv = client.get("/b")
+    assert rv.data == b"/b"
+    assert rv.headers.getlist("X-Name") == ["b"]
+    assert contexts[0] is contexts[1]
+    assert contexts[0]._after_request_functions == []
+
+
+def test_request_context_pool_disabled(app, client):
+    contexts = []
+
+    @app.route("/")
+    def index():
+        contexts.append(flask._request_ctx_stack.top)
+        return ""
+
+    client.get("/")
+    client.get("/")
+    assert contexts[0] is not contexts[1]
+
+
+def test_request_context_pool_stream_with_context(app, client):
+    app.config["REQUEST_CONTEXT_POOL_SIZE"] = 1
+    contexts = []
+
+    @app.route("/stream")
+    def stream():
+        contexts.append(flask._request_ctx_stack.top)
+
+        def generate():
+            yield flask.request.path
+
+        return flask.Response(flask.stream_with_context(generate()))
+
+    @app.route("/")
+    def index():
+        contexts.append(flask._request_ctx_stack.top)
+        return ""
+
+    rv = client.get("/stream")
+    assert rv.data == b"/stream"
+    client.get("/")
+    assert contexts[0] is not contexts[1]
+
+
+def test_context_attributes(app):
+    import weakref
+
+    with app.test_request_context() as ctx:
+        app_ctx = flask._app_ctx_stack.top
+        assert "request" in type(ctx).__slots__
+        assert "g" in type(app_ctx).__slots__
+
+        # extensions can still store their own data on the contexts
+        ctx.user = "user"
+        app_ctx.db = "db"
+        assert ctx.user == "user"
+        assert app_ctx.db == "db"
+        assert weakref.ref(ctx)() is ctx
+        assert weakref.ref(app_ctx)() is app_ctx
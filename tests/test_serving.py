@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.serving
+    ~~~~~~~~~~~~~
+
+    Tests the preforking server.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+import flask
+from flask.serving import _WorkerServer
+
+try:
+    from http.client import HTTPConnection
+except ImportError:
+    from httplib import HTTPConnection
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="The prefork server requires 'os.fork'."
+)
+
+
+def test_keep_alive():
+    app = flask.Flask(__name__)
+
+    @app.route("/")
+    def index():
+        return "hello"
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(5)
+    port = sock.getsockname()[1]
+    server = _WorkerServer(app, sock, threads=2, keep_alive=5)
+    sock.close()
+    t = threading.Thread(target=server.serve_forever)
+    t.start()
+
+    try:
+        conn = HTTPConnection("127.0.0.1", port, timeout=5)
+        socks = []
+
+        for _ in range(2):
+            conn.request("GET", "/")
+            socks.append(conn.sock)
+            response = conn.getresponse()
+            assert response.read() == b"hello"
+
+        # both requests used the same connection
+        assert socks[0] is socks[1] is conn.sock
+        conn.close()
+    finally:
+        server.shutdown()
+        t.join()
+
+    assert server.wait_idle(5)
+
+
+_script = """\
+import os
+import sys
+
+import flask
+from flask.serving import PreforkServer
+
+app = flask.Flask(__name__)
+
+@app.route("/")
+def index():
+    return str(os.getpid())
+
+server = PreforkServer(app, port=0, workers=2, threads=2, graceful_timeout=5)
+server.bind()
+sys.stdout.write("%d\\n" % server.port)
+sys.stdout.flush()
+server.run()
+"""
+
+
+def _get(port):
+    conn = HTTPConnection("127.0.0.1", port, timeout=5)
+
+    try:
+        conn.request("GET", "/")
+        return int(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def test_prefork_server(tmpdir):
+    script = tmpdir.join("serve.py")
+    script.write(textwrap.dedent(_script))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(flask.__file__))]
+        + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    proc = subprocess.Popen(
+        [sys.executable, str(script)], stdout=subprocess.PIPE, env=env
+    )
+
+    try:
+        port = int(proc.stdout.readline())
+        first = set(_get(port) for _ in range(10))
+        assert proc.pid not in first
+
+        # new workers replace the old ones
+        proc.send_signal(signal.SIGHUP)
+        deadline = time.time() + 10
+
+        while time.time() < deadline:
+            if _get(port) not in first:
+                break
+
+            time.sleep(0.1)
+        else:
+            pytest.fail("The workers were not replaced.")
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait() == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+        proc.stdout.close()
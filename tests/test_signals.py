@@ -8,6 +8,8 @@
     :copyright: 2010 Pallets
     :license: BSD-3-Clause
 """
+import threading
+
 import pytest
 
 try:
@@ -204,3 +206,79 @@ def test_appcontext_tearing_down_signal():
         assert recorded == [("tear_down", {"exc": None})]
     finally:
         flask.appcontext_tearing_down.disconnect(record_teardown, app)
+
+
+def test_no_send_without_receivers(app, client, monkeypatch):
+    sent = []
+    signals = (
+        flask.template_rendered,
+        flask.before_render_template,
+        flask.request_started,
+        flask.request_finished,
+        flask.request_tearing_down,
+        flask.appcontext_pushed,
+        flask.appcontext_popped,
+        flask.appcontext_tearing_down,
+        flask.message_flashed,
+    )
+
+    for signal in signals:
+        monkeypatch.setattr(signal, "send", lambda *a, **kw: sent.append(a))
+        # receivers connected for a specific sender by other tests stay
+        # around until they are garbage collected
+        monkeypatch.setattr(signal, "receivers", {})
+
+    app.secret_key = "secret"
+
+    @app.route("/")
+    def index():
+        flask.flash("message")
+        return flask.render_template("simple_template.html", whiskey=42)
+
+    assert client.get("/").status_code == 200
+    assert sent == []
+
+    def record(sender, **kwargs):
+        pass
+
+    flask.request_started.connect(record, app)
+    try:
+        client.get("/")
+    finally:
+        flask.request_started.disconnect(record, app)
+
+    assert sent == [(app,)]
+
+
+def test_connect_deferred(app, client):
+    from flask.signals import connect_deferred
+    from flask.workers import WorkerPool
+
+    pool = WorkerPool(1)
+    recorded = []
+
+    def record(sender, response, **extra):
+        recorded.append((sender, response.status_code, threading.current_thread()))
+
+    @app.route("/")
+    def index():
+        return ""
+
+    receiver = connect_deferred(flask.request_finished, record, app, pool=pool)
+
+    try:
+        client.get("/")
+    finally:
+        flask.request_finished.disconnect(receiver, app)
+
+    pool.shutdown()
+    assert len(recorded) == 1
+    assert recorded[0][:2] == (app, 200)
+    assert recorded[0][2] is not threading.current_thread()
+
+
+def test_deferred_pool():
+    from flask.signals import get_deferred_pool
+
+    assert get_deferred_pool() is get_deferred_pool()
+    assert get_deferred_pool().overflow == "drop"
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.timing
+    ~~~~~~~~~~~~
+
+    Tests the request phase timing.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import flask
+from flask.timing import get_request_timing
+from flask.timing import RequestTiming
+from flask.timing import TimingStats
+
+
+def test_request_timing(app, client):
+    app.config["REQUEST_TIMING"] = True
+    app.secret_key = "secret"
+    records = []
+
+    @app.before_request
+    def load_user():
+        flask.session["user"] = "user"
+
+    @app.after_request
+    def add_header(response):
+        return response
+
+    @app.teardown_request
+    def teardown(exc):
+        records.append(get_request_timing())
+
+    @app.route("/")
+    def index():
+        flask.render_template("simple_template.html", whiskey=42)
+        return flask.jsonify(value=42)
+
+    rv = client.get("/")
+    assert "Server-Timing" not in rv.headers
+    names = [name for name, _ in records[0].phases]
+    assert names == [
+        "context",
+        "session",
+        "match",
+        "before.load_user",
+        "render",
+        "json",
+        "view",
+        "after.add_header",
+        "save_session",
+        "teardown",
+    ]
+    assert all(seconds >= 0 for _, seconds in records[0].phases)
+
+    stats = app.timing_stats.snapshot()
+    assert stats["view"]["count"] == 1
+    assert stats["teardown"]["count"] == 1
+    assert stats["view"]["buckets"][-1] == (float("inf"), 1)
+
+
+def test_request_timing_disabled(app, client):
+    @app.route("/")
+    def index():
+        assert get_request_timing() is None
+        return ""
+
+    client.get("/")
+    assert app.timing_stats.snapshot() == {}
+
+
+def test_server_timing_header(app, client):
+    app.config["REQUEST_TIMING"] = True
+    app.config["SERVER_TIMING_HEADER"] = True
+
+    @app.route("/")
+    def index():
+        return ""
+
+    header = client.get("/").headers["Server-Timing"]
+    assert header.startswith("context;dur=")
+    assert "view;dur=" in header
+
+
+def test_server_timing_header_names(app, client):
+    app.config["REQUEST_TIMING"] = True
+    app.config["SERVER_TIMING_HEADER"] = True
+    app.before_request(lambda: None)
+
+    @app.route("/")
+    def index():
+        return ""
+
+    header = client.get("/").headers["Server-Timing"]
+    assert "before._lambda_;dur=" in header
+    assert "<" not in header
+
+
+def test_timing_stats():
+    stats = TimingStats(buckets=(0.1, 1))
+    timing = RequestTiming()
+    timing.phases = [("view", 0.05), ("view", 0.5), ("view", 5)]
+    stats.add(timing)
+    assert stats.snapshot() == {
+        "view": {
+            "count": 3,
+            "sum": 5.55,
+            "buckets": [(0.1, 1), (1, 2), (float("inf"), 3)],
+        }
+    }
+    stats.clear()
+    assert stats.snapshot() == {}
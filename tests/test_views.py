@@ -250,3 +250,68 @@ def test_remove_method_from_parent(app, client):
     assert client.get("/").data == b"GET"
     assert client.post("/").status_code == 405
     assert sorted(View.methods) == ["GET"]
+
+
+def test_init_every_request(app, client):
+    instances = []
+
+    class Index(flask.views.MethodView):
+        init_every_request = False
+
+        def __init__(self, greeting):
+            instances.append(self)
+            self.greeting = greeting
+
+        def get(self):
+            return self.greeting
+
+    app.add_url_rule("/", view_func=Index.as_view("index", "Hello"))
+    assert len(instances) == 1
+    assert client.get("/").data == b"Hello"
+    assert client.get("/").data == b"Hello"
+    assert client.head("/").status_code == 200
+    assert len(instances) == 1
+
+
+def test_method_names():
+    class Index(flask.views.MethodView):
+        methods = ["GET", "PURGE"]
+
+        def get(self):
+            pass
+
+    assert Index._method_names["GET"] == "get"
+    assert Index._method_names["PURGE"] == "purge"
+
+
+def test_method_descriptors(app, client):
+    class Index(flask.views.MethodView):
+        @staticmethod
+        def get():
+            return "static"
+
+        @classmethod
+        def post(cls):
+            return cls.__name__
+
+    app.add_url_rule("/", view_func=Index.as_view("index"))
+    assert client.get("/").data == b"static"
+    assert client.post("/").data == b"Index"
+
+
+def test_method_added_later(app, client):
+    class Index(flask.views.MethodView):
+        def __init__(self):
+            self.delete = lambda: "instance"
+
+        def get(self):
+            return "GET"
+
+    app.add_url_rule(
+        "/", view_func=Index.as_view("index"), methods=["GET", "HEAD", "PUT", "DELETE"]
+    )
+    Index.head = lambda self: flask.Response(headers={"X-Method": "HEAD"})
+    Index.put = lambda self: "PUT"
+    assert client.head("/").headers["X-Method"] == "HEAD"
+    assert client.put("/").data == b"PUT"
+    assert client.delete("/").data == b"instance"
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+    tests.workers
+    ~~~~~~~~~~~~~
+
+    Tests the worker thread pool.
+
+    :copyright: 2010 Pallets
+    :license: BSD-3-Clause
+"""
+import threading
+
+import pytest
+
+import flask
+from flask.workers import WorkerPool
+
+
+def test_submit():
+    pool = WorkerPool(2)
+    future = pool.submit(lambda a, b=0: a + b, 1, b=2)
+    assert future.result(timeout=5) == 3
+    pool.shutdown()
+    assert pool.completed == 1
+    assert pool.failed == 0
+    assert pool.queue_depth == 0
+
+
+def test_failed(caplog):
+    pool = WorkerPool(1)
+
+    def fail():
+        1 // 0
+
+    future = pool.submit(fail)
+
+    with pytest.raises(ZeroDivisionError):
+        future.result(timeout=5)
+
+    pool.shutdown()
+    assert pool.failed == 1
+    assert "Exception in worker task" in caplog.text
+
+
+def test_drop():
+    pool = WorkerPool(1, max_queue=1, overflow="drop")
+    event = threading.Event()
+    future = pool.submit(event.wait, 5)
+    assert pool.queue_depth == 1
+    assert pool.submit(event.wait, 5) is None
+    assert pool.dropped == 1
+    event.set()
+    future.result(timeout=5)
+    pool.shutdown()
+    assert pool.queue_depth == 0
+    assert pool.completed == 1
+
+
+def test_cancel_releases_slot():
+    pool = WorkerPool(1, max_queue=2, overflow="drop")
+    event = threading.Event()
+    running = pool.submit(event.wait, 5)
+    waiting = pool.submit(event.wait, 5)
+    assert waiting.cancel()
+    assert pool.queue_depth == 1
+    event.set()
+    running.result(timeout=5)
+    pool.shutdown()
+    assert pool.queue_depth == 0
+    assert pool.completed == 1
+
+
+def test_invalid_overflow():
+    with pytest.raises(ValueError):
+        WorkerPool(overflow="wait")
+
+
+def test_background(app, client):
+    results = []
+    event = threading.Event()
+
+    def send(name):
+        event.wait(5)
+        results.append((name, flask.current_app.name, flask.has_request_context()))
+
+    @app.route("/")
+    def index():
+        app.background.submit(send, "a")
+        return ""
+
+    client.get("/")
+    assert app.background.stats()["queue_depth"] == 1
+    event.set()
+    assert app.background.shutdown(timeout=5)
+    assert results == [("a", app.name, False)]
+    assert app.background.stats() == {
+        "queue_depth": 0,
+        "completed": 1,
+        "failed": 0,
+        "dropped": 0,
+    }
+
+    with pytest.raises(RuntimeError):
+        app.background.submit(send, "b")
+
+
+def test_background_shutdown_timeout(app):
+    app.config["BACKGROUND_WORKERS"] = 1
+    event = threading.Event()
+    running = app.background.submit(event.wait, 5)
+    waiting = app.background.submit(event.wait, 5)
+    assert not app.background.shutdown(timeout=0.01)
+    assert waiting.cancelled()
+    event.set()
+    assert running.result(timeout=5)
+
+
+def test_background_drop(app):
+    app.config["BACKGROUND_QUEUE_SIZE"] = 1
+    app.config["BACKGROUND_OVERFLOW"] = "drop"
+    event = threading.Event()
+    future = app.background.submit(event.wait, 5)
+    assert app.background.submit(event.wait, 5) is None
+    assert app.background.stats()["dropped"] == 1
+    event.set()
+    future.result(timeout=5)
+    app.background.shutdown()